@@ -0,0 +1,453 @@
+"""
+Micro-benchmarks of the hot paths of the benchmark harness itself: scoring, splitting, caching,
+threshold optimization, the per-sentence overhead of a full benchmark run and the time it takes to
+import the package and to show the help of the command line interface.
+
+The benchmarks run on synthetic corpora of increasing size and use a framework that doesn't do any
+work, so that only the time spent in the harness is measured. The results are written as JSON and
+can be compared to the results of a previous run (e.g. of the main branch) to catch regressions:
+
+    python benchmarks/harness.py --output current.json --baseline main.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+from nlutestframework import (
+    GlobalConfig,
+    NLUBenchmarker,
+    NLUCorpusCache,
+    NLUDataSetSummary,
+    NLUFramework,
+    NLUIntentRating,
+    RatingCache
+)
+from nlutestframework.benchmark_report import f1_score_means_and_variances
+from nlutestframework.implementations.jsonl_data_set import JSONLDataSet
+from nlutestframework.intent_threshold_optimizer import IntentThresholdOptimizer
+
+# Other imports only for the type hints
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# The number of distinct intents in the synthetic corpora
+NUM_INTENTS = 50
+
+# The share of sentences of the synthetic corpora assigned to the None-intent
+NONE_SHARE = 0.1
+
+class NullFramework(NLUFramework):
+    """
+    Doesn't train and detects the intent that is encoded in the first word of each synthetic
+    sentence, with a pseudo-random confidence. Every fifth rating is wrong, so that the scores and
+    the threshold sweep are not trivial.
+    """
+
+    async def construct(self, global_config: GlobalConfig, **framework_config: Any) -> None:
+        pass
+
+    async def train(self, training_data: Any) -> None:
+        pass
+
+    async def rateIntents(self, sentence: str) -> NLUIntentRating:
+        checksum = zlib.crc32(sentence.encode("utf-8"))
+
+        intent: Optional[str] = sentence.split(" ", 1)[0]
+        if checksum % 5 == 0:
+            intent = "intent{}".format(checksum % NUM_INTENTS)
+        if intent == "none":
+            intent = None
+
+        return NLUIntentRating(sentence, [ (intent, (checksum % 1000) / 1000) ])
+
+    async def cleanupTraining(self) -> None:
+        pass
+
+class Measurement(NamedTuple):
+    benchmark: str
+
+    # The size of the synthetic corpus
+    size: int
+
+    # The number of items processed per repetition, e.g. the number of rated sentences
+    items: int
+
+    # The durations of all repetitions in seconds
+    durations: List[float]
+
+    def toDict(self) -> Dict[str, Any]:
+        best = min(self.durations)
+
+        return {
+            "benchmark" : self.benchmark,
+            "size"      : self.size,
+            "items"     : self.items,
+            "repeat"    : len(self.durations),
+            "min"       : best,
+            "median"    : statistics.median(self.durations),
+            "per_item"  : best / max(self.items, 1)
+        }
+
+# A benchmark prepares its inputs and returns the function to time together with the number of
+# items the function processes
+Benchmark = Callable[["Workspace"], Tuple[Callable[[], Any], int]]
+
+class Workspace:
+    """
+    The synthetic corpus of one size and everything derived from it, shared by the benchmarks.
+    """
+
+    def __init__(self, directory: str, size: int, loop: asyncio.AbstractEventLoop):
+        self.directory = directory
+        self.size = size
+        self.loop = loop
+
+        rng = random.Random(size)
+
+        self.data_path = os.path.join(directory, "corpus.jsonl")
+        with open(self.data_path, "w", encoding="utf-8") as f:
+            for i in range(size):
+                intent = None if rng.random() < NONE_SHARE else "intent{}".format(
+                    rng.randrange(NUM_INTENTS)
+                )
+                f.write(json.dumps({
+                    "text"   : "{} synthetic sentence number {}".format(intent or "none", i),
+                    "intent" : intent
+                }) + "\n")
+
+        self.data_set = JSONLDataSet("Synthetic", self.data_path, 20, "en", True, 0)
+
+    def run(self, awaitable: Awaitable[Any]) -> Any:
+        return self.loop.run_until_complete(awaitable)
+
+    def createFramework(self) -> NLUFramework:
+        framework: NLUFramework = self.run(NullFramework.create(
+            GlobalConfig("python", 1, True, output_directory=self.directory),
+            {},
+            "Null"
+        ))
+
+        return framework
+
+def bench_confusion_matrix_to_f1_scores(workspace: Workspace) -> Tuple[Callable[[], Any], int]:
+    framework = workspace.createFramework()
+    validation_data = workspace.data_set.validation_data
+    ratings = workspace.run(framework.rateIntentsBatch([ x.sentence for x in validation_data ]))
+    workspace.run(framework.destroy())
+
+    confusion_matrix: Dict[Any, Dict[Any, int]] = {}
+    for entry, rating in zip(validation_data, ratings):
+        row = confusion_matrix.setdefault(entry.intent, {})
+        row[rating.detected_intent] = row.get(rating.detected_intent, 0) + 1
+
+    return lambda: NLUBenchmarker.confusionMatrixToF1Scores(confusion_matrix), len(ratings)
+
+def bench_f1_score_means_and_variances(workspace: Workspace) -> Tuple[Callable[[], Any], int]:
+    # Three frameworks, with one iteration per 100 sentences of the corpus
+    framework_titles = [ "A", "B", "C" ]
+    intents = [ None ] + [ "intent{}".format(i) for i in range(NUM_INTENTS) ]
+    data_set = NLUDataSetSummary("Synthetic", "en", frozenset(intents), 0, 0)
+
+    rng = random.Random(workspace.size)
+    iterations = [
+        { "Synthetic": {
+            framework_title: { intent: rng.random() * 100 for intent in intents }
+            for framework_title in framework_titles
+        } }
+        for _ in range(max(workspace.size // 100, 1))
+    ]
+
+    return (
+        lambda: f1_score_means_and_variances(framework_titles, [ data_set ], iterations),
+        len(iterations) * len(framework_titles) * len(intents)
+    )
+
+def bench_reshuffle(workspace: Workspace) -> Tuple[Callable[[], Any], int]:
+    return workspace.data_set.reshuffle, workspace.size
+
+def bench_corpus_cache_store(workspace: Workspace) -> Tuple[Callable[[], Any], int]:
+    corpus = workspace.data_set.corpus
+    cache = NLUCorpusCache(os.path.join(workspace.directory, "store.nlucache"), workspace.data_path)
+
+    return lambda: cache.storeSync("en", corpus), workspace.size
+
+def bench_corpus_cache_load(workspace: Workspace) -> Tuple[Callable[[], Any], int]:
+    corpus = workspace.data_set.corpus
+    cache = NLUCorpusCache(os.path.join(workspace.directory, "load.nlucache"), workspace.data_path)
+    cache.storeSync("en", corpus)
+
+    def load() -> None:
+        # Touch all sentences, the cache is memory-mapped
+        _, loaded = cache.load() # type: ignore
+        for _ in loaded:
+            pass
+
+    return load, workspace.size
+
+def _ratings(workspace: Workspace) -> Dict[str, NLUIntentRating]:
+    framework = workspace.createFramework()
+    sentences = [ x.sentence for x in workspace.data_set.validation_data ]
+    ratings = workspace.run(framework.rateIntentsBatch(sentences))
+    workspace.run(framework.destroy())
+
+    return dict(zip(sentences, ratings))
+
+def bench_rating_cache_store(workspace: Workspace) -> Tuple[Callable[[], Any], int]:
+    ratings = _ratings(workspace)
+    cache = RatingCache(os.path.join(workspace.directory, "ratings"))
+    repetitions = iter(range(sys.maxsize))
+
+    # Store into a new file each time, the cache merges with existing ratings otherwise
+    def store() -> None:
+        cache.store("null", "training{}".format(next(repetitions)), ratings)
+
+    return store, len(ratings)
+
+def bench_rating_cache_load(workspace: Workspace) -> Tuple[Callable[[], Any], int]:
+    ratings = _ratings(workspace)
+    cache = RatingCache(os.path.join(workspace.directory, "ratings"))
+    cache.store("null", "load", ratings)
+
+    return lambda: cache.load("null", "load"), len(ratings)
+
+def bench_threshold_optimizer(workspace: Workspace) -> Tuple[Callable[[], Any], int]:
+    framework = workspace.createFramework()
+    data_set = workspace.data_set
+
+    def optimize() -> None:
+        workspace.run(IntentThresholdOptimizer.optimize(framework, data_set, 1, 0.05))
+
+    return optimize, len(data_set.validation_data)
+
+def bench_benchmark_run(workspace: Workspace) -> Tuple[Callable[[], Any], int]:
+    data_set = workspace.data_set
+
+    def run() -> None:
+        # The run destroys the framework, the construction is part of the measured overhead
+        framework = workspace.createFramework()
+
+        workspace.run(NLUBenchmarker.getInstance().run([ framework ], [ data_set ], 1))
+
+    return run, len(data_set.validation_data)
+
+def _run_python(*args: str) -> None:
+    # Run in a fresh interpreter from the root of the repository, so that the package of this
+    # checkout is imported
+    subprocess.run(
+        [ sys.executable, *args ],
+        cwd    = os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+        stdout = subprocess.DEVNULL,
+        check  = True
+    )
+
+def bench_import(_workspace: Workspace) -> Tuple[Callable[[], Any], int]:
+    # Includes the start of the interpreter, independent of the corpus size
+    return lambda: _run_python("-c", "import nlutestframework"), 1
+
+def bench_help(_workspace: Workspace) -> Tuple[Callable[[], Any], int]:
+    return lambda: _run_python("-m", "nlutestframework", "--help"), 1
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "confusion_matrix_to_f1_scores"  : bench_confusion_matrix_to_f1_scores,
+    "f1_score_means_and_variances"   : bench_f1_score_means_and_variances,
+    "reshuffle"                      : bench_reshuffle,
+    "corpus_cache_store"             : bench_corpus_cache_store,
+    "corpus_cache_load"              : bench_corpus_cache_load,
+    "rating_cache_store"             : bench_rating_cache_store,
+    "rating_cache_load"              : bench_rating_cache_load,
+    "threshold_optimizer"            : bench_threshold_optimizer,
+    "benchmark_run"                  : bench_benchmark_run,
+    "import"                         : bench_import,
+    "help"                           : bench_help
+}
+
+def measure(name: str, benchmark: Benchmark, workspace: Workspace, repeat: int) -> Measurement:
+    fn, items = benchmark(workspace)
+
+    # Warm up once, e.g. to fill the page cache
+    fn()
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+
+    return Measurement(name, workspace.size, items, durations)
+
+def run_benchmarks(names: List[str], sizes: List[int], repeat: int) -> Iterator[Measurement]:
+    loop = asyncio.new_event_loop()
+    try:
+        for size in sizes:
+            directory = tempfile.mkdtemp(prefix="nlutestframework-benchmarks-")
+            try:
+                workspace = Workspace(directory, size, loop)
+
+                for name in names:
+                    yield measure(name, BENCHMARKS[name], workspace, repeat)
+            finally:
+                shutil.rmtree(directory, ignore_errors=True)
+    finally:
+        loop.close()
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            [ "git", "rev-parse", "HEAD" ],
+            cwd            = os.path.dirname(os.path.realpath(__file__)),
+            capture_output = True,
+            check          = True,
+            text           = True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    tolerance: float
+) -> List[str]:
+    """
+    Returns:
+        A description of each benchmark whose minimum duration exceeds the minimum duration of the
+        same benchmark at the same size in the baseline by more than the tolerance.
+    """
+
+    baseline_durations = { (x["benchmark"], x["size"]): x["min"] for x in baseline }
+
+    regressions = []
+    for result in results:
+        baseline_duration = baseline_durations.get((result["benchmark"], result["size"]), None)
+        if baseline_duration is None or baseline_duration <= 0:
+            continue
+
+        ratio = result["min"] / baseline_duration
+        if ratio > 1 + tolerance:
+            regressions.append("{} ({} sentences): {:.2f}x slower than the baseline".format(
+                result["benchmark"],
+                result["size"],
+                ratio
+            ))
+
+    return regressions
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths of the harness itself.")
+
+    parser.add_argument(
+        "--sizes",
+        dest    = "sizes",
+        type    = int,
+        nargs   = "+",
+        default = [ 1000, 10000, 100000 ],
+        help    = (
+            "The numbers of sentences of the synthetic corpora."
+            " Defaults to 1000, 10000 and 100000 sentences."
+        )
+    )
+
+    parser.add_argument(
+        "--repeat",
+        dest    = "repeat",
+        type    = int,
+        default = 5,
+        help    = "The number of timed repetitions of each benchmark. Defaults to 5."
+    )
+
+    parser.add_argument(
+        "--benchmark",
+        dest    = "benchmarks",
+        type    = str,
+        action  = "append",
+        choices = list(BENCHMARKS),
+        help    = "Run only the given benchmark. Can be given multiple times. Defaults to all."
+    )
+
+    parser.add_argument(
+        "-o", "--output",
+        dest = "output",
+        type = str,
+        help = "Path to write the results to as JSON. Defaults to writing them to stdout."
+    )
+
+    parser.add_argument(
+        "--baseline",
+        dest = "baseline",
+        type = str,
+        help = (
+            "Path to the results of a previous run to compare to."
+            " Exits with status 1 if any benchmark got slower than the tolerance allows."
+        )
+    )
+
+    parser.add_argument(
+        "--tolerance",
+        dest    = "tolerance",
+        type    = float,
+        default = 0.25,
+        help    = (
+            "The slowdown relative to the baseline that is tolerated before failing, as a fraction."
+            " Defaults to 0.25."
+        )
+    )
+
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = create_argument_parser().parse_args(argv)
+
+    # Only measure, don't log the benchmark runs
+    logging.basicConfig(level=logging.ERROR)
+
+    results = []
+    for measurement in run_benchmarks(args.benchmarks or list(BENCHMARKS), args.sizes, args.repeat):
+        result = measurement.toDict()
+        results.append(result)
+
+        print("{:<32} {:>8} sentences: {:>10.3f} ms ({:.2f} us per item)".format(
+            result["benchmark"],
+            result["size"],
+            result["min"] * 1000,
+            result["per_item"] * 1000000
+        ), file=sys.stderr)
+
+    output = json.dumps({
+        "python"    : platform.python_version(),
+        "platform"  : platform.platform(),
+        "commit"    : git_commit(),
+        "timestamp" : datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "results"   : results
+    }, indent=4)
+
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+
+    if args.baseline is not None:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+
+        for regression in regressions:
+            print("Regression: {}".format(regression), file=sys.stderr)
+
+        if len(regressions) > 0:
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,12 +5,35 @@ from .version import __version__
 from . import implementations
 
 # Modules on this level
+from .benchmark_report import BenchmarkReport
+from .dense_confusion_matrix import DenseConfusionMatrix
+from .event_bus import EventBus
+from .events import (
+    RunStarted, RunFinished, IterationStarted, IterationFinished, StageStarted, StageFinished,
+    SentenceRated, ThresholdChosen, Event
+)
+from .intent_codebook import IntentCodebook
+from .latency_histogram import LatencyHistogram
+from .lazy_nlu_data_set import LazyNLUDataSet
+from .lifecycle_stage import LifecycleStage
+from .load_tester import LoadTester, LoadTestMode, LoadTestStep
+from .loop_lag_monitor import LoopLagMonitor
+from .model_artifact_store import ModelArtifactStore
 from .nlu_benchmarker import NLUBenchmarker
+from .nlu_corpus import NLUCorpus
+from .nlu_corpus_cache import NLUCorpusCache
 from .nlu_data_entry import NLUDataEntry
-from .nlu_data_set import NLUDataSet
+from .nlu_data_set import NLUDataSet, NLUDataSetSummary
+from .nlu_data_split import NLUDataSplit
+from .nlu_data_view import NLUDataView
 from .nlu_framework import NLUFramework
 from .nlu_intent_rating import NLUIntentRating
 from .optimizable_nlu_framework import OptimizableNLUFramework
+from .rating_cache import RatingCache
+from .report_renderer import ReportRenderer
+from .resource_monitor import ResourceMonitor, ResourceUsage
+from .results_writer import ResultsWriter, RunResults
+from .stage_profiler import ProfilerMode, StageProfiler
 
 from .global_config import GlobalConfig
 from .parallel_exception import ParallelException
@@ -3,16 +3,41 @@ import asyncio
 import logging
 from signal import SIGINT, SIGTERM
 import sys
-from typing import Any
+from typing import Any, Callable, TypeVar
 
 import yaml
 
+from .load_tester import LoadTester, LoadTestMode
 from .nlu_benchmarker import NLUBenchmarker
 
 def eprint(*args: Any, **kwargs: Any) -> None:
     print(*args, file=sys.stderr, **kwargs)
 
-def main() -> None:
+N = TypeVar("N", int, float)
+
+def positive(number_type: Callable[[str], N]) -> Callable[[str], N]:
+    """
+    Args:
+        number_type: The type to convert the argument to, e.g. :class:`int` or :class:`float`.
+
+    Returns:
+        An argument type that converts the argument and rejects values that are not positive.
+    """
+
+    def convert(argument: str) -> N:
+        try:
+            value = number_type(argument)
+        except ValueError:
+            raise argparse.ArgumentTypeError("invalid number: {}".format(argument)) from None
+
+        if value <= 0:
+            raise argparse.ArgumentTypeError("must be positive: {}".format(argument))
+
+        return value
+
+    return convert
+
+def create_argument_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Benchmark NLU frameworks.")
 
     parser.add_argument(
@@ -68,8 +93,118 @@ def main() -> None:
         )
     )
 
+    parser.add_argument(
+        "--profile",
+        dest    = "profile",
+        type    = str,
+        action  = "append",
+        metavar = "FRAMEWORK:STAGE",
+        help    = (
+            "Profile a lifecycle stage of a framework, e.g. \"Snips:train\". Can be given multiple"
+            " times. The profiles are written to the \"profiles\" subdirectory of the run."
+            " Overrides the corresponding setting in the configuration file."
+        )
+    )
+
+    parser.add_argument(
+        "--profiler",
+        dest    = "profiler",
+        type    = str,
+        choices = [ "sampling", "deterministic" ],
+        help    = (
+            "The profiler to use for the profiled stages: \"sampling\" writes folded stacks of all"
+            " threads for flame graphs, \"deterministic\" writes cProfile statistics."
+            " Overrides the corresponding setting in the configuration file."
+        )
+    )
+
+    parser.add_argument(
+        "--resume",
+        dest = "RESUME",
+        type = str,
+        help = (
+            "Path to the directory of a previous run to resume."
+            " Only the iterations that were not completed in that run are run."
+            " Only applies to benchmark runs, not to the commands."
+        )
+    )
+
+    subparsers = parser.add_subparsers(
+        dest  = "COMMAND",
+        title = "commands",
+        help  = "Run without a command to benchmark the frameworks configured in the config file."
+    )
+
+    report_parser = subparsers.add_parser(
+        "report",
+        description = (
+            "Report the results of a previous run again, without running any framework."
+            " The charts are rendered into the \"charts\" subdirectory of the run."
+        ),
+        help        = "Report the results of a previous run again."
+    )
+
+    report_parser.add_argument(
+        "RUN_DIRECTORY",
+        type = str,
+        help = "Path to the directory of the run."
+    )
+
+    report_parser.add_argument(
+        "--chart-formats",
+        dest    = "CHART_FORMATS",
+        type    = str,
+        nargs   = "+",
+        default = [ "png" ],
+        choices = [ "png", "svg", "html" ],
+        help    = "The formats to render the charts in. Defaults to PNG only."
+    )
+
+    load_test_parser = subparsers.add_parser(
+        "load-test",
+        description = (
+            "Train each framework configured in the config file once per data set and rate the"
+            " validation sentences at a series of increasing load levels, to find the throughput"
+            " at which each framework saturates."
+        ),
+        help        = "Measure the latency and throughput of the frameworks under load."
+    )
+
+    load_levels = load_test_parser.add_mutually_exclusive_group(required=True)
+
+    load_levels.add_argument(
+        "--rates",
+        dest  = "RATES",
+        type  = positive(float),
+        nargs = "+",
+        help  = "The rates to send requests at, in requests per second."
+    )
+
+    load_levels.add_argument(
+        "--concurrency",
+        dest  = "CONCURRENCY",
+        type  = positive(int),
+        nargs = "+",
+        help  = "The numbers of requests to keep in flight at the same time."
+    )
+
+    load_test_parser.add_argument(
+        "--step-duration",
+        dest    = "STEP_DURATION",
+        type    = positive(float),
+        default = 10.,
+        help    = "The time to generate load for at each level, in seconds. Defaults to 10."
+    )
+
+    return parser
+
+def main() -> None:
+    parser = create_argument_parser()
     args = parser.parse_args()
 
+    if args.COMMAND is not None and args.RESUME is not None:
+        parser.error("--resume only applies to benchmark runs")
+
     # Set the general log level to DEBUG or INFO
     logging.basicConfig(level = logging.DEBUG if args.VERBOSE else logging.INFO)
 
@@ -81,6 +216,18 @@ def main() -> None:
     logging.getLogger("urllib3").setLevel(logging.INFO)
     logging.getLogger("msrest").setLevel(logging.INFO)
 
+    if args.COMMAND == "report":
+        try:
+            NLUBenchmarker.getInstance().reportFromRunDirectory(
+                args.RUN_DIRECTORY,
+                args.CHART_FORMATS
+            )
+        except OSError as e:
+            eprint("Error reading the results: {}".format(e))
+        except ValueError as e:
+            eprint("Malformed results: {}".format(e))
+        return
+
     global_config_override = {}
     for label, value in vars(args).items():
         if label.islower() and value is not None:
@@ -93,21 +240,36 @@ def main() -> None:
                 " current operation has to finish first)."
             )
 
-            NLUBenchmarker.getInstance().cancel()
+            if args.COMMAND == "load-test":
+                LoadTester.getInstance().cancel()
+            else:
+                NLUBenchmarker.getInstance().cancel()
 
         loop = asyncio.get_event_loop()
         for sig in (SIGINT, SIGTERM):
             loop.add_signal_handler(sig, cancel, sig)
 
         try:
-            await NLUBenchmarker.getInstance().runFromConfigFile(
-                args.CONFIG,
-                **global_config_override
-            )
+            if args.COMMAND == "load-test":
+                await LoadTester.getInstance().runFromConfigFile(
+                    args.CONFIG,
+                    LoadTestMode.RATE if args.RATES is not None else LoadTestMode.CONCURRENCY,
+                    args.RATES if args.RATES is not None else args.CONCURRENCY,
+                    args.STEP_DURATION,
+                    **global_config_override
+                )
+            else:
+                await NLUBenchmarker.getInstance().runFromConfigFile(
+                    args.CONFIG,
+                    args.RESUME,
+                    **global_config_override
+                )
         except OSError as e:
-            eprint("Error reading the config file: {}".format(e))
+            eprint("Error reading the config file or the run to resume: {}".format(e))
         except yaml.YAMLError as e:
             eprint("Malformed YAML in the config file: {}".format(e))
+        except ValueError as e:
+            eprint("Malformed config file or run to resume: {}".format(e))
 
     asyncio.run(main_runner())
 
@@ -0,0 +1,352 @@
+from .dense_confusion_matrix import DenseConfusionMatrix
+from .has_logger import HasLogger
+from .latency_histogram import LatencyHistogram
+from .lifecycle_stage import LifecycleStage
+from .report_renderer import ReportRenderer
+
+# Other imports only for the type hints
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from .types import ConfusionMatrix, Intent, DataSetTitle, FrameworkTitle
+from .nlu_data_set import NLUDataSetSummary
+from .resource_monitor import ResourceUsage
+from .results_writer import RunResults
+
+class _Performance(NamedTuple):
+    mean: float
+    variance: float
+
+def f1_score_means_and_variances(
+    framework_titles: List[FrameworkTitle],
+    data_sets: List[NLUDataSetSummary],
+    iterations: List[Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, float]]]]
+) -> Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, _Performance]]]:
+    """
+    Calculate F1 score means and variances for each intent over all iterations.
+
+    Args:
+        framework_titles: The titles of the frameworks to calculate the scores of.
+        data_sets: The data sets to calculate the scores on.
+        iterations: The F1 score of each intent, per framework and data set, for each iteration.
+            Frameworks and data sets may be missing from some of the iterations.
+
+    Returns:
+        The mean and the variance of the F1 score of each intent, per framework and data set.
+        Intents without any score are left out.
+    """
+
+    performances: Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, _Performance]]] = {}
+
+    for data_set in data_sets:
+        performances[data_set.title] = {}
+
+        for framework_title in framework_titles:
+            performances[data_set.title][framework_title] = {}
+
+            for intent in data_set.intents:
+                def score_getter(
+                    x: Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, float]]],
+                    data_set: NLUDataSetSummary = data_set,
+                    framework_title: FrameworkTitle = framework_title,
+                    intent: Intent = intent
+                ) -> Optional[float]:
+                    # Iterations may be missing for some frameworks and data sets, if results
+                    # were loaded from an incomplete run
+                    return x.get(data_set.title, {}).get(framework_title, {}).get(intent, None)
+
+                # mypy doesn't understand that you can call score_getter without passing all
+                # four arguments.
+                scores = list(map(
+                    # Some intents may not have been part of the validation data in all
+                    # runs. In these runs, the score is set to None and is excluded from the
+                    # calculations later.
+                    score_getter,
+                    iterations
+                ))
+
+                # Remove None-scores, see comments above
+                filtered_scores: List[float] = list(filter(
+                    lambda x: x is not None,
+                    scores # type: ignore
+                ))
+
+                # If an intent was not included in any of the validation data, ignore the
+                # intent completely.
+                if len(filtered_scores) == 0:
+                    continue
+
+                mean     = sum(filtered_scores) / len(filtered_scores)
+                variance = sum(map(
+                    lambda x, mean=mean: (x - mean) ** 2, # type: ignore
+                filtered_scores)) / len(filtered_scores)
+
+                performances[data_set.title][framework_title][intent] = _Performance(
+                    mean     = mean,
+                    variance = variance
+                )
+
+    return performances
+
+class BenchmarkReport(HasLogger):
+    """
+    Summarizes the results of a benchmark run, see
+    :meth:`~nlutestframework.nlu_benchmarker.NLUBenchmarker.report`.
+    """
+
+    def output(self, results: RunResults) -> None:
+        """
+        Output the F1 scores, the rating latencies and the resources used of all frameworks and the
+        best performing framework for each data set, and generate charts with the F1 scores per
+        intent, if the :class:`~nlutestframework.report_renderer.ReportRenderer` is running.
+
+        Args:
+            results: The results of the run. Frameworks and data sets may be missing from some of
+                the iterations. The latencies of all iterations are merged, so that the quantiles
+                are taken over all ratings.
+        """
+
+        if len(results.data_sets) == 0:
+            self._logger.info("No results to report.")
+            return
+
+        # Collect the titles of all frameworks, in the order they appear in the results
+        framework_titles: Dict[FrameworkTitle, None] = {}
+        for iteration in results.iterations:
+            for data_set_performances in iteration.values():
+                framework_titles.update(dict.fromkeys(data_set_performances.keys()))
+
+        iterations   = self.__confusionMatricesToF1Scores(results.iterations)
+        performances = f1_score_means_and_variances(
+            list(framework_titles),
+            results.data_sets,
+            iterations
+        )
+
+        self.__plot(performances)
+
+        performances_  = self.__mergeIntentPerformances(performances)
+        performances__ = self.__sortPerformances(performances_)
+
+        latencies = self.__mergeLatencies(results.latencies)
+
+        self.__printTable(performances__, latencies, results.resources)
+        self.__printWinner(performances__, results.data_sets, latencies)
+
+    @staticmethod
+    def __plot(
+        performances: Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, _Performance]]]
+    ) -> None:
+        """
+        Render one chart per data set in the background, see
+        :class:`~nlutestframework.report_renderer.ReportRenderer`.
+        """
+
+        renderer = ReportRenderer.getInstance()
+
+        # Create one chart per data set
+        for data_set_title, framework_performances in performances.items():
+            # Collect all intents that the frameworks were evaluated on
+            intents: List[Intent] = []
+            for intent_performances in framework_performances.values():
+                intents.extend(intent_performances.keys())
+
+            # Filter out the None-intent, because None can't be sorted together with strings
+            intents = list(filter(lambda x: x is not None, intents))
+
+            # Remove duplicates and sort alphabetically
+            intents = sorted(set(intents))
+
+            # Append the None-intent again, as the last entry
+            intents.append(None)
+
+            scores: Dict[str, List[Optional[float]]] = {}
+            for framework_title, intent_performances in framework_performances.items():
+                scores[framework_title] = [
+                    intent_performances[intent].mean if intent in intent_performances else None
+                    for intent in intents
+                ]
+
+            # Convert None to the string "None"
+            intent_labels = list(map(str, intents))
+
+            # The chart is rendered in the background, the results are reported without waiting
+            renderer.renderPerformances(
+                "f1-scores-{}".format(data_set_title),
+                "F1 scores on {}".format(data_set_title),
+                intent_labels,
+                scores
+            )
+
+    @staticmethod
+    def __confusionMatricesToF1Scores(
+        iterations: List[Dict[DataSetTitle, Dict[FrameworkTitle, ConfusionMatrix]]]
+    ) -> List[Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, float]]]]:
+        """
+        Calculate F1 scores from confusion matrices.
+        """
+
+        iterations_result = []
+
+        for iteration in iterations:
+            iteration_result = {}
+
+            for data_set_title, performances in iteration.items():
+                performances_result = {}
+
+                for framework_title, confusion_matrix in performances.items():
+                    # Note: The values are multiplied times 100, see
+                    # NLUBenchmarker.confusionMatrixToF1Scores
+                    performances_result[framework_title] = DenseConfusionMatrix.fromConfusionMatrix(
+                        confusion_matrix
+                    ).f1Scores()
+
+                iteration_result[data_set_title] = performances_result
+
+            iterations_result.append(iteration_result)
+
+        return iterations_result
+
+    @staticmethod
+    def __mergeIntentPerformances(
+        performances: Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, _Performance]]]
+    ) -> Dict[DataSetTitle, Dict[FrameworkTitle, _Performance]]:
+        """
+        Calculate the average performances across all intents for each data set and each framework.
+        """
+
+        # Mypy requires the repetition of the return type
+        result: Dict[DataSetTitle, Dict[FrameworkTitle, _Performance]] = {}
+
+        for data_set_title, framework_performances in performances.items():
+            result[data_set_title] = {}
+
+            for framework_title, intent_performances in framework_performances.items():
+                # Skip frameworks without any results on the data set
+                if len(intent_performances) == 0:
+                    continue
+
+                means: List[float] = list(map(lambda x: x.mean, intent_performances.values()))
+                variances: List[float] = list(map(
+                    lambda x: x.variance,
+                    intent_performances.values()
+                ))
+
+                result[data_set_title][framework_title] = _Performance(
+                    mean     = sum(means)     / len(means),
+                    variance = sum(variances) / len(variances)
+                )
+
+        return result
+
+    @staticmethod
+    def __sortPerformances(
+        performances: Dict[DataSetTitle, Dict[FrameworkTitle, _Performance]]
+    ) -> Dict[DataSetTitle, List[Tuple[FrameworkTitle, _Performance]]]:
+        """
+        Sort the frameworks by their performances, best to worst, looking only at the mean.
+        """
+
+        result: Dict[DataSetTitle, List[Tuple[FrameworkTitle, _Performance]]] = {}
+
+        for data_set_title, framework_performances in performances.items():
+            result[data_set_title] = sorted(
+                framework_performances.items(),
+                key=lambda x: x[1].mean,
+                reverse=True
+            )
+
+        return result
+
+    def __printTable(
+        self,
+        performances: Dict[DataSetTitle, List[Tuple[FrameworkTitle, _Performance]]],
+        latencies: Dict[DataSetTitle, Dict[FrameworkTitle, LatencyHistogram]],
+        resources: Dict[DataSetTitle, Dict[FrameworkTitle, Dict[LifecycleStage, ResourceUsage]]]
+    ) -> None:
+        """
+        Print the average mean and variance of all frameworks for each data set, best to worst,
+        together with the latencies of their ratings and the resources used in each lifecycle stage
+        where recorded.
+        """
+
+        for data_set_title, framework_performances in performances.items():
+            if len(framework_performances) == 0:
+                continue
+
+            longest_framework_title_length = max(map(lambda x: len(x[0]), framework_performances))
+            self._logger.info("F1 scores on the data set \"%s\":", data_set_title)
+            for framework_title, performance in framework_performances:
+                self._logger.info(
+                    "\t%s : %6.2f (variance: %6.2f)%s",
+                    framework_title.ljust(longest_framework_title_length),
+                    performance.mean,
+                    performance.variance,
+                    self.__formatLatencies(latencies, data_set_title, framework_title)
+                )
+
+                stage_resources = resources.get(data_set_title, {}).get(framework_title, {})
+                for stage in LifecycleStage:
+                    if stage in stage_resources:
+                        self._logger.info(
+                            "\t\t%-16s : %s",
+                            stage.value,
+                            stage_resources[stage].summary()
+                        )
+
+    def __printWinner(
+        self,
+        performances: Dict[DataSetTitle, List[Tuple[FrameworkTitle, _Performance]]],
+        data_sets: List[NLUDataSetSummary],
+        latencies: Dict[DataSetTitle, Dict[FrameworkTitle, LatencyHistogram]]
+    ) -> None:
+        """
+        Print the "winner" for each data set, together with the average mean and variance and the
+        latencies of its ratings where recorded.
+        """
+
+        longest_data_set_title_length = max(map(lambda x: len(x.title), data_sets))
+        self._logger.info("Best performing frameworks for each data set:")
+        for data_set_title, framework_performances in performances.items():
+            # Data sets without any results have no winner
+            if len(framework_performances) == 0:
+                continue
+
+            self._logger.info(
+                "\t%s : %s; Average performance: %6.2f (variance: %6.2f)%s",
+                data_set_title.ljust(longest_data_set_title_length),
+                framework_performances[0][0],
+                framework_performances[0][1].mean,
+                framework_performances[0][1].variance,
+                self.__formatLatencies(latencies, data_set_title, framework_performances[0][0])
+            )
+
+    @staticmethod
+    def __mergeLatencies(
+        latencies: List[Dict[DataSetTitle, Dict[FrameworkTitle, LatencyHistogram]]]
+    ) -> Dict[DataSetTitle, Dict[FrameworkTitle, LatencyHistogram]]:
+        """
+        Merge the latencies of all iterations for each data set and each framework.
+        """
+
+        result: Dict[DataSetTitle, Dict[FrameworkTitle, LatencyHistogram]] = {}
+
+        for iteration in latencies:
+            for data_set_title, framework_latencies in iteration.items():
+                merged = result.setdefault(data_set_title, {})
+                for framework_title, latency_histogram in framework_latencies.items():
+                    merged.setdefault(framework_title, LatencyHistogram()).merge(latency_histogram)
+
+        return result
+
+    @staticmethod
+    def __formatLatencies(
+        latencies: Dict[DataSetTitle, Dict[FrameworkTitle, LatencyHistogram]],
+        data_set_title: DataSetTitle,
+        framework_title: FrameworkTitle
+    ) -> str:
+        """
+        Format the latencies of a framework on a data set as a suffix for the summary, if any.
+        """
+
+        histogram = latencies.get(data_set_title, {}).get(framework_title, None)
+
+        return "" if histogram is None else "; Latency: {}".format(histogram.summary())
@@ -0,0 +1,50 @@
+import os
+
+import yaml
+
+# Other imports only for the type hints
+from typing import Dict
+from .types import JSONSerializable
+
+def load_config_file(path: str) -> Dict[str, Dict[str, JSONSerializable]]:
+    """
+    Load a configuration file. Relative paths in the configuration are converted to absolute paths
+    based on the location of the configuration file.
+
+    Args:
+        path: The path to the configuration file. See :ref:`configuration-file` for more
+            information.
+
+    Returns:
+        The full configuration, see :ref:`configuration-full`.
+
+    Raises:
+        :exc:`OSError`: in case the config file could not be read due to I/O or other OS-related
+            issues.
+        :exc:`yaml.YAMLError`: in case the config file contains invalid YAML.
+    """
+
+    with open(path, "r") as f:
+        config = yaml.safe_load(f)
+
+    # Data set configuration file convenience: The data paths may be given relative to the
+    # configuration file location.
+    for data_set_config in config["data_sets"].values():
+        # Make the data paths absolute, relative to the location of the configuration file.
+        if not os.path.isabs(data_set_config["data_path"]):
+            data_set_config["data_path"] = os.path.abspath(os.path.join(
+                os.path.dirname(path),
+                data_set_config["data_path"]
+            ))
+
+    # The cache and output directories may be given relative to the configuration file location,
+    # too.
+    for cache in [ "rating_cache", "model_cache", "output_directory" ]:
+        cache_path = config.get("global", {}).get(cache, None)
+        if cache_path is not None and not os.path.isabs(cache_path):
+            config["global"][cache] = os.path.abspath(os.path.join(
+                os.path.dirname(path),
+                cache_path
+            ))
+
+    return config # type: ignore
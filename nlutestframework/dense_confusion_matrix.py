@@ -0,0 +1,228 @@
+import numpy as np
+
+from .intent_codebook import IntentCodebook
+
+# Other imports only for the type hints
+from typing import Dict, Optional
+from .types import ConfusionMatrix, Intent
+
+class DenseConfusionMatrix:
+    """
+    A confusion matrix stored as a dense two-dimensional array. Rows denote the expected intents,
+    columns denote the detected intents, both indexed by the codes of an
+    :class:`~nlutestframework.intent_codebook.IntentCodebook`. The None-intent is stored at index
+    :attr:`~nlutestframework.intent_codebook.IntentCodebook.NONE_CODE`.
+
+    The nested dictionary form (:data:`~nlutestframework.types.ConfusionMatrix`) is available via
+    :meth:`fromConfusionMatrix` and :meth:`toConfusionMatrix`.
+    """
+
+    def __init__(self, codebook: IntentCodebook, counts: Optional[np.ndarray] = None):
+        """
+        Args:
+            codebook: The codebook used to map intents to rows and columns. The codebook may grow
+                after constructing the matrix, the matrix is resized accordingly when required.
+            counts: A square integer array with one row and one column for each intent of the
+                codebook. Defaults to an array of zeros.
+
+        Raises:
+            :exc:`ValueError`: if the shape of the counts does not match the size of the codebook.
+        """
+
+        size = len(codebook)
+
+        if counts is None:
+            counts = np.zeros((size, size), dtype=np.int64)
+
+        if counts.shape != (size, size):
+            raise ValueError("The shape of the counts does not match the size of the codebook.")
+
+        self.__codebook = codebook
+        self.__counts   = counts
+
+    @classmethod
+    def fromCodes(
+        cls,
+        codebook: IntentCodebook,
+        expected_codes: np.ndarray,
+        detected_codes: np.ndarray
+    ) -> "DenseConfusionMatrix":
+        """
+        Args:
+            codebook: The codebook the codes belong to.
+            expected_codes: The codes of the expected intents, one entry for each rated sentence.
+            detected_codes: The codes of the detected intents, one entry for each rated sentence.
+
+        Returns:
+            A new confusion matrix counting each pair of expected and detected intent.
+        """
+
+        size = len(codebook)
+
+        counts = np.bincount(
+            np.asarray(expected_codes, dtype=np.int64) * size
+            + np.asarray(detected_codes, dtype=np.int64),
+            minlength=size * size
+        ).reshape((size, size))
+
+        return cls(codebook, counts)
+
+    @classmethod
+    def fromConfusionMatrix(
+        cls,
+        confusion_matrix: ConfusionMatrix,
+        codebook: Optional[IntentCodebook] = None
+    ) -> "DenseConfusionMatrix":
+        """
+        Args:
+            confusion_matrix: The confusion matrix in nested dictionary form.
+            codebook: The codebook to use. Intents that are missing from the codebook are added.
+                Defaults to a new codebook.
+
+        Returns:
+            A new dense confusion matrix containing the same counts.
+        """
+
+        if codebook is None:
+            codebook = IntentCodebook()
+
+        entries = [
+            (codebook.encode(expected), codebook.encode(detected), amount)
+            for expected, actual in confusion_matrix.items()
+            for detected, amount in actual.items()
+        ]
+
+        size = len(codebook)
+        counts = np.zeros((size, size), dtype=np.int64)
+
+        if len(entries) > 0:
+            rows, columns, amounts = zip(*entries)
+            np.add.at(counts, (list(rows), list(columns)), list(amounts))
+
+        return cls(codebook, counts)
+
+    @property
+    def codebook(self) -> IntentCodebook:
+        return self.__codebook
+
+    @property
+    def counts(self) -> np.ndarray:
+        """
+        Returns:
+            A read-only view of the counts, resized to the current size of the codebook.
+        """
+
+        self.__resize()
+
+        counts = self.__counts.view()
+        counts.flags.writeable = False
+        return counts
+
+    def add(self, expected: Intent, detected: Intent, amount: int = 1) -> None:
+        """
+        Args:
+            expected: The expected intent.
+            detected: The detected intent.
+            amount: The amount to add to the count of this pair. Defaults to 1.
+        """
+
+        expected_code = self.__codebook.encode(expected)
+        detected_code = self.__codebook.encode(detected)
+
+        self.__resize()
+
+        self.__counts[expected_code, detected_code] += amount
+
+    def __resize(self) -> None:
+        """
+        Grow the counts to match the size of the codebook, in case intents were added to it.
+        """
+
+        size = len(self.__codebook)
+        old_size = self.__counts.shape[0]
+
+        if size != old_size:
+            counts = np.zeros((size, size), dtype=self.__counts.dtype)
+            counts[:old_size, :old_size] = self.__counts
+            self.__counts = counts
+
+    def toConfusionMatrix(self) -> ConfusionMatrix:
+        """
+        Returns:
+            The confusion matrix in nested dictionary form. Only contains non-zero counts.
+        """
+
+        self.__resize()
+
+        confusion_matrix: ConfusionMatrix = {}
+
+        for expected_code, detected_code in zip(*np.nonzero(self.__counts)):
+            expected = self.__codebook.decode(expected_code)
+            detected = self.__codebook.decode(detected_code)
+
+            confusion_matrix[expected] = confusion_matrix.get(expected, {})
+            confusion_matrix[expected][detected] = int(self.__counts[expected_code, detected_code])
+
+        return confusion_matrix
+
+    def f1ScoreArray(self) -> np.ndarray:
+        """
+        Calculate the F1 scores of all intents at once.
+
+        Returns:
+            An array containing the F1 score of each intent, indexed by the intent codes. Intents
+            that were neither expected nor detected have a score of 0. Note: The scores are
+            multiplied times 100, see
+            :meth:`~nlutestframework.nlu_benchmarker.NLUBenchmarker.confusionMatrixToF1Scores`.
+        """
+
+        self.__resize()
+
+        true_positives = np.diagonal(self.__counts).astype(np.float64)
+        detected       = self.__counts.sum(axis=0)
+        expected       = self.__counts.sum(axis=1)
+
+        # Divisions of 0 by 0 result in 0
+        precision = self.__safeDivide(true_positives, detected)
+        recall    = self.__safeDivide(true_positives, expected)
+
+        return self.__safeDivide(100 * 2 * precision * recall, precision + recall)
+
+    def f1Scores(self) -> Dict[Intent, float]:
+        """
+        Returns:
+            A mapping from intents to their respective F1 scores. Only contains the intents that
+            were expected at least once.
+        """
+
+        f1_scores = self.f1ScoreArray()
+        expected  = self.__counts.sum(axis=1)
+
+        return {
+            self.__codebook.decode(int(code)): float(f1_scores[code])
+            for code
+            in np.flatnonzero(expected)
+        }
+
+    @staticmethod
+    def __safeDivide(dividends: np.ndarray, divisors: np.ndarray) -> np.ndarray:
+        """
+        Element-wise division, returns 0 where the divisor is 0.
+        """
+
+        divisors = np.asarray(divisors, dtype=np.float64)
+
+        quotients: np.ndarray = np.divide(
+            dividends,
+            divisors,
+            out=np.zeros(divisors.shape, dtype=np.float64),
+            where=divisors != 0
+        )
+
+        return quotients
+
+    def __str__(self) -> str:
+        return "Dense confusion matrix over {} intents with {} entries.".format(
+            len(self.__codebook),
+            int(self.__counts.sum())
+        )
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+
+from .has_logger import HasLogger
+
+# Other imports only for the type hints
+from typing import (
+    Any, Callable, ClassVar, Dict, FrozenSet, List, Optional, Set, Tuple, Type, TypeVar
+)
+from .events import Event
+
+E = TypeVar("E") # pylint: disable=invalid-name
+
+Handler = Callable[[Any], None]
+
+class EventBus(HasLogger):
+    """
+    Delivers the events of the benchmark (see :mod:`~nlutestframework.events`) to observers, like
+    progress bars, metrics exporters or result writers.
+
+    Observers subscribe either synchronously, using :meth:`subscribe`, or through an asyncio queue,
+    using :meth:`subscribeQueue`. Synchronous handlers are called in the thread that publishes the
+    event, which is the event loop thread for most events. Handlers must return quickly, as they
+    run in the middle of the benchmark. Exceptions raised by handlers are logged and ignored.
+
+    Publishers check :meth:`subscribed` before creating an event, so that events cost a dictionary
+    lookup only while nobody subscribes to them.
+    """
+
+    __instance: ClassVar["EventBus"]
+
+    @classmethod
+    def getInstance(cls) -> "EventBus":
+        """
+        Returns:
+            The singleton instance of this class.
+        """
+
+        try:
+            return cls.__instance
+        except AttributeError:
+            cls.__instance = cls()
+            return cls.__instance
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.__lock = threading.Lock()
+
+        # The subscribed handlers with the event types they subscribed to, None for all types
+        self.__subscriptions: List[Tuple[Handler, Optional[FrozenSet[type]]]] = []
+
+        # The handlers of the queues subscribed via subscribeQueue
+        self.__queue_handlers: Dict["asyncio.Queue[Any]", Handler] = {}
+
+        # The handlers to call for each event type, rebuilt on each (un)subscription so that
+        # publishing doesn't have to lock. Event types that are not contained receive the handlers
+        # that subscribed to all types.
+        self.__dispatch: Dict[type, Tuple[Handler, ...]] = {}
+        self.__all: Tuple[Handler, ...] = ()
+
+    def subscribe(self, handler: Callable[[E], None], *event_types: Type[E]) -> None:
+        """
+        Args:
+            handler: The function to call with each event.
+            *event_types: The types of the events to receive. Receives all events if none are given.
+        """
+
+        with self.__lock:
+            self.__subscriptions.append((
+                handler,
+                frozenset(event_types) if len(event_types) > 0 else None
+            ))
+            self.__rebuild()
+
+    def unsubscribe(self, handler: Callable[[E], None]) -> None:
+        """
+        Args:
+            handler: A handler passed to :meth:`subscribe`. Does nothing if the handler is not
+                subscribed.
+        """
+
+        with self.__lock:
+            # Compare by equality, bound methods are recreated on each access
+            self.__subscriptions = [ x for x in self.__subscriptions if x[0] != handler ]
+            self.__rebuild()
+
+    def subscribeQueue(self, *event_types: type, maxsize: int = 0) -> "asyncio.Queue[Any]":
+        """
+        Subscribe an asyncio queue bound to the running event loop. Events published from other
+        threads are handed over to the event loop thread.
+
+        Args:
+            *event_types: The types of the events to receive. Receives all events if none are given.
+            maxsize: The maximum number of events in the queue. Further events are dropped with a
+                warning while the queue is full. Defaults to 0, which doesn't limit the queue.
+
+        Returns:
+            The queue that receives the events.
+        """
+
+        loop = asyncio.get_event_loop()
+        loop_thread = threading.get_ident()
+        queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize)
+
+        def put(event: Event) -> None:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._logger.warning("Dropping %s, the event queue is full.", type(event).__name__)
+
+        def handler(event: Event) -> None:
+            if threading.get_ident() == loop_thread:
+                put(event)
+            else:
+                loop.call_soon_threadsafe(put, event)
+
+        self.__queue_handlers[queue] = handler
+        self.subscribe(handler, *event_types)
+
+        return queue
+
+    def unsubscribeQueue(self, queue: "asyncio.Queue[Any]") -> None:
+        """
+        Args:
+            queue: A queue returned by :meth:`subscribeQueue`. Does nothing if the queue is not
+                subscribed. Events that were queued already stay in the queue.
+        """
+
+        handler = self.__queue_handlers.pop(queue, None)
+        if handler is not None:
+            self.unsubscribe(handler)
+
+    def __rebuild(self) -> None:
+        event_types: Set[type] = set()
+        for _, types in self.__subscriptions:
+            event_types.update(types or ())
+
+        self.__dispatch = {
+            event_type: tuple(
+                handler for handler, types in self.__subscriptions
+                if types is None or event_type in types
+            ) for event_type in event_types
+        }
+
+        self.__all = tuple(handler for handler, types in self.__subscriptions if types is None)
+
+    def subscribed(self, event_type: type) -> bool:
+        """
+        Args:
+            event_type: The type of an event.
+
+        Returns:
+            Whether anybody subscribed to events of this type.
+        """
+
+        return len(self.__dispatch.get(event_type, self.__all)) > 0
+
+    def publish(self, event: Event) -> None:
+        """
+        Call the handlers that subscribed to the type of the event.
+
+        Args:
+            event: The event to publish.
+        """
+
+        for handler in self.__dispatch.get(type(event), self.__all):
+            try:
+                handler(event)
+            except Exception: # pylint: disable=broad-except
+                self._logger.exception("Error in the handler of %s.", type(event).__name__)
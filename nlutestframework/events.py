@@ -0,0 +1,118 @@
+from .lifecycle_stage import LifecycleStage
+from .nlu_intent_rating import NLUIntentRating
+from .resource_monitor import ResourceUsage
+
+# Other imports only for the type hints
+from typing import List, NamedTuple, Optional, Union
+from .types import ConfusionMatrix, DataSetTitle, FrameworkTitle
+
+class RunStarted(NamedTuple):
+    """
+    Published by :meth:`~nlutestframework.nlu_benchmarker.NLUBenchmarker.run` before benchmarking.
+    """
+
+    frameworks: List[FrameworkTitle]
+    data_sets: List[DataSetTitle]
+    iterations: int
+
+class RunFinished(NamedTuple):
+    """
+    Published by :meth:`~nlutestframework.nlu_benchmarker.NLUBenchmarker.run` after benchmarking,
+    also if the run failed or was cancelled.
+    """
+
+    # Whether all iterations of all frameworks on all data sets were completed
+    completed: bool
+
+class IterationStarted(NamedTuple):
+    """
+    Published before a framework runs a benchmark iteration on a data set.
+    """
+
+    framework: FrameworkTitle
+    data_set: DataSetTitle
+
+    # The index of the iteration, starting at 0
+    iteration: int
+
+class IterationFinished(NamedTuple):
+    """
+    Published after a framework completed a benchmark iteration on a data set.
+    """
+
+    framework: FrameworkTitle
+    data_set: DataSetTitle
+
+    # The index of the iteration, starting at 0
+    iteration: int
+
+    # The result of the iteration
+    confusion_matrix: ConfusionMatrix
+
+class StageStarted(NamedTuple):
+    """
+    Published when a framework enters a lifecycle stage, see
+    :meth:`~nlutestframework.nlu_framework.NLUFramework.stage`.
+    """
+
+    framework: FrameworkTitle
+
+    # The data set the stage belongs to, None for the construction and destruction
+    data_set: Optional[DataSetTitle]
+
+    stage: LifecycleStage
+
+class StageFinished(NamedTuple):
+    """
+    Published when a framework leaves a lifecycle stage, also if the stage failed.
+    """
+
+    framework: FrameworkTitle
+
+    # The data set the stage belongs to, None for the construction and destruction
+    data_set: Optional[DataSetTitle]
+
+    stage: LifecycleStage
+
+    # The resources used in the stage, see ResourceMonitor
+    usage: ResourceUsage
+
+class SentenceRated(NamedTuple):
+    """
+    Published for each rating that a framework requested while benchmarking, together with its
+    latency. Published from executor threads by frameworks that rate in an executor.
+    """
+
+    framework: FrameworkTitle
+
+    # The rating, None if the framework reported the latency only
+    rating: Optional[NLUIntentRating]
+
+    # The latency of the rating in nanoseconds
+    latency: int
+
+class ThresholdChosen(NamedTuple):
+    """
+    Published by the :class:`~nlutestframework.intent_threshold_optimizer.IntentThresholdOptimizer`
+    once the optimal threshold is found.
+    """
+
+    framework: FrameworkTitle
+    data_set: DataSetTitle
+
+    # The optimized confidence threshold
+    threshold: float
+
+    # The mean F1 score over all intents and iterations at the threshold
+    f1_score: float
+
+Event = Union[
+    RunStarted,
+    RunFinished,
+    IterationStarted,
+    IterationFinished,
+    StageStarted,
+    StageFinished,
+    SentenceRated,
+    ThresholdChosen
+]
@@ -0,0 +1,39 @@
+import hashlib
+import json
+
+# Other imports only for the type hints
+from typing import Iterable, List
+from .types import JSONSerializable
+from .nlu_data_entry import NLUDataEntry
+
+def fingerprint_json(value: JSONSerializable) -> str:
+    """
+    Args:
+        value: The value to fingerprint. Must be serializable to JSON.
+
+    Returns:
+        A hex digest that only depends on the content of the value, not on the order of dictionary
+        keys.
+    """
+
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+def fingerprint_training_data(language: str, training_data: Iterable[NLUDataEntry]) -> str:
+    """
+    Args:
+        language: The language of the data set the training data belongs to.
+        training_data: The data to fingerprint.
+
+    Returns:
+        A hex digest that only depends on the language and the set of (sentence, intent) pairs of
+        the training data, not on the order of the entries.
+    """
+
+    entries: List[JSONSerializable] = [ [ entry.sentence, entry.intent ] for entry in sorted(
+        training_data,
+        key=lambda x: (x.sentence, "" if x.intent is None else x.intent)
+    ) ]
+
+    return fingerprint_json([ language, entries ])
@@ -1,9 +1,28 @@
+import sys
+
+# Other imports only for the type hints
+from typing import Any, Dict, List, Optional, Sequence
+
 class GlobalConfig:
     """
     Global configuration of the NLU test framework.
     """
 
-    def __init__(self, python: str, iterations: int, ignore_cache: bool):
+    def __init__(
+        self,
+        python: str,
+        iterations: int,
+        ignore_cache: bool,
+        rating_cache: Optional[str] = None,
+        model_cache: Optional[str] = None,
+        model_cache_size: int = 1024,
+        loop_lag_threshold: Optional[float] = None,
+        lazy_data_sets: bool = False,
+        output_directory: str = "results",
+        chart_formats: Sequence[str] = ("png",),
+        profile: Sequence[str] = (),
+        profiler: str = "sampling"
+    ):
         """
         Args:
             python: The absolute path to a python executable. This executable can be used by
@@ -13,11 +32,89 @@ class GlobalConfig:
                 implementation for an example.
             iterations: The number of iterations to measure the performances of the frameworks.
             ignore_cache: A boolean indicating whether to ignore cached data.
+            rating_cache: The path to a directory to cache intent ratings in. If set, the ratings of
+                each framework are cached based on the framework configuration, the training data
+                and the rated sentence. Frameworks skip the training and the rating completely if
+                all ratings of a benchmark iteration are cached. Combine this with a fixed seed for
+                the data sets (see :class:`~nlutestframework.nlu_data_set.NLUDataSet`) to benefit
+                from the cache across runs. Ignored if ignore_cache is set. Defaults to
+                :obj:`None`, which disables the cache.
+            model_cache: The path to a directory to store trained models in. Frameworks that
+                support it (e.g. Snips NLU and Rasa NLU) reload a stored model instead of training
+                again, if they were trained on the same data with the same configuration before.
+                Ignored if ignore_cache is set. Defaults to :obj:`None`, which disables the cache.
+            model_cache_size: The maximum size of the model cache in megabytes. The least recently
+                used models are removed when the cache grows bigger. Defaults to 1024.
+            loop_lag_threshold: If set, the event loop is monitored while benchmarking and each
+                phase in which the event loop was blocked for longer than this number of seconds is
+                logged, together with the framework and the lifecycle stage that blocked it. See
+                :class:`~nlutestframework.loop_lag_monitor.LoopLagMonitor`. Defaults to
+                :obj:`None`, which disables the monitoring.
+            lazy_data_sets: A boolean indicating whether to load each data set just before
+                benchmarking on it and to release it afterwards, instead of loading all data sets
+                up front. Reduces the peak memory usage to that of the largest data set, but errors
+                in the data set configuration only show up once the data set is loaded. Defaults to
+                False.
+            output_directory: The path to a directory to write the output of the benchmark runs
+                to. Each run creates a new subdirectory, named after the time the run started.
+                Defaults to "results".
+            chart_formats: The formats to render the charts of a run in, any of "png", "svg" and
+                "html". The charts are rendered in a separate process into the "charts"
+                subdirectory of the run, see
+                :class:`~nlutestframework.report_renderer.ReportRenderer`. Defaults to PNG only.
+            profile: The lifecycle stages of the frameworks to profile, each given as the framework
+                title and the stage separated by a colon, e.g. "Snips:train". One profile file is
+                written per framework, data set and stage into the "profiles" subdirectory of the
+                run, see :class:`~nlutestframework.stage_profiler.StageProfiler`. Defaults to no
+                stages, which disables the profiling.
+            profiler: The profiler to use for the profiled stages, either "sampling" or
+                "deterministic", see :class:`~nlutestframework.stage_profiler.ProfilerMode`.
+                Defaults to "sampling".
         """
 
         self.__python = python
         self.__iterations = iterations
         self.__ignore_cache = ignore_cache
+        self.__rating_cache = rating_cache
+        self.__model_cache = model_cache
+        self.__model_cache_size = model_cache_size
+        self.__loop_lag_threshold = loop_lag_threshold
+        self.__lazy_data_sets = lazy_data_sets
+        self.__output_directory = output_directory
+        self.__chart_formats = list(chart_formats)
+        self.__profile = list(profile)
+        self.__profiler = profiler
+
+    @classmethod
+    def fromConfig(cls, config: Dict[str, Any], **override: Any) -> "GlobalConfig":
+        """
+        Args:
+            config: The global configuration as contained in the :ref:`full configuration
+                <configuration-full>`. Omitted options are set to their defaults, the python
+                executable defaults to the current one.
+            **override: Options to override in the configuration.
+
+        Returns:
+            The global configuration.
+        """
+
+        options = {
+            "python"             : config.get("python", sys.executable),
+            "iterations"         : config["iterations"],
+            "ignore_cache"       : config.get("ignore_cache", False),
+            "rating_cache"       : config.get("rating_cache", None),
+            "model_cache"        : config.get("model_cache", None),
+            "model_cache_size"   : config.get("model_cache_size", 1024),
+            "loop_lag_threshold" : config.get("loop_lag_threshold", None),
+            "lazy_data_sets"     : config.get("lazy_data_sets", False),
+            "output_directory"   : config.get("output_directory", "results"),
+            "chart_formats"      : config.get("chart_formats", [ "png" ]),
+            "profile"            : config.get("profile", []),
+            "profiler"           : config.get("profiler", "sampling")
+        }
+        options.update(override)
+
+        return cls(**options)
 
     @property
     def python(self) -> str:
@@ -30,3 +127,39 @@ class GlobalConfig:
     @property
     def ignore_cache(self) -> bool:
         return self.__ignore_cache
+
+    @property
+    def rating_cache(self) -> Optional[str]:
+        return self.__rating_cache
+
+    @property
+    def model_cache(self) -> Optional[str]:
+        return self.__model_cache
+
+    @property
+    def model_cache_size(self) -> int:
+        return self.__model_cache_size
+
+    @property
+    def loop_lag_threshold(self) -> Optional[float]:
+        return self.__loop_lag_threshold
+
+    @property
+    def lazy_data_sets(self) -> bool:
+        return self.__lazy_data_sets
+
+    @property
+    def output_directory(self) -> str:
+        return self.__output_directory
+
+    @property
+    def chart_formats(self) -> List[str]:
+        return self.__chart_formats
+
+    @property
+    def profile(self) -> List[str]:
+        return self.__profile
+
+    @property
+    def profiler(self) -> str:
+        return self.__profiler
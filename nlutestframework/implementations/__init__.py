@@ -1,9 +1,29 @@
-# Subpackages
+import importlib
 
-# Modules on this level
-from .simple_json_data_set import SimpleJSONDataSet
+# Other imports only for the type hints
+from typing import Any, List
 
-from .dialogflow_nlu_framework import DialogflowNLUFramework
-from .luis_nlu_framework import LUISNLUFramework
-from .rasa_nlu_framework import RasaNLUFramework
-from .snips_nlu_framework import SnipsNLUFramework
+# Modules on this level, imported lazily on first access, so that only the SDKs of the
+# implementations in use are loaded.
+_IMPLEMENTATIONS = {
+    "JSONLDataSet"           : "jsonl_data_set",
+    "SimpleJSONDataSet"      : "simple_json_data_set",
+
+    "DialogflowNLUFramework" : "dialogflow_nlu_framework",
+    "LUISNLUFramework"       : "luis_nlu_framework",
+    "RasaNLUFramework"       : "rasa_nlu_framework",
+    "SnipsNLUFramework"      : "snips_nlu_framework"
+}
+
+__all__ = list(_IMPLEMENTATIONS)
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _IMPLEMENTATIONS[name]
+    except KeyError:
+        raise AttributeError("module {} has no attribute {}".format(__name__, name)) from None
+
+    return getattr(importlib.import_module("." + module, __name__), name)
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
@@ -6,11 +6,12 @@ import dialogflow_v2
 from google.api_core.exceptions import FailedPrecondition, ResourceExhausted
 from langcodes import Language
 
+from ..nlu_data_view import group_by_intent
 from ..nlu_framework import NLUFramework
 from ..nlu_intent_rating import NLUIntentRating
 
 # Other imports only for the type hints
-from typing import List, Dict, Any
+from typing import Dict, Any, Sequence
 from ..global_config import GlobalConfig
 from ..nlu_data_entry import NLUDataEntry
 from ..nlu_data_set import NLUDataSet
@@ -40,9 +41,19 @@ class DialogflowNLUFramework(NLUFramework):
         # Create the various clients to interact with the Dialogflow API
         clients_config: Dict[str, Any] = {}
 
-        self.__agents_client   = dialogflow_v2.AgentsClient(**clients_config)
-        self.__intents_client  = dialogflow_v2.IntentsClient(**clients_config)
-        self.__sessions_client = dialogflow_v2.SessionsClient(**clients_config)
+        # Creating the clients loads the credentials from disk
+        self.__agents_client   = await self._runBlocking(
+            dialogflow_v2.AgentsClient,
+            **clients_config
+        )
+        self.__intents_client  = await self._runBlocking(
+            dialogflow_v2.IntentsClient,
+            **clients_config
+        )
+        self.__sessions_client = await self._runBlocking(
+            dialogflow_v2.SessionsClient,
+            **clients_config
+        )
 
         await self.__removeIntents()
 
@@ -58,16 +69,17 @@ class DialogflowNLUFramework(NLUFramework):
         # The following code attempts to retrieve the current agent and to extract the current
         # default language code from it.
         try:
-            default_language_code = self.__agents_client.get_agent(
+            default_language_code = (await self._runBlocking(
+                self.__agents_client.get_agent,
                 agent_parent_path
-            ).default_language_code
-        except: # pylint: disable=bare-except
+            )).default_language_code
+        except Exception: # pylint: disable=broad-except
             # TODO: Unable to figure out which exact error is raised in case the agent doesn't
             # exist, which is why this code catches any exception that might be raised by the call
             # to get_agent.
             default_language_code = "en"
 
-        self.__agents_client.set_agent(dialogflow_v2.types.Agent(
+        await self._runBlocking(self.__agents_client.set_agent, dialogflow_v2.types.Agent(
             parent       = agent_parent_path,
             display_name = self.__agent,
             time_zone    = self.__time_zone,
@@ -79,15 +91,11 @@ class DialogflowNLUFramework(NLUFramework):
         del self.__language
 
     # pylint: disable=attribute-defined-outside-init
-    async def train(self, training_data: List[NLUDataEntry]) -> None:
+    async def train(self, training_data: Sequence[NLUDataEntry]) -> None:
         intents_parent = self.__intents_client.project_agent_path(self.__project)
 
         # Group the training data by intents
-        intent_sentences = {
-            intent: [ datum for datum in training_data if datum.intent == intent ]
-            for intent
-            in { x.intent for x in training_data }
-        }
+        intent_sentences = group_by_intent(training_data)
 
         # Convert the training data into the format expected by Dialogflow
         # Each intent becomes an object, containing the training data for that specific intent
@@ -115,14 +123,20 @@ class DialogflowNLUFramework(NLUFramework):
         intent_batch = dialogflow_v2.types.IntentBatch(intents=intent_instances)
 
         # Create the intents
-        self.__intents_client.batch_update_intents(
+        operation = await self._runBlocking(
+            self.__intents_client.batch_update_intents,
             intents_parent,
             self.__language,
             intent_batch_inline=intent_batch
-        ).result() # TODO: Replace .result() with a non-blocking alternative
+        )
+        await self._runBlocking(operation.result)
 
         # Train the agent
-        self.__agents_client.train_agent(self.__agents_client.project_path(self.__project)).result()
+        operation = await self._runBlocking(
+            self.__agents_client.train_agent,
+            self.__agents_client.project_path(self.__project)
+        )
+        await self._runBlocking(operation.result)
 
     async def rateIntents(self, sentence: str) -> NLUIntentRating:
         # The session id is randomized so that the context-mechanics of Dialogflow don't mess with
@@ -135,7 +149,11 @@ class DialogflowNLUFramework(NLUFramework):
 
         while True:
             try:
-                detect_intent_response = self.__sessions_client.detect_intent(session, query_input)
+                detect_intent_response = await self._runBlocking(
+                    self.__sessions_client.detect_intent,
+                    session,
+                    query_input
+                )
                 break
             except FailedPrecondition:
                 # TODO: Remove this as soon as the problem described in
@@ -168,7 +186,15 @@ class DialogflowNLUFramework(NLUFramework):
 
         intents_parent = self.__intents_client.project_agent_path(self.__project)
 
-        intents = list(self.__intents_client.list_intents(intents_parent))
+        # The pages of the listing are fetched lazily, consume the whole listing in the executor
+        intents = await self._runBlocking(
+            lambda: list(self.__intents_client.list_intents(intents_parent))
+        )
 
         if len(intents) > 0:
-            self.__intents_client.batch_delete_intents(intents_parent, intents).result()
+            operation = await self._runBlocking(
+                self.__intents_client.batch_delete_intents,
+                intents_parent,
+                intents
+            )
+            await self._runBlocking(operation.result)
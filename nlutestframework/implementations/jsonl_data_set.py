@@ -0,0 +1,43 @@
+import json
+
+from ..nlu_corpus import NLUCorpus
+from ..nlu_data_set import NLUDataSet
+
+# Other imports only for the type hints
+from typing import Iterator, TextIO, Tuple
+from ..types import Intent
+
+class JSONLDataSet(NLUDataSet): # pylint: disable=abstract-method
+    """
+    A data set in the JSON Lines format: one JSON object per line, each containing the sentence
+    ("text") and the intent ("intent") of one utterance. The intent "None" (or null) marks the
+    None-intent, other keys are ignored. Empty lines are skipped.
+
+    The format doesn't contain the language, which has to be passed to the constructor.
+    """
+
+    def _loadCorpus(self, data_path: str) -> NLUCorpus:
+        if self.language is None:
+            raise ValueError("The language of JSON Lines data sets has to be configured.")
+
+        with open(data_path, "r", encoding="utf-8") as f:
+            return NLUCorpus.fromPairs(self.__streamPairs(f))
+
+    @staticmethod
+    def __streamPairs(f: TextIO) -> Iterator[Tuple[str, Intent]]:
+        """
+        Parse the file one line at a time.
+        """
+
+        for line_number, line in enumerate(f, 1):
+            if line.strip() == "":
+                continue
+
+            try:
+                entry = json.loads(line)
+                sentence = entry["text"]
+                intent = entry["intent"]
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError("Invalid utterance on line {}.".format(line_number)) from e
+
+            yield sentence, None if intent == "None" else intent
@@ -13,7 +13,7 @@ from msrest.authentication import CognitiveServicesCredentials
 from langcodes import Language
 
 # Other imports only for the type hints
-from typing import List, Optional
+from typing import Optional, Sequence
 from ..global_config import GlobalConfig
 from ..nlu_data_entry import NLUDataEntry
 from ..nlu_data_set import NLUDataSet
@@ -57,25 +57,26 @@ class LUISNLUFramework(OptimizableNLUFramework):
 
     # pylint: disable=attribute-defined-outside-init
     async def _prepareDataSet(self, data_set: NLUDataSet) -> None:
-        self.__app_id = self.__authoring_client.apps.add({
+        self.__app_id = await self._runBlocking(self.__authoring_client.apps.add, {
             "name"    : "NLUTestFramework",
             "culture" : Language.get(data_set.language).simplify_script().to_tag(),
             "initial_version_id": self.__class__.FAKE_VERSION
         })
 
     async def unprepareDataSet(self) -> None:
-        self.__authoring_client.apps.delete(self.__app_id, force=True)
+        await self._runBlocking(self.__authoring_client.apps.delete, self.__app_id, force=True)
 
         del self.__app_id
 
     # pylint: disable=attribute-defined-outside-init
-    async def train(self, training_data: List[NLUDataEntry]) -> None:
+    async def train(self, training_data: Sequence[NLUDataEntry]) -> None:
         fake_version = self.__class__.FAKE_VERSION
 
         self.__intent_ids = []
 
         for intent in { x.intent for x in training_data }:
-            self.__intent_ids.append(self.__authoring_client.model.add_intent(
+            self.__intent_ids.append(await self._runBlocking(
+                self.__authoring_client.model.add_intent,
                 self.__app_id,
                 fake_version,
                 intent
@@ -87,15 +88,28 @@ class LUISNLUFramework(OptimizableNLUFramework):
         # Add all examples, in batches of 100
         for i in range(0, math.ceil(len(examples) / 100)):
             batch = examples[i * 100:(i + 1) * 100]
-            self.__authoring_client.examples.batch(self.__app_id, fake_version, batch)
+            await self._runBlocking(
+                self.__authoring_client.examples.batch,
+                self.__app_id,
+                fake_version,
+                batch
+            )
 
         # Train the model
-        self.__authoring_client.train.train_version(self.__app_id, fake_version)
+        await self._runBlocking(
+            self.__authoring_client.train.train_version,
+            self.__app_id,
+            fake_version
+        )
 
         # Wait for the training to complete
         while True:
             # get_status returns a list of training statuses, one for each model.
-            statuses = self.__authoring_client.train.get_status(self.__app_id, fake_version)
+            statuses = await self._runBlocking(
+                self.__authoring_client.train.get_status,
+                self.__app_id,
+                fake_version
+            )
 
             unpacked_statuses = [ x.details.status for x in statuses ]
 
@@ -115,14 +129,20 @@ class LUISNLUFramework(OptimizableNLUFramework):
                 break
 
         # Publish the trained app
-        self.__authoring_client.apps.publish(self.__app_id, fake_version, is_staging=True)
+        await self._runBlocking(
+            self.__authoring_client.apps.publish,
+            self.__app_id,
+            fake_version,
+            is_staging=True
+        )
 
     async def _rateIntents(self, sentence: str) -> NLUIntentRating:
-        prediction = self.__runtime_client.prediction.get_slot_prediction(
+        prediction = (await self._runBlocking(
+            self.__runtime_client.prediction.get_slot_prediction,
             app_id             = self.__app_id,
             slot_name          = "staging",
             prediction_request = { "query": sentence }
-        ).prediction.intents
+        )).prediction.intents
 
         return NLUIntentRating(
             sentence,
@@ -132,7 +152,8 @@ class LUISNLUFramework(OptimizableNLUFramework):
     async def cleanupTraining(self) -> None:
         # Delete all intents and the corresponding utterances
         for intent_id in self.__intent_ids:
-            self.__authoring_client.model.delete_intent(
+            await self._runBlocking(
+                self.__authoring_client.model.delete_intent,
                 self.__app_id,
                 self.__class__.FAKE_VERSION,
                 intent_id,
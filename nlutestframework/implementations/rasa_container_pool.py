@@ -0,0 +1,319 @@
+import asyncio
+import functools
+
+import aiohttp
+import docker
+
+from ..fingerprint import fingerprint_json
+from ..has_logger import HasLogger
+from ..resource_monitor import ResourceMonitor
+
+# Other imports only for the type hints
+from typing import Any, Callable, ClassVar, Dict, List, NamedTuple, Optional, Set, TypeVar
+
+R = TypeVar("R") # pylint: disable=invalid-name
+
+class RasaContainerKey(NamedTuple):
+    """
+    Containers with equal keys are interchangeable.
+    """
+
+    image: str
+    language: str
+    pipeline: str
+
+    # The model cache directory to mount into the container, if any
+    model_cache: Optional[str]
+
+    @property
+    def fingerprint(self) -> str:
+        return fingerprint_json(list(self))
+
+class RasaContainer(NamedTuple):
+    container: Any # docker.models.containers.Container
+    url: str
+
+class RasaContainerPool(HasLogger):
+    """
+    A pool of running Rasa HTTP server containers, grouped by :class:`RasaContainerKey`. Containers
+    are leased for exclusive use (see :meth:`acquire` and :meth:`release`) and stay running after
+    being released, so that they can be reused for the next data set with the same key without
+    starting a new container.
+
+    The containers are labeled with the fingerprint of their key. Containers that were kept running
+    by a previous run (see :meth:`reap`) are adopted by the pool.
+    """
+
+    # The docker label used to find the containers of the pool
+    LABEL = "nlutestframework.rasa-container-pool"
+
+    # The location of the model cache inside of the containers, see GlobalConfig.model_cache
+    CONTAINER_MODEL_CACHE = "/app/model-cache"
+
+    __instance: ClassVar["RasaContainerPool"]
+
+    @classmethod
+    def getInstance(cls) -> "RasaContainerPool":
+        """
+        Returns:
+            The singleton instance of this class.
+        """
+
+        try:
+            return cls.__instance
+        except AttributeError:
+            cls.__instance = cls()
+            return cls.__instance
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.__docker: Optional[docker.DockerClient] = None
+        self.__session: Optional[aiohttp.ClientSession] = None
+
+        self.__pulled_images: Set[str] = set()
+        self.__idle: Dict[RasaContainerKey, List[RasaContainer]] = {}
+        self.__leases: Dict[RasaContainerKey, asyncio.Semaphore] = {}
+
+        # The ids of the running containers of each key, idle or leased
+        self.__running: Dict[RasaContainerKey, Set[str]] = {}
+
+        # The ids of the owners (usually framework instances) that prepared each key
+        self.__owners: Dict[RasaContainerKey, Set[int]] = {}
+
+    async def __runBlocking(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        return await asyncio.get_event_loop().run_in_executor(
+            None,
+            functools.partial(fn, *args, **kwargs)
+        )
+
+    async def __getDocker(self) -> docker.DockerClient:
+        if self.__docker is None:
+            self._logger.debug("Creating a client for the Docker daemon...")
+            self.__docker = await self.__runBlocking(docker.from_env)
+
+        return self.__docker
+
+    async def prepare(
+        self,
+        owner: object,
+        key: RasaContainerKey,
+        size: int,
+        timeout: int
+    ) -> None:
+        """
+        Prepare the pool for containers of the given key: pull the image, adopt containers that
+        are still running from previous runs and make sure that at least one container is running.
+
+        Args:
+            owner: The object that uses the containers of this key, see :meth:`reap`.
+            key: The key of the containers.
+            size: The maximum number of containers of this key. Only the size passed when preparing
+                a key for the first time is used.
+            timeout: The time in seconds to wait for a new container to become healthy.
+        """
+
+        self.__owners.setdefault(key, set()).add(id(owner))
+
+        docker_client = await self.__getDocker()
+
+        if key.image not in self.__pulled_images:
+            self._logger.debug("Pulling Rasa image \"%s\"...", key.image)
+            await self.__runBlocking(docker_client.images.pull, key.image)
+            self.__pulled_images.add(key.image)
+
+        if key not in self.__leases:
+            self.__leases[key] = asyncio.Semaphore(size)
+            self.__idle[key] = []
+
+            for container in await self.__runBlocking(
+                docker_client.containers.list,
+                filters={ "label": "{}={}".format(self.LABEL, key.fingerprint) }
+            ):
+                pooled_container = await self.__wrap(container)
+
+                if len(self.__idle[key]) < size and await self.__isHealthy(pooled_container):
+                    self._logger.info("Reusing running Rasa container %s.", container.short_id)
+                    self.__idle[key].append(pooled_container)
+                    self.__running.setdefault(key, set()).add(container.id)
+                else:
+                    await self.__runBlocking(container.stop)
+
+        if len(self.__idle[key]) == 0:
+            self.__idle[key].append(await self.__start(key, timeout))
+
+    async def acquire(self, key: RasaContainerKey, timeout: int) -> RasaContainer:
+        """
+        Lease a container for exclusive use. Waits if all containers of the key are leased and the
+        maximum number of containers is reached. Release the container using :meth:`release`.
+
+        Args:
+            key: The key of the container, must be prepared using :meth:`prepare`.
+            timeout: The time in seconds to wait for a new container to become healthy.
+
+        Returns:
+            A healthy container.
+        """
+
+        await self.__leases[key].acquire()
+
+        try:
+            while len(self.__idle[key]) > 0:
+                pooled_container = self.__idle[key].pop()
+
+                if await self.__isHealthy(pooled_container):
+                    return pooled_container
+
+                self._logger.warning(
+                    "Replacing unhealthy Rasa container %s.",
+                    pooled_container.container.short_id
+                )
+                self.__running[key].discard(pooled_container.container.id)
+                await self.__runBlocking(pooled_container.container.stop)
+
+            return await self.__start(key, timeout)
+        except BaseException:
+            self.__leases[key].release()
+            raise
+
+    def release(self, key: RasaContainerKey, pooled_container: RasaContainer) -> None:
+        """
+        Return a leased container to the pool.
+
+        Args:
+            key: The key of the container.
+            pooled_container: The container, as returned by :meth:`acquire`.
+        """
+
+        self.__idle[key].append(pooled_container)
+        self.__leases[key].release()
+
+    async def reap(self, owner: object, keep_running: bool) -> None:
+        """
+        Stop the containers of all keys that are not used by any other owner anymore. Call this
+        once the owner doesn't use any containers of the pool anymore, all leased containers have to
+        be released before.
+
+        Args:
+            owner: The object that prepared the keys, see :meth:`prepare`.
+            keep_running: A boolean indicating whether to keep healthy containers running, so that
+                they can be adopted by the next run. Unhealthy containers are stopped regardless.
+        """
+
+        for key, owners in list(self.__owners.items()):
+            owners.discard(id(owner))
+            if len(owners) > 0:
+                continue
+
+            for pooled_container in self.__idle.pop(key, []):
+                if keep_running and await self.__isHealthy(pooled_container):
+                    self._logger.info(
+                        "Keeping Rasa container %s running.",
+                        pooled_container.container.short_id
+                    )
+                else:
+                    self._logger.debug(
+                        "Stopping Rasa container %s...",
+                        pooled_container.container.short_id
+                    )
+                    await self.__runBlocking(pooled_container.container.stop)
+
+            self.__leases.pop(key, None)
+            self.__running.pop(key, None)
+            del self.__owners[key]
+
+        # The session is bound to the event loop, close it as soon as the pool is unused
+        if len(self.__owners) == 0 and self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    def containerIds(self, key: RasaContainerKey) -> List[str]:
+        """
+        Args:
+            key: The key of the containers.
+
+        Returns:
+            The ids of the running containers of the key, idle or leased.
+        """
+
+        return sorted(self.__running.get(key, set()))
+
+    async def __start(self, key: RasaContainerKey, timeout: int) -> RasaContainer:
+        """
+        Start a new container and wait for it to become healthy.
+        """
+
+        docker_client = await self.__getDocker()
+
+        # Mount the model cache into the container, so that cached models can be selected directly
+        volumes = {}
+        if key.model_cache is not None:
+            volumes[key.model_cache] = { "bind": self.CONTAINER_MODEL_CACHE, "mode": "ro" }
+
+        self._logger.debug("Starting a Rasa HTTP server...")
+        container = await self.__runBlocking(
+            docker_client.containers.run,
+            key.image,
+
+            # Run the Rasa server and enable the HTTP API
+            [ "run", "--enable-api" ],
+
+            # Automatically remove the container after the server shuts down
+            auto_remove=True,
+
+            # Don't wait for the command to finish
+            detach=True,
+
+            # Expose port 5005 (used for HTTP by Rasa) for TCP traffic to a random port
+            ports={ "5005/tcp": None },
+
+            # Mount the model cache, if enabled
+            volumes=volumes,
+
+            # Label the container, so that it can be found again
+            labels={ self.LABEL: key.fingerprint }
+        )
+
+        pooled_container = await self.__wrap(container)
+        self.__running.setdefault(key, set()).add(container.id)
+
+        self._logger.debug("Waiting for the health endpoint to come alive...")
+        for _ in range(timeout):
+            if await self.__isHealthy(pooled_container):
+                break
+
+            await asyncio.sleep(1)
+
+        self._logger.info("Container running.")
+
+        return pooled_container
+
+    async def __wrap(self, container: Any) -> RasaContainer:
+        """
+        Build the base url for the HTTP API of a container.
+        """
+
+        # Update the container information from the Docker daemon
+        await self.__runBlocking(container.reload)
+
+        # Extract the port mapping and build the base url for the HTTP API
+        port_mapping = container.attrs["NetworkSettings"]["Ports"]["5005/tcp"][0]
+
+        # Collect the resource usage of the container, see RasaNLUFramework._resourceContainers
+        ResourceMonitor.getInstance().watchContainer(container)
+
+        return RasaContainer(
+            container = container,
+            url = "http://{}:{}/".format(port_mapping["HostIp"], port_mapping["HostPort"])
+        )
+
+    async def __isHealthy(self, pooled_container: RasaContainer) -> bool:
+        if self.__session is None:
+            self.__session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5))
+
+        try:
+            async with self.__session.get(pooled_container.url) as response:
+                return response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # A container that accepts the connection but doesn't respond runs into the timeout
+            return False
@@ -1,46 +1,33 @@
-import asyncio
+import gzip
+import json
 
-import docker
+import aiohttp
 from langcodes import Language
-import requests
 import yaml
 
+from ..fingerprint import fingerprint_json, fingerprint_training_data
 from ..nlu_intent_rating import NLUIntentRating
 from ..optimizable_nlu_framework import OptimizableNLUFramework
+from .rasa_container_pool import RasaContainerKey, RasaContainerPool
 
 # Other imports only for the type hints
-from typing import List
-import logging
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+from ..types import Intent, JSONSerializable
+from .rasa_container_pool import RasaContainer
 from ..global_config import GlobalConfig
+from ..model_artifact_store import ModelArtifactStore
 from ..nlu_data_entry import NLUDataEntry
 from ..nlu_data_set import NLUDataSet
 
-def _raise_for_status(response: requests.Response, logger: logging.Logger) -> requests.Response:
-    """
-    Check the status code of the response. If the status code suggests an error, log the response as
-    JSON and then raise an exception. Otherwise, return the response for further processing.
-
-    Args:
-        response: The response to an HTTP request by the "requests" library.
-        logger: The logger to log errors with.
-
-    Returns:
-        The response, in case it didn't fail.
-
-    Raises:
-        :exc:`requests.exceptions.HTTPError`: if the response indicates an error.
-    """
-
-    try:
-        response.raise_for_status()
-        return response
-    except requests.exceptions.HTTPError as e:
-        logger.error(response.json(), exc_info=e)
-        raise
-
 class RasaNLUFramework(OptimizableNLUFramework):
+    # Each fork leases its own container from the pool
+    SUPPORTS_CONCURRENT_ITERATIONS = True
+
     __VERSION = "latest"
 
+    # Request bodies smaller than this number of bytes are not worth compressing
+    __COMPRESSION_MIN_SIZE = 1024
+
     # pylint: disable=arguments-differ
     async def construct( # type: ignore
         self,
@@ -48,6 +35,9 @@ class RasaNLUFramework(OptimizableNLUFramework):
         pipeline: str,
         *args,
         timeout: int = 10,
+        compress_requests: bool = False,
+        containers: int = 1,
+        keep_containers: bool = False,
         **kwargs
     ) -> None:
         """
@@ -56,6 +46,14 @@ class RasaNLUFramework(OptimizableNLUFramework):
             pipeline: The pipeline to use by Rasa NLU. Must be either "supervised" or "pretrained".
                 See https://rasa.com/docs/rasa/nlu/choosing-a-pipeline/ for details.
             timeout: The time in seconds to wait for the Rasa HTTP server to start. Defaults to 10.
+            compress_requests: A boolean indicating whether to gzip-compress the bodies of bigger
+                requests, like the training data. Only enable this if the server (or a proxy in
+                front of it) accepts gzip-encoded requests. Defaults to False.
+            containers: The maximum number of Rasa containers to run per image, language and
+                pipeline, which allows trainings and validations on the same data set to run at the
+                same time. Containers stay running across data sets. Defaults to 1.
+            keep_containers: A boolean indicating whether to keep the Rasa containers running after
+                the benchmark, so that the next run can reuse them. Defaults to False.
         """
 
         await super().construct(*args, **kwargs)
@@ -66,9 +64,22 @@ class RasaNLUFramework(OptimizableNLUFramework):
         # TODO: Pipeline flexible aka based on the number of training samples?
         self.__pipeline = pipeline
         self.__timeout  = timeout
+        self.__compress_requests = compress_requests
+        self.__containers = containers
+        self.__keep_containers = keep_containers
+
+        self.__container_pool = RasaContainerPool.getInstance()
+        self.__container: Optional[RasaContainer] = None
+
+        # One session with a pool of keep-alive connections, shared by all requests to the server.
+        # Training may take a long time, which is why there is no total timeout.
+        self.__session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=None))
 
-        self._logger.debug("Creating a client for the Docker daemon...")
-        self.__docker = docker.from_env()
+    async def destruct(self) -> None:
+        await self.__session.close()
+
+        # Reap the containers that are not used by other instances anymore
+        await self.__container_pool.reap(self, self.__keep_containers)
 
     # pylint: disable=attribute-defined-outside-init
     async def _prepareDataSet(self, data_set: NLUDataSet) -> None:
@@ -84,97 +95,149 @@ class RasaNLUFramework(OptimizableNLUFramework):
             # This bug is reported in the Rasa repo: https://github.com/RasaHQ/rasa/issues/4789
             image = "rasa/rasa:{}-spacy-{}".format(self.__VERSION, language)
 
+        self.__language = data_set.language
+        self.__image    = image
+
         # Create the Rasa config
         self.__rasa_config_yml = yaml.dump({ "language": language, "pipeline": pipeline_config })
 
-        # Connect to the Docker daemon and pull the Rasa container
-        self._logger.info("Preparing the docker container for Rasa...")
-        self._logger.debug("Pulling Rasa image \"%s\"...", image)
-        self.__docker.images.pull(image)
-
-        self._logger.debug("Starting the Rasa HTTP server...")
-        self.__container = self.__docker.containers.run(
-            image,
-
-            # Run the Rasa server and enable the HTTP API
-            [ "run", "--enable-api" ],
-
-            # Automatically remove the container after the server shuts down
-            auto_remove=True,
+        model_artifact_store = self._model_artifact_store
 
-            # Don't wait for the command to finish
-            detach=True,
-
-            # Expose port 5005 (used for HTTP by Rasa) for TCP traffic to a random port
-            ports={ "5005/tcp": None }
+        self.__container_key = RasaContainerKey(
+            image       = image,
+            language    = data_set.language,
+            pipeline    = pipeline_config,
+            model_cache = None if model_artifact_store is None else model_artifact_store.directory
         )
 
-        # Update the container information from the Docker daemon
-        self.__container.reload()
-
-        # Extract the port mapping and build the base url for the HTTP API
-        port_mapping = self.__container.attrs["NetworkSettings"]["Ports"]["5005/tcp"][0]
-        self.__url = "http://{}:{}/".format(port_mapping["HostIp"], port_mapping["HostPort"])
-
-        self._logger.debug("Waiting for the health endpoint to come alive...")
-        for _ in range(self.__timeout):
-            try:
-                success = requests.get(self.__url).status_code == 200
-            except requests.exceptions.ConnectionError:
-                success = False
-
-            if success:
-                break
+        self._logger.info("Preparing the docker container for Rasa...")
+        await self.__container_pool.prepare(
+            self,
+            self.__container_key,
+            self.__containers,
+            self.__timeout
+        )
 
-            await asyncio.sleep(1)
+    def _resourceContainers(self) -> List[str]:
+        # The leased container during training and validation, all containers of the data set
+        # otherwise
+        try:
+            if self.__container is not None:
+                return [ self.__container.container.id ]
 
-        self._logger.info("Container running.")
+            return self.__container_pool.containerIds(self.__container_key)
+        except AttributeError:
+            # Not constructed yet or not prepared for a data set
+            return []
 
     async def unprepareDataSet(self) -> None:
-        self.__container.stop()
-
+        # The container keeps running, ready for the next data set
+        del self.__language
+        del self.__image
         del self.__rasa_config_yml
-        del self.__container
-        del self.__url
+        del self.__container_key
 
     # pylint: disable=attribute-defined-outside-init
-    async def train(self, training_data: List[NLUDataEntry]) -> None:
-        # Build the training data structure as required by Rasa
-        training_markdown = ""
-
-        for intent in { x.intent for x in training_data }:
-            training_markdown += "## intent:{}\n".format(intent)
-
-            for entry in filter(
-                lambda x, intent=intent: x.intent == intent, # type: ignore
-            training_data):
-                training_markdown += "- {}\n".format(entry.sentence)
+    async def train(self, training_data: Sequence[NLUDataEntry]) -> None:
+        model_artifact_store = self._model_artifact_store
+
+        # Lease a container for the training and the validation, it is returned to the pool in
+        # cleanupTraining
+        self.__container = await self.__container_pool.acquire(
+            self.__container_key,
+            self.__timeout
+        )
 
-            training_markdown += "\n"
+        if model_artifact_store is not None:
+            model_key = "{}.tar.gz".format(fingerprint_json([
+                "rasa",
+                self.__image,
+                self.__rasa_config_yml,
+                fingerprint_training_data(self.__language, training_data)
+            ]))
+
+            if await self._runBlocking(model_artifact_store.get, model_key) is not None:
+                self._logger.debug("Selecting a cached model...")
+                await self.__selectModel("{}/{}".format(
+                    RasaContainerPool.CONTAINER_MODEL_CACHE,
+                    model_key
+                ))
+                return
+
+        # Build the training data structure as required by Rasa, in a single pass over the data
+        intent_sentences: Dict[Intent, List[str]] = {}
+        for entry in training_data:
+            intent_sentences.setdefault(entry.intent, []).append(
+                "- {}\n".format(entry.sentence)
+            )
+
+        training_markdown = "".join(
+            "## intent:{}\n{}\n".format(intent, "".join(sentences))
+            for intent, sentences
+            in intent_sentences.items()
+        )
 
         self._logger.debug("Training a model...")
-        training_response = _raise_for_status(requests.post(self.__url + "model/train", json={
+        headers, model = await self.__request("POST", "model/train", {
             "config" : self.__rasa_config_yml,
             "nlu"    : training_markdown,
             "force"  : True,
             "save_to_default_model_directory": True
-        }), self._logger)
+        })
 
-        file_name = training_response.headers["filename"]
+        file_name = headers["filename"]
         self._logger.debug("Model file name: %s", file_name)
 
-        self._logger.debug("Selecting the newly trained model...")
-        _raise_for_status(requests.put(self.__url + "model", json={
-            "model_file": "models/{}".format(file_name)
-        }), self._logger)
+        if model_artifact_store is None:
+            await self.__selectModel("models/{}".format(file_name))
+        else:
+            # The response contains the trained model file, add it to the cache and select it from
+            # there
+            self._logger.debug("Caching the trained model...")
+            await self._runBlocking(
+                self.__storeModel,
+                model_artifact_store,
+                model_key,
+                model
+            )
+
+            await self.__selectModel("{}/{}".format(
+                RasaContainerPool.CONTAINER_MODEL_CACHE,
+                model_key
+            ))
 
         self._logger.debug("Training completed.")
 
+    @staticmethod
+    def __storeModel(
+        model_artifact_store: ModelArtifactStore,
+        model_key: str,
+        model: bytes
+    ) -> None:
+        """
+        Args:
+            model_artifact_store: The store to add the model to.
+            model_key: The key to store the model under.
+            model: The content of the model file.
+        """
+
+        staging_path = model_artifact_store.stagingPath()
+        with open(staging_path, "wb") as f:
+            f.write(model)
+        model_artifact_store.put(model_key, staging_path)
+
+    async def __selectModel(self, model_file: str) -> None:
+        """
+        Args:
+            model_file: The path to the model file to load, inside of the container.
+        """
+
+        self._logger.debug("Selecting the model %s...", model_file)
+        await self.__request("PUT", "model", { "model_file": model_file })
+
     async def _rateIntents(self, sentence: str) -> NLUIntentRating:
-        response = _raise_for_status(requests.post(
-            self.__url + "model/parse",
-            json={ "text": sentence }
-        ), self._logger).json()
+        _, body = await self.__request("POST", "model/parse", { "text": sentence })
+        response = json.loads(body)
 
         return NLUIntentRating(sentence, [ (
             rated_intent["name"],
@@ -182,4 +245,66 @@ class RasaNLUFramework(OptimizableNLUFramework):
         ) for rated_intent in response["intent_ranking"] ])
 
     async def cleanupTraining(self) -> None:
-        _raise_for_status(requests.delete(self.__url + "model"), self._logger)
+        if self.__container is None:
+            return
+
+        try:
+            await self.__request("DELETE", "model")
+        finally:
+            self.__container_pool.release(self.__container_key, self.__container)
+            self.__container = None
+
+    async def __request(
+        self,
+        method: str,
+        path: str,
+        payload: Optional[JSONSerializable] = None
+    ) -> Tuple[Mapping[str, str], bytes]:
+        """
+        Send a request to the HTTP API of the Rasa server, using the pooled session.
+
+        Args:
+            method: The HTTP method.
+            path: The path of the endpoint, relative to the base url of the server.
+            payload: The JSON payload of the request, if any.
+
+        Returns:
+            The headers and the body of the response.
+
+        Raises:
+            :exc:`RuntimeError`: if no container is leased, i.e. outside of a training.
+            :exc:`aiohttp.ClientResponseError`: if the response indicates an error.
+        """
+
+        if self.__container is None:
+            raise RuntimeError("No Rasa container is leased, train the framework first.")
+
+        headers = {}
+        data    = None
+
+        if payload is not None:
+            headers["Content-Type"] = "application/json"
+            data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+            if self.__compress_requests and len(data) >= self.__COMPRESSION_MIN_SIZE:
+                headers["Content-Encoding"] = "gzip"
+                data = await self._runCPUBound(gzip.compress, data)
+
+        async with self.__session.request(
+            method,
+            self.__container.url + path,
+            data=data,
+            headers=headers
+        ) as response:
+            body = await response.read()
+
+            if response.status >= 400:
+                self._logger.error(
+                    "Request to %s failed with status %d: %s",
+                    path,
+                    response.status,
+                    body.decode("utf-8", errors="replace")
+                )
+                response.raise_for_status()
+
+            return response.headers, body
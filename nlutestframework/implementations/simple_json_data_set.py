@@ -1,21 +1,29 @@
-import json
-
-from ..nlu_data_entry import NLUDataEntry
+from ..json_stream import stream_json_object
+from ..nlu_corpus import NLUCorpus
 from ..nlu_data_set import NLUDataSet
 
 # Other imports only for the type hints
-from typing import List
+from typing import Iterator, Tuple
+from ..types import Intent
+
+class SimpleJSONDataSet(NLUDataSet): # pylint: disable=abstract-method
+    def _loadCorpus(self, data_path: str) -> NLUCorpus:
+        with open(data_path, "r", encoding="utf-8") as f:
+            return NLUCorpus.fromPairs(self.__streamPairs(stream_json_object(f, { "sentences" })))
+
+    def __streamPairs(self, members: Iterator[Tuple[str, object]]) -> Iterator[Tuple[str, Intent]]:
+        """
+        Convert the members of the data set document into pairs of sentences and intents, one
+        sentence at a time, without loading the whole document.
+        """
 
-class SimpleJSONDataSet(NLUDataSet):
-    def _loadData(self, data_path: str) -> List[NLUDataEntry]:
-        with open(data_path, "r") as f:
-            data = json.load(f)
+        for key, value in members:
+            # Load the language from the data set
+            if key == "lang":
+                self._setLanguage(value) # type: ignore
 
-        # Load the language from the data set
-        self._setLanguage(data["lang"])
+            # Load the intents and sentences from the data set
+            if key == "sentences":
+                intent = value["intent"] # type: ignore
 
-        # Load the intents and sentences from the data set
-        return [ NLUDataEntry(
-            entry["text"],
-            None if entry["intent"] == "None" else entry["intent"]
-        ) for entry in data["sentences"] ]
+                yield value["text"], None if intent == "None" else intent # type: ignore
@@ -1,20 +1,54 @@
+import asyncio
 import subprocess
+import time
 
+import snips_nlu
 from snips_nlu import SnipsNLUEngine
 from snips_nlu.default_configs import DEFAULT_CONFIGS
 
+from ..fingerprint import fingerprint_json, fingerprint_training_data
+from ..nlu_data_view import group_by_intent
 from ..nlu_framework import NLUFramework
 from ..nlu_intent_rating import NLUIntentRating
 
 from langcodes import Language
 
 # Other imports only for the type hints
-from typing import List
+from typing import List, Sequence, Union
+from ..types import JSONSerializable
 from ..global_config import GlobalConfig
+from ..model_artifact_store import ModelArtifactStore
 from ..nlu_data_entry import NLUDataEntry
 from ..nlu_data_set import NLUDataSet
 
+def _fit_engine(
+    config: JSONSerializable,
+    dataset: JSONSerializable,
+    serialize: bool
+) -> Union[SnipsNLUEngine, bytes]:
+    """
+    Train a Snips NLU engine. This is a module-level function, so that it can be run in a separate
+    process.
+
+    Args:
+        config: The configuration of the engine.
+        dataset: The training data in the Snips NLU dataset format.
+        serialize: Whether to return the engine serialized to bytes, which is required to transfer
+            it between processes.
+
+    Returns:
+        The trained engine, serialized to bytes if requested.
+    """
+
+    engine = SnipsNLUEngine(config)
+    engine.fit(dataset)
+
+    return engine.to_byte_array() if serialize else engine
+
 class SnipsNLUFramework(NLUFramework):
+    # Each fork holds its own engine
+    SUPPORTS_CONCURRENT_ITERATIONS = True
+
     # pylint: disable=arguments-differ
     async def construct( # type: ignore
         self,
@@ -36,16 +70,18 @@ class SnipsNLUFramework(NLUFramework):
         last_exception = None
 
         # Try all language tag derivations, from specific to broad
-        for language in Language.get(data_set.language).simplify_script().broaden():
-            language = language.to_tag()
+        for language_derivation in Language.get(data_set.language).simplify_script().broaden():
+            language = language_derivation.to_tag()
             try:
                 if not self.__skip_language_installations:
                     self._logger.info("Installing language resources for \"%s\"...", language)
 
-                    subprocess.run(
-                        [ self.__python, "-m", "snips_nlu", "download", language ],
-                        check=True
-                    )
+                    command = [ self.__python, "-m", "snips_nlu", "download", language ]
+
+                    process = await asyncio.create_subprocess_exec(*command)
+                    return_code = await process.wait()
+                    if return_code != 0:
+                        raise subprocess.CalledProcessError(return_code, command)
 
                 self.__language = language
 
@@ -61,27 +97,74 @@ class SnipsNLUFramework(NLUFramework):
         del self.__language
 
     # pylint: disable=attribute-defined-outside-init
-    async def train(self, training_data: List[NLUDataEntry]) -> None:
-        self.__engine = SnipsNLUEngine(DEFAULT_CONFIGS[self.__language])
-
-        intents = {}
+    async def train(self, training_data: Sequence[NLUDataEntry]) -> None:
+        model_artifact_store = self._model_artifact_store
+
+        if model_artifact_store is not None:
+            model_key = fingerprint_json([
+                "snips",
+                snips_nlu.__version__,
+                DEFAULT_CONFIGS[self.__language],
+                fingerprint_training_data(self.__language, training_data)
+            ])
+
+            model_path = await self._runBlocking(model_artifact_store.get, model_key)
+            if model_path is not None:
+                self._logger.debug("Loading a cached model...")
+                self.__engine = await self._runBlocking(SnipsNLUEngine.from_path, model_path)
+                return
+
+        intents = {
+            intent: {
+                "utterances": [ { "data": [ { "text": entry.sentence } ] } for entry in entries ]
+            }
+            for intent, entries
+            in group_by_intent(training_data).items()
+        }
+
+        engine = await self._runCPUBound(
+            _fit_engine,
+            DEFAULT_CONFIGS[self.__language],
+            {
+                "language" : self.__language,
+                "intents"  : intents,
+                "entities" : {}
+            },
+            self._uses_process_executor
+        )
 
-        for intent in { x.intent for x in training_data }:
-            utterances = []
+        if self._uses_process_executor:
+            engine = SnipsNLUEngine.from_byte_array(engine)
 
-            # Lambda not correctly supported in mypy
-            for entry in filter(lambda x, i=intent: x.intent == i, training_data): # type: ignore
-                utterances.append({ "data": [ { "text": entry.sentence } ] })
+        self.__engine = engine
 
-            intents[intent] = { "utterances": utterances }
+        if model_artifact_store is not None:
+            self._logger.debug("Caching the trained model...")
+            await self._runBlocking(self.__storeModel, model_artifact_store, model_key)
 
-        self.__engine.fit({
-            "language" : self.__language,
-            "intents"  : intents,
-            "entities" : {}
-        })
+    def __storeModel(self, model_artifact_store: ModelArtifactStore, model_key: str) -> None:
+        staging_path = model_artifact_store.stagingPath()
+        self.__engine.persist(staging_path)
+        model_artifact_store.put(model_key, staging_path)
 
     async def rateIntents(self, sentence: str) -> NLUIntentRating:
+        return await self._runBlocking(self.__rateIntents, sentence)
+
+    async def rateIntentsBatch(self, sentences: List[str]) -> List[NLUIntentRating]:
+        # The engine runs in-process, rate all sentences in one go instead of creating a coroutine
+        # for each
+        return await self._runBlocking(
+            lambda: [ self.__rateIntentsTimed(sentence) for sentence in sentences ]
+        )
+
+    def __rateIntentsTimed(self, sentence: str) -> NLUIntentRating:
+        start = time.perf_counter_ns()
+        rating = self.__rateIntents(sentence)
+        self._recordLatency(time.perf_counter_ns() - start, rating)
+
+        return rating
+
+    def __rateIntents(self, sentence: str) -> NLUIntentRating:
         intents = self.__engine.get_intents(sentence)
 
         return NLUIntentRating(
@@ -0,0 +1,76 @@
+# Other imports only for the type hints
+from typing import Dict, Iterable, List
+from .types import Intent
+
+class IntentCodebook:
+    """
+    A bidirectional mapping between intents and consecutive integer codes, used to store intents in
+    dense array structures. The None-intent always maps to :attr:`NONE_CODE`.
+    """
+
+    NONE_CODE = 0
+
+    def __init__(self, intents: Iterable[Intent] = ()):
+        """
+        Args:
+            intents: Intents to assign codes to, in the order the codes should be assigned. The
+                None-intent is always part of the codebook and may be omitted.
+        """
+
+        self.__intents: List[Intent] = [ None ]
+        self.__codes: Dict[Intent, int] = { None: self.__class__.NONE_CODE }
+
+        for intent in intents:
+            self.encode(intent)
+
+    @property
+    def intents(self) -> List[Intent]:
+        """
+        Returns:
+            All intents contained in this codebook, indexed by their codes.
+        """
+
+        return list(self.__intents)
+
+    def encode(self, intent: Intent) -> int:
+        """
+        Args:
+            intent: The intent to look up. If the intent is not part of the codebook yet, it is
+                added using the next free code.
+
+        Returns:
+            The code of the intent.
+        """
+
+        try:
+            return self.__codes[intent]
+        except KeyError:
+            code = len(self.__intents)
+
+            self.__intents.append(intent)
+            self.__codes[intent] = code
+
+            return code
+
+    def decode(self, code: int) -> Intent:
+        """
+        Args:
+            code: The code to look up.
+
+        Returns:
+            The intent assigned to the code.
+
+        Raises:
+            :exc:`IndexError`: if the code is not part of the codebook.
+        """
+
+        return self.__intents[code]
+
+    def __contains__(self, intent: object) -> bool:
+        return intent in self.__codes
+
+    def __len__(self) -> int:
+        return len(self.__intents)
+
+    def __str__(self) -> str:
+        return "Intent codebook with {} intents.".format(len(self.__intents))
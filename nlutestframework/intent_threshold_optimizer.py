@@ -1,19 +1,25 @@
-import copy
 import logging
-import threading
 
-from .nlu_benchmarker import NLUBenchmarker
+import numpy as np
+
+from .dense_confusion_matrix import DenseConfusionMatrix
+from .event_bus import EventBus
+from .events import ThresholdChosen
+from .intent_codebook import IntentCodebook
+from .report_renderer import ReportRenderer
 
 # Other imports only for the type hints
-from typing import Tuple, List, Dict
-from .types import ConfusionMatrix, Intent
+from typing import Dict, List, NamedTuple, Tuple
 from .nlu_data_set import NLUDataSet
 from .nlu_framework import NLUFramework
-from .nlu_intent_rating import NLUIntentRating
 
-# This setting prevents cut-off labels in plots created by matplotlib
-from matplotlib import rcParams; rcParams.update({ "figure.autolayout": True }); del rcParams
-import matplotlib.pyplot as plt
+class _Sweep(NamedTuple):
+    # The thresholds at which the F1 score changes, in ascending order, starting at 0
+    thresholds: np.ndarray
+
+    # The mean F1 score over all intents for all thresholds between the respective entry of
+    # thresholds (inclusive) and the next entry (exclusive)
+    scores: np.ndarray
 
 class IntentThresholdOptimizer:
     @classmethod
@@ -28,21 +34,25 @@ class IntentThresholdOptimizer:
         Find the optimal confidence threshold for interpreting an intent classification result as
         the None-intent.
 
-        The optimal threshold is found by running multiple iterations of the benchmark and searching
-        for the threshold that maximizes the F1 score for each iteration. The optimal threshold is
-        found by a grid search. The grids of each iteration are averaged and the threshold with the
-        maximum F1 score found that way is returned.
+        The optimal threshold is found by running multiple iterations of the benchmark. For each
+        iteration, the top confidences of all ratings are sorted once and every distinct threshold
+        between 0 and 1 is evaluated by updating the confusion counts incrementally, which yields
+        the mean F1 score as an exact step function of the threshold. The step functions of all
+        iterations are averaged and the threshold with the maximum mean F1 score is returned.
 
         Args:
             framework: An NLU framework which is already prepared for the data set.
             data_set: The data set to optimize the threshold for.
             iterations: The number of iterations to repeat and average the threshold optimization.
+            grid_step_size: The step size of the grid used to log and plot the averaged F1
+                scores. Does not influence the optimized threshold.
 
         Returns:
-            The optimized threshold.
+            The optimized threshold, which is also published as a
+            :class:`~nlutestframework.events.ThresholdChosen` event.
         """
 
-        grids: Dict[float, List[float]] = {}
+        sweeps: List[_Sweep] = []
 
         for i in range(iterations):
             logging.getLogger(cls.__name__).info(
@@ -52,117 +62,294 @@ class IntentThresholdOptimizer:
                 iterations
             )
 
-            # Collect all grids
-            grid = await cls.__iteration(framework, data_set, grid_step_size)
-            for thresh, score in grid.items():
-                grids[thresh] = grids.get(thresh, [])
-                grids[thresh].append(score)
+            sweeps.append(await cls.__iteration(framework, data_set))
 
-        grids_avg: Dict[float, Dict[str, float]] = {}
+        # Evaluate the step functions of all iterations at the union of all thresholds
+        thresholds = np.unique(np.concatenate([ sweep.thresholds for sweep in sweeps ]))
+        scores = np.stack([ cls.__evaluate(sweep, thresholds) for sweep in sweeps ])
 
-        # Calculate the means and variances of all entries in the grids
-        for thresh, scores in grids.items():
-            mean = sum(scores) / len(scores)
-            var = sum(map(
-                lambda x, mean=mean: (x - mean) ** 2, # type: ignore
-            scores)) / len(scores)
+        means     = scores.mean(axis=0)
+        variances = scores.var(axis=0)
 
-            grids_avg[thresh] = { "mean": mean, "var": var }
+        # Find the threshold with the highest F1 score (the lowest one, in case of a tie)
+        best = int(np.argmax(means))
 
-        # Find the threshold with the highest F1 score
-        t_max = { "score": 0., "thresh": 0. }
-        for thresh, score_avg in grids_avg.items():
-            if score_avg["mean"] > t_max["score"]:
-                t_max = { "score": score_avg["mean"], "thresh": thresh }
+        grids_avg = cls.__sampleGrid(thresholds, means, variances, grid_step_size)
 
-        print("Threshold: F1 score mean (variance)")
+        logger = logging.getLogger(cls.__name__)
+
+        logger.info("Threshold: F1 score mean (variance)")
         for thresh, score_avg in grids_avg.items():
-            print("{:.2f}: {:.2f} ({:.2f})".format(thresh, score_avg["mean"], score_avg["var"]))
+            logger.info("%.2f: %.2f (%.2f)", thresh, score_avg["mean"], score_avg["var"])
+
+        logger.info("Best: %.4f (F1 score mean: %.2f)", thresholds[best], means[best])
 
-        print("Best: {:.2f}".format(t_max["thresh"]))
+        if EventBus.getInstance().subscribed(ThresholdChosen):
+            EventBus.getInstance().publish(ThresholdChosen(
+                framework.title,
+                data_set.title,
+                float(thresholds[best]),
+                float(means[best])
+            ))
 
-        cls.__plot(grids_avg, "Threshold Optimization of {} on {}".format(
-            framework.title,
-            data_set.title
-        ))
+        cls.__plot(
+            grids_avg,
+            "threshold-{}-{}".format(framework.title, data_set.title),
+            "Threshold Optimization of {} on {}".format(framework.title, data_set.title)
+        )
 
-        return t_max["thresh"]
+        return float(thresholds[best])
 
     @classmethod
-    async def __iteration(
-        cls,
-        framework: NLUFramework,
-        data_set: NLUDataSet,
-        grid_step_size: float
-    ) -> Dict[float, float]:
+    async def __iteration(cls, framework: NLUFramework, data_set: NLUDataSet) -> _Sweep:
+        # Use a new split for each iteration
+        split = data_set.split()
+
         try:
             # Train
-            await framework.train(data_set.training_data)
+            await framework.train(split.training_data)
 
             # Classify (without applying any threshold)
-            ratings = [
-                (datum.intent, await framework.rateIntents(datum.sentence))
-                for datum
-                in data_set.validation_data
-            ]
+            validation_data = split.validation_data
+            ratings = await framework.rateIntentsBatch([
+                datum.sentence for datum in validation_data
+            ])
         finally:
             # Guarantee the cleanup
             await framework.cleanupTraining()
 
-        # Re-shuffle the data set
-        data_set.reshuffle()
+        codebook = IntentCodebook()
 
-        def calc_f1_for_threshold(threshold: float) -> float:
-            thresholded_ratings = copy.deepcopy(ratings)
-            for (_, rating) in thresholded_ratings:
-                rating.noneIfBelow(threshold)
+        expected_codes = np.array([ codebook.encode(datum.intent) for datum in validation_data ])
+        detected_codes = np.array([ codebook.encode(rating.detected_intent) for rating in ratings ])
+        confidences    = np.array([ rating.confidence for rating in ratings ], dtype=np.float64)
 
-            confusion_matrix = cls.__toConfusionMatrix(thresholded_ratings)
+        return cls.__sweep(codebook, expected_codes, detected_codes, confidences)
 
-            f1_scores = list(NLUBenchmarker.confusionMatrixToF1Scores(confusion_matrix).values())
+    @classmethod
+    def __sweep(
+        cls,
+        codebook: IntentCodebook,
+        expected_codes: np.ndarray,
+        detected_codes: np.ndarray,
+        confidences: np.ndarray
+    ) -> _Sweep:
+        """
+        Calculate the mean F1 score over all expected intents for every distinct threshold between 0
+        and 1 in a single pass over the ratings, sorted by confidence.
 
-            return sum(f1_scores) / len(f1_scores)
+        A rating is interpreted as the None-intent if its confidence is below or equal to the
+        threshold. Raising the threshold past the confidence of a rating therefore moves one count
+        of the confusion matrix from the column of the detected intent to the column of the
+        None-intent. Only the F1 scores of these two intents change with each such move.
+        """
 
-        # Run a grid search over the threshold
-        grid: Dict[float, float] = {}
-        thresh = 0.
-        while thresh < 1.:
-            grid[thresh] = calc_f1_for_threshold(thresh)
+        counts = DenseConfusionMatrix.fromCodes(codebook, expected_codes, detected_codes).counts
 
-            thresh += grid_step_size
+        num_intents = np.count_nonzero(counts.sum(axis=1))
 
-        return grid
+        # Only ratings that did not detect the None-intent already can be moved to the None-intent
+        movable = detected_codes != IntentCodebook.NONE_CODE
 
-    @staticmethod
-    def __toConfusionMatrix(ratings: List[Tuple[Intent, NLUIntentRating]]) -> ConfusionMatrix:
-        confusion_matrix: ConfusionMatrix = {}
+        # Sort the movable ratings by confidence, these are the moves in the order they happen
+        order = np.argsort(confidences[movable], kind="stable")
+        move_confidences = confidences[movable][order]
+
+        score_sums = cls.__scoreSums(
+            counts,
+            expected_codes[movable][order],
+            detected_codes[movable][order]
+        )
 
-        for (intent, rating) in ratings:
-            confusion_matrix[intent] = confusion_matrix.get(intent, {})
-            confusion_matrix[intent][rating.detected_intent] = (
-                confusion_matrix[intent].get(rating.detected_intent, 0) + 1
+        if len(order) == 0:
+            # No threshold changes the outcome
+            return _Sweep(
+                thresholds = np.zeros(1),
+                scores     = score_sums / num_intents
             )
 
-        return confusion_matrix
+        # The distinct thresholds in the window from 0 to 1 at which the scores change
+        thresholds = np.unique(np.r_[
+            0.,
+            move_confidences[(move_confidences > 0) & (move_confidences < 1)]
+        ])
+
+        # The number of moves that happened for each threshold
+        num_moved = np.searchsorted(move_confidences, thresholds, side="right")
+
+        return _Sweep(
+            thresholds = thresholds,
+            scores     = score_sums[num_moved] / num_intents
+        )
+
+    @classmethod
+    def __scoreSums(
+        cls,
+        counts: np.ndarray,
+        move_expected: np.ndarray,
+        move_detected: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the sum of the F1 scores of all intents after each number of moves, starting with
+        zero moves.
+        """
+
+        none_code = IntentCodebook.NONE_CODE
+
+        true_positives = np.diagonal(counts).astype(np.int64)
+        detected       = counts.sum(axis=0)
+        expected       = counts.sum(axis=1)
+
+        initial_scores = cls.__f1Scores(true_positives, detected, expected)
+
+        num_moves = len(move_detected)
+        if num_moves == 0:
+            return np.full(1, initial_scores.sum())
+
+        # The None-intent gains one detection with each move and one true positive with each move
+        # of a rating that should have been the None-intent
+        none_scores = cls.__f1Scores(
+            true_positives[none_code] + np.cumsum(move_expected == none_code),
+            detected[none_code] + np.arange(1, num_moves + 1),
+            np.full(num_moves, expected[none_code])
+        )
+
+        intent_score_changes = cls.__intentScoreChanges(
+            true_positives,
+            detected,
+            expected,
+            move_detected,
+            (move_expected == move_detected).astype(np.int64)
+        )
+
+        score_sums: np.ndarray = np.r_[
+            initial_scores.sum(),
+            initial_scores.sum()
+                - initial_scores[none_code]
+                + none_scores
+                + np.cumsum(intent_score_changes)
+        ]
+
+        return score_sums
+
+    @classmethod
+    def __intentScoreChanges(
+        cls,
+        true_positives: np.ndarray,
+        detected: np.ndarray,
+        expected: np.ndarray,
+        move_detected: np.ndarray,
+        move_correct: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the change of the F1 score of the detected intent with each move. The detected
+        intent loses one detection with each move and one true positive with each move of a correct
+        rating.
+        """
+
+        intent_moves, intent_correct = cls.__countPerGroup(move_detected, move_correct)
+
+        tps_after  = true_positives[move_detected] - intent_correct
+        dets_after = detected[move_detected] - intent_moves
+        exps       = expected[move_detected]
+
+        changes: np.ndarray = (
+              cls.__f1Scores(tps_after, dets_after, exps)
+            - cls.__f1Scores(tps_after + move_correct, dets_after + 1, exps)
+        )
+
+        return changes
 
     @staticmethod
-    def __plot(grids: Dict[float, Dict[str, float]], title: str) -> None:
-        sorted_coord_pairs = sorted(grids.items(), key=lambda x: x[0])
+    def __countPerGroup(groups: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Count the moves and sum up the values per group, in the order the moves happen.
 
-        def _plot() -> None:
-            plt.errorbar(
-                [ x[0] for x in sorted_coord_pairs ],
-                [ x[1]["mean"] for x in sorted_coord_pairs ],
-                yerr=[ x[1]["var"] for x in sorted_coord_pairs ],
-                capsize=5,
-                capthick=2,
-                errorevery=len(sorted_coord_pairs) // 20
-            )
+        Returns:
+            For each move, the number of moves of its group so far and the sum of the values of
+            these moves, both including the move itself.
+        """
+
+        by_group = np.argsort(groups, kind="stable")
+        sorted_groups = groups[by_group]
+        sorted_values = values[by_group]
+
+        group_starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        group_sizes  = np.diff(np.r_[group_starts, len(groups)])
+
+        values_cumsum = np.cumsum(sorted_values)
+
+        moves_so_far  = np.empty(len(groups), dtype=np.int64)
+        values_so_far = np.empty(len(groups), dtype=np.int64)
+        moves_so_far[by_group] = (
+            np.arange(1, len(groups) + 1) - np.repeat(group_starts, group_sizes)
+        )
+        values_so_far[by_group] = values_cumsum - np.repeat(
+            values_cumsum[group_starts] - sorted_values[group_starts],
+            group_sizes
+        )
+
+        return moves_so_far, values_so_far
+
+    @staticmethod
+    def __f1Scores(tps: np.ndarray, dets: np.ndarray, exps: np.ndarray) -> np.ndarray:
+        """
+        The F1 score is 2 * TP / (2 * TP + FP + FN), which is the same as 2 * TP divided by the
+        number of times an intent was expected plus the number of times it was detected.
+        """
+
+        divisors = (dets + exps).astype(np.float64)
+        scores: np.ndarray = np.divide(
+            100 * 2 * tps,
+            divisors,
+            out=np.zeros(divisors.shape, dtype=np.float64),
+            where=tps > 0
+        )
 
-            plt.ylim(bottom=0)
-            plt.ylabel("F1 score * 100 (mean over all iterations)")
-            plt.xlabel("threshold")
-            plt.title(title)
-            plt.show()
+        return scores
+
+    @staticmethod
+    def __sampleGrid(
+        thresholds: np.ndarray,
+        means: np.ndarray,
+        variances: np.ndarray,
+        grid_step_size: float
+    ) -> Dict[float, Dict[str, float]]:
+        """
+        Sample the averaged step functions on the grid for printing and plotting.
+        """
+
+        grid = np.arange(0., 1., grid_step_size)
+        grid_indices = np.searchsorted(thresholds, grid, side="right") - 1
+
+        return {
+            float(thresh): {
+                "mean" : float(means[index]),
+                "var"  : float(variances[index])
+            } for thresh, index in zip(grid, grid_indices)
+        }
+
+    @staticmethod
+    def __evaluate(sweep: _Sweep, thresholds: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the step function described by a sweep at the given thresholds.
+        """
+
+        return sweep.scores[np.searchsorted(sweep.thresholds, thresholds, side="right") - 1]
+
+    @staticmethod
+    def __plot(grids: Dict[float, Dict[str, float]], name: str, title: str) -> None:
+        """
+        Render the averaged F1 scores in the background, see
+        :class:`~nlutestframework.report_renderer.ReportRenderer`.
+        """
+
+        sorted_coord_pairs = sorted(grids.items(), key=lambda x: x[0])
 
-        threading.Thread(target=_plot).start()
+        ReportRenderer.getInstance().renderThresholdSweep(
+            name,
+            title,
+            [ x[0] for x in sorted_coord_pairs ],
+            [ x[1]["mean"] for x in sorted_coord_pairs ],
+            [ x[1]["var"] for x in sorted_coord_pairs ]
+        )
@@ -0,0 +1,160 @@
+import json
+
+# Other imports only for the type hints
+from typing import Any, Container, Iterator, TextIO, Tuple
+
+class _JSONReader:
+    """
+    A buffered reader which decodes JSON values from a text stream one at a time, reading only as
+    much of the stream as required.
+    """
+
+    __WHITESPACE = " \t\n\r"
+
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.__f          = f
+        self.__chunk_size = chunk_size
+        self.__decoder    = json.JSONDecoder()
+        self.__buffer     = ""
+        self.__position   = 0
+        self.__eof        = False
+
+    def __fill(self) -> bool:
+        """
+        Read the next chunk into the buffer, dropping the consumed part of the buffer.
+
+        Returns:
+            A boolean indicating whether any data was read.
+        """
+
+        if self.__eof:
+            return False
+
+        chunk = self.__f.read(self.__chunk_size)
+        if len(chunk) == 0:
+            self.__eof = True
+            return False
+
+        self.__buffer   = self.__buffer[self.__position:] + chunk
+        self.__position = 0
+
+        return True
+
+    def peek(self) -> str:
+        """
+        Returns:
+            The next non-whitespace character, without consuming it. An empty string at the end of
+            the stream.
+        """
+
+        while True:
+            while self.__position < len(self.__buffer):
+                if self.__buffer[self.__position] not in self.__WHITESPACE:
+                    return self.__buffer[self.__position]
+
+                self.__position += 1
+
+            if not self.__fill():
+                return ""
+
+    def consume(self, expected: str) -> str:
+        """
+        Args:
+            expected: The characters that are allowed next.
+
+        Returns:
+            The next non-whitespace character, which is consumed.
+
+        Raises:
+            :exc:`ValueError`: if the next character is not one of the expected characters.
+        """
+
+        char = self.peek()
+        if char == "" or char not in expected:
+            raise ValueError("Expected one of \"{}\", found \"{}\".".format(expected, char))
+
+        self.__position += 1
+
+        return char
+
+    def value(self) -> Any:
+        """
+        Returns:
+            The next JSON value, which is consumed.
+
+        Raises:
+            :exc:`ValueError`: if the next value is not valid JSON.
+        """
+
+        self.peek()
+
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buffer, self.__position)
+
+                # A number at the end of the buffer might continue in the next chunk
+                if end < len(self.__buffer) or self.__eof:
+                    self.__position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.__eof:
+                    raise
+
+            self.__fill()
+
+def stream_json_object(
+    f: TextIO,
+    streamed_keys: Container[str] = (),
+    chunk_size: int = 1 << 16
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally parse a JSON document consisting of one object, without loading the whole
+    document at once.
+
+    Args:
+        f: The text stream to read the document from.
+        streamed_keys: The keys of arrays to stream. Instead of yielding the whole array, each item
+            of these arrays is yielded separately, together with the key of the array.
+        chunk_size: The number of characters to read from the stream at once.
+
+    Returns:
+        An iterator over the members of the object, as pairs of keys and values, in the order of the
+        document. For streamed arrays, one pair is yielded per item.
+
+    Raises:
+        :exc:`ValueError`: if the document is not valid JSON or not an object.
+    """
+
+    reader = _JSONReader(f, chunk_size)
+
+    reader.consume("{")
+
+    # Check for an empty object first, all other objects start with a key
+    empty = reader.peek() == "}"
+    if empty:
+        reader.consume("}")
+
+    while not empty:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError("Expected an object key, found {}.".format(json.dumps(key)))
+
+        reader.consume(":")
+
+        if key in streamed_keys and reader.peek() == "[":
+            reader.consume("[")
+            if reader.peek() == "]":
+                reader.consume("]")
+            else:
+                while True:
+                    yield key, reader.value()
+                    if reader.consume(",]") == "]":
+                        break
+        else:
+            yield key, reader.value()
+
+        if reader.consume(",}") == "}":
+            break
+
+    if reader.peek() != "":
+        raise ValueError("Extra data after the JSON object.")
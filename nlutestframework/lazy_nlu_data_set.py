@@ -0,0 +1,44 @@
+# Other imports only for the type hints
+from typing import Any, Dict, Type
+from .nlu_data_set import NLUDataSet
+from .types import DataSetTitle
+
+class LazyNLUDataSet:
+    """
+    A data set that is loaded on demand. The
+    :class:`~nlutestframework.nlu_benchmarker.NLUBenchmarker` loads lazy data sets just before
+    benchmarking on them and releases them afterwards, so that only one data set is held in memory
+    at a time.
+    """
+
+    def __init__(self, title: DataSetTitle, cls: Type[NLUDataSet], config: Dict[str, Any]):
+        """
+        Args:
+            title: The title of the data set.
+            cls: The data set implementation.
+            config: The keyword arguments to pass to the constructor of the implementation, in
+                addition to the title.
+        """
+
+        self.__title  = title
+        self.__cls    = cls
+        self.__config = dict(config)
+
+    @property
+    def title(self) -> DataSetTitle:
+        return self.__title
+
+    def load(self) -> NLUDataSet:
+        """
+        Returns:
+            A new instance of the data set. Each call loads the data set again.
+
+        Raises:
+            Any error raised by the data set implementation, see
+            :class:`~nlutestframework.nlu_data_set.NLUDataSet`.
+        """
+
+        return self.__cls(self.__title, **self.__config)
+
+    def __str__(self) -> str:
+        return "Lazily loaded NLU data set \"{}\".".format(self.__title)
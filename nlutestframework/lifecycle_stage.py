@@ -0,0 +1,15 @@
+from enum import Enum
+
+class LifecycleStage(Enum):
+    """
+    The stages of the lifecycle of an :class:`~nlutestframework.nlu_framework.NLUFramework`. See
+    :meth:`~nlutestframework.nlu_framework.NLUFramework.stage`.
+    """
+
+    CONSTRUCT          = "construct"
+    PREPARE_DATA_SET   = "prepareDataSet"
+    TRAIN              = "train"
+    VALIDATION         = "validation"
+    CLEANUP_TRAINING   = "cleanupTraining"
+    UNPREPARE_DATA_SET = "unprepareDataSet"
+    DESTRUCT           = "destruct"
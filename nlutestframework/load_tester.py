@@ -0,0 +1,612 @@
+import asyncio
+from enum import Enum
+import itertools
+import json
+import os
+import time
+
+from .config_file import load_config_file
+from .global_config import GlobalConfig
+from .has_logger import HasLogger
+from .latency_histogram import LatencyHistogram
+from .lazy_nlu_data_set import LazyNLUDataSet
+from .lifecycle_stage import LifecycleStage
+from .loop_lag_monitor import LoopLagMonitor
+from .nlu_benchmarker import NLUBenchmarker
+from .parallel_exception import run_in_parallel
+from .report_renderer import ReportRenderer
+from .results_writer import ResultsWriter
+from .stage_profiler import ProfilerMode, StageProfiler
+
+# Other imports only for the type hints
+from typing import Any, Awaitable, Callable, ClassVar, Dict, List, NamedTuple, Optional, Sequence
+from typing import Union
+from .types import DataSetTitle, FrameworkTitle, JSONSerializable
+from .nlu_data_set import NLUDataSet
+from .nlu_framework import NLUFramework
+
+class LoadTestMode(Enum):
+    """
+    How the load of each step of a load test is generated, see :class:`LoadTester`.
+    """
+
+    # Send requests at a fixed rate in requests per second, no matter how long the responses take
+    RATE        = "rate"
+
+    # Keep a fixed number of requests in flight, sending the next request as soon as one completes
+    CONCURRENCY = "concurrency"
+
+class LoadTestStep(NamedTuple):
+    """
+    The result of a single load level of a load test.
+    """
+
+    # The target rate in requests per second or the number of concurrent requests
+    level: float
+
+    # The number of requests sent, including the failed ones
+    requests: int
+
+    # The number of failed requests
+    errors: int
+
+    # The time from sending the first request until receiving the last response, in seconds
+    duration: float
+
+    # The latencies of the successful requests
+    latencies: LatencyHistogram
+
+    @property
+    def throughput(self) -> float:
+        """
+        Returns:
+            The achieved number of successful requests per second.
+        """
+
+        return (self.requests - self.errors) / self.duration if self.duration > 0 else 0.
+
+    @property
+    def error_rate(self) -> float:
+        """
+        Returns:
+            The fraction of failed requests, between 0 and 1.
+        """
+
+        return self.errors / self.requests if self.requests > 0 else 0.
+
+    def toDict(self) -> Dict[str, Any]:
+        """
+        Returns:
+            The step in a JSON-serializable form.
+        """
+
+        return {
+            "level"      : self.level,
+            "requests"   : self.requests,
+            "errors"     : self.errors,
+            "duration"   : self.duration,
+            "throughput" : self.throughput,
+            "latencies"  : self.latencies.toDict()
+        }
+
+class LoadTester(HasLogger):
+    """
+    Measures how NLU frameworks behave under load, as opposed to how accurate they are. Each
+    framework is trained once per data set, using the usual lifecycle of an
+    :class:`~nlutestframework.nlu_framework.NLUFramework`. Afterwards,
+    :meth:`~nlutestframework.nlu_framework.NLUFramework.rateIntents` is called with the validation
+    sentences at a series of increasing load levels, one step per level. Each step records the
+    achieved throughput, the latency quantiles and the error rate.
+
+    The frameworks are tested one after another, so that they don't compete for resources.
+    """
+
+    __instance: ClassVar["LoadTester"]
+
+    FILE_NAME = "load_test.json"
+
+    # Steps with a higher error rate are not considered when looking for the saturation point
+    MAX_ERROR_RATE = 0.01
+
+    # The fraction of the peak throughput from which on a framework counts as saturated
+    SATURATION_THRESHOLD = 0.95
+
+    @classmethod
+    def getInstance(cls) -> "LoadTester":
+        """
+        Returns:
+            The singleton instance of this class.
+        """
+
+        try:
+            return cls.__instance
+        except AttributeError:
+            cls.__instance = cls()
+            cls.__cancel_flag = False
+            return cls.__instance
+
+    def cancel(self) -> None:
+        """
+        Abort the load test gracefully after the current step.
+        """
+
+        self.__cancel_flag = True
+
+    @classmethod
+    def saturationPoint(cls, steps: Sequence[LoadTestStep]) -> Optional[int]:
+        """
+        Find the load level at which a framework saturated, which is the lowest load level that
+        achieved at least :attr:`SATURATION_THRESHOLD` of the peak throughput. Increasing the load
+        beyond this level mostly increases the latency. Steps with an error rate above
+        :attr:`MAX_ERROR_RATE` are ignored.
+
+        Args:
+            steps: The steps of a load test, in the order of increasing load levels.
+
+        Returns:
+            The index of the step at which the framework saturated, or :obj:`None` if all steps
+            exceeded the error rate. If this is the last step, the framework may not be saturated
+            yet.
+        """
+
+        valid = [
+            (i, step) for i, step in enumerate(steps) if step.error_rate <= cls.MAX_ERROR_RATE
+        ]
+        if len(valid) == 0:
+            return None
+
+        peak = max(step.throughput for _, step in valid)
+
+        return next(i for i, step in valid if step.throughput >= cls.SATURATION_THRESHOLD * peak)
+
+    @staticmethod
+    def __validate(mode: LoadTestMode, levels: Sequence[float], step_duration: float) -> None:
+        """
+        Raises:
+            :exc:`ValueError`: if a load level or the step duration is not positive, or if a number
+                of concurrent requests is not a positive integer.
+        """
+
+        if any(level <= 0 for level in levels) or step_duration <= 0:
+            raise ValueError("The load levels and the step duration must be positive.")
+
+        if mode is LoadTestMode.CONCURRENCY and not all(
+            float(level).is_integer() and level >= 1 for level in levels
+        ):
+            raise ValueError("The numbers of concurrent requests must be positive integers.")
+
+    async def __runStep(
+        self,
+        framework: NLUFramework,
+        sentences: List[str],
+        mode: LoadTestMode,
+        level: float,
+        step_duration: float
+    ) -> LoadTestStep:
+        """
+        Run a single step of a load test.
+        """
+
+        latencies = LatencyHistogram()
+        requests  = 0
+        errors    = 0
+
+        next_sentence = itertools.cycle(sentences).__next__
+
+        async def send(scheduled: int) -> None:
+            nonlocal requests, errors
+
+            requests += 1
+            try:
+                await framework.rateIntents(next_sentence())
+            except Exception as e: # pylint: disable=broad-except
+                errors += 1
+                self._logger.debug("Request to \"%s\" failed: %s", framework.title, e)
+            else:
+                latencies.record(time.perf_counter_ns() - scheduled)
+
+        start = time.perf_counter_ns()
+        end   = start + int(step_duration * 1e9)
+
+        if mode is LoadTestMode.RATE:
+            await self.__sendAtRate(send, level, start, end)
+        else:
+            async def send_sequentially() -> None:
+                while not self.__cancel_flag and time.perf_counter_ns() < end:
+                    await send(time.perf_counter_ns())
+
+            await asyncio.gather(*[ send_sequentially() for _ in range(int(level)) ])
+
+        return LoadTestStep(
+            level     = level,
+            requests  = requests,
+            errors    = errors,
+            duration  = (time.perf_counter_ns() - start) / 1e9,
+            latencies = latencies
+        )
+
+    async def __sendAtRate(
+        self,
+        send: Callable[[int], Awaitable[None]],
+        rate: float,
+        start: int,
+        end: int
+    ) -> None:
+        """
+        Send requests at a fixed rate from start to end, both given in nanoseconds, and wait for all
+        responses.
+        """
+
+        interval = 1e9 / rate
+        tasks: List["asyncio.Future[None]"] = []
+
+        while not self.__cancel_flag:
+            scheduled = start + int(len(tasks) * interval)
+            if scheduled >= end:
+                break
+
+            delay = scheduled - time.perf_counter_ns()
+            if delay > 0:
+                await asyncio.sleep(delay / 1e9)
+
+            # The latency is measured from the time the request was scheduled for, not from the time
+            # it was actually sent, so that delays in sending the requests are not hidden.
+            tasks.append(asyncio.ensure_future(send(scheduled)))
+
+        await asyncio.gather(*tasks)
+
+    async def __testFramework(
+        self,
+        framework: NLUFramework,
+        data_set: NLUDataSet,
+        mode: LoadTestMode,
+        levels: Sequence[float],
+        step_duration: float
+    ) -> List[LoadTestStep]:
+        """
+        Train a framework on a data set and run one step for each load level.
+        """
+
+        self._logger.info("Load testing framework \"%s\"", framework.title)
+
+        sentences = [ datum.sentence for datum in data_set.validation_data ]
+
+        async with framework.stage(LifecycleStage.PREPARE_DATA_SET, data_set.title):
+            await framework.prepareDataSet(data_set)
+
+        steps: List[LoadTestStep] = []
+        try:
+            async with framework.stage(LifecycleStage.TRAIN, data_set.title):
+                await framework.train(data_set.training_data)
+
+            try:
+                async with framework.stage(LifecycleStage.VALIDATION, data_set.title):
+                    # Warm up, e.g. to load the model, without measuring the latency
+                    await framework.rateIntents(sentences[0])
+
+                    for level in levels:
+                        if self.__cancel_flag:
+                            break
+
+                        steps.append(await self.__runStep(
+                            framework,
+                            sentences,
+                            mode,
+                            level,
+                            step_duration
+                        ))
+
+                        self.__printStep(mode, steps[-1])
+            finally:
+                # Guarantee the cleanup
+                async with framework.stage(LifecycleStage.CLEANUP_TRAINING, data_set.title):
+                    await framework.cleanupTraining()
+        finally:
+            async with framework.stage(LifecycleStage.UNPREPARE_DATA_SET, data_set.title):
+                await framework.unprepareDataSet()
+
+        return steps
+
+    def __printStep(self, mode: LoadTestMode, step: LoadTestStep) -> None:
+        self._logger.info(
+            "\t%s %8g : %8.1f requests/s, %5.1f%% errors, %s",
+            mode.value,
+            step.level,
+            step.throughput,
+            step.error_rate * 100,
+            step.latencies.summary()
+        )
+
+    async def run(
+        self,
+        frameworks: List[NLUFramework],
+        data_sets: Sequence[Union[NLUDataSet, LazyNLUDataSet]],
+        mode: LoadTestMode,
+        levels: Sequence[float],
+        step_duration: float = 10.
+    ) -> Dict[DataSetTitle, Dict[FrameworkTitle, List[LoadTestStep]]]:
+        """
+        Load test each framework on each data set. Outputs the saturation point of each framework;
+        also generates charts of the latency as a function of the throughput, if the
+        :class:`~nlutestframework.report_renderer.ReportRenderer` is running.
+
+        This method guarantees that all frameworks are destroyed before returning.
+
+        Args:
+            frameworks: The frameworks to load test.
+            data_sets: The data sets to train the frameworks on and to take the sentences to rate
+                from. Each framework is trained on the training data of the current split of each
+                data set and rates the validation sentences, over and over again. Data sets without
+                validation sentences are skipped.
+            mode: How to generate the load.
+            levels: The load levels to step through, in increasing order. Either target rates in
+                requests per second or integer numbers of concurrent requests, depending on the
+                mode.
+            step_duration: The time to generate load for at each level, in seconds. Defaults to 10.
+
+        Returns:
+            The steps of each framework on each data set.
+
+        Raises:
+            :exc:`ValueError`: if a load level or the step duration is not positive, or if a number
+                of concurrent requests is not a positive integer.
+        """
+
+        results: Dict[DataSetTitle, Dict[FrameworkTitle, List[LoadTestStep]]] = {}
+
+        try:
+            self.__validate(mode, levels, step_duration)
+
+            for data_set in data_sets:
+                if self.__cancel_flag:
+                    break
+
+                self._logger.info("Data set \"%s\"", data_set.title)
+
+                if isinstance(data_set, LazyNLUDataSet):
+                    self._logger.debug("Loading the data set...")
+                    data_set = await asyncio.get_event_loop().run_in_executor(None, data_set.load)
+
+                if len(data_set.validation_data) == 0:
+                    self._logger.warning("Skipping the data set, it has no validation sentences.")
+                    continue
+
+                results[data_set.title] = {}
+                for framework in frameworks:
+                    if self.__cancel_flag:
+                        break
+
+                    results[data_set.title][framework.title] = await self.__testFramework(
+                        framework,
+                        data_set,
+                        mode,
+                        levels,
+                        step_duration
+                    )
+
+                # Release lazily loaded data sets before loading the next one
+                del data_set
+        finally:
+            # Make sure that the frameworks are destructed even if something goes wrong during the
+            # load test.
+            await run_in_parallel(
+                frameworks,
+                lambda x: x.destroy(),
+                None,
+                "Error deconstructing all frameworks."
+            )
+
+        self.report(results, mode)
+
+        return results
+
+    def report(
+        self,
+        results: Dict[DataSetTitle, Dict[FrameworkTitle, List[LoadTestStep]]],
+        mode: LoadTestMode
+    ) -> None:
+        """
+        Output the saturation point of each framework on each data set, and generate charts of the
+        latency as a function of the throughput, if the
+        :class:`~nlutestframework.report_renderer.ReportRenderer` is running.
+
+        Args:
+            results: The steps of each framework on each data set.
+            mode: How the load was generated.
+        """
+
+        renderer = ReportRenderer.getInstance()
+
+        for data_set_title, framework_steps in results.items():
+            self._logger.info("Saturation points on the data set \"%s\":", data_set_title)
+
+            saturation_points: Dict[FrameworkTitle, Optional[int]] = {}
+            for framework_title, steps in framework_steps.items():
+                saturation_point = saturation_points[framework_title] = self.saturationPoint(steps)
+                if saturation_point is None:
+                    self._logger.info(
+                        "\t%s : none, the error rate of all steps exceeded %.1f%%",
+                        framework_title,
+                        self.MAX_ERROR_RATE * 100
+                    )
+                    continue
+
+                step = steps[saturation_point]
+                self._logger.info(
+                    "\t%s : %.1f requests/s at %s %g, %s%s",
+                    framework_title,
+                    step.throughput,
+                    mode.value,
+                    step.level,
+                    step.latencies.summary(),
+                    " (highest load level, may not be saturated yet)"
+                    if saturation_point == len(steps) - 1 else ""
+                )
+
+            def to_milliseconds(quantile: Optional[float]) -> Optional[float]:
+                return None if quantile is None else quantile / 1e6
+
+            renderer.renderLoadTest(
+                "load-test-{}".format(data_set_title),
+                "Latency by throughput on {}".format(data_set_title),
+                { key: [ x.throughput for x in steps ] for key, steps in framework_steps.items() },
+                {
+                    key: [ to_milliseconds(x.latencies.quantile(0.5)) for x in steps ]
+                    for key, steps in framework_steps.items()
+                },
+                {
+                    key: [ to_milliseconds(x.latencies.quantile(0.99)) for x in steps ]
+                    for key, steps in framework_steps.items()
+                },
+                saturation_points
+            )
+
+    def __writeResults(
+        self,
+        path: str,
+        results: Dict[DataSetTitle, Dict[FrameworkTitle, List[LoadTestStep]]],
+        mode: LoadTestMode,
+        step_duration: float
+    ) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "mode"          : mode.value,
+                "step_duration" : step_duration,
+                "results"       : [
+                    {
+                        "data_set"         : data_set_title,
+                        "framework"        : framework_title,
+                        "steps"            : [ step.toDict() for step in steps ],
+                        "saturation_point" : self.saturationPoint(steps)
+                    }
+                    for data_set_title, framework_steps in results.items()
+                    for framework_title, steps in framework_steps.items()
+                ]
+            }, f, indent=4)
+
+        self._logger.info("Wrote the results to %s", path)
+
+    async def runFromConfig(
+        self,
+        config: Dict[str, Dict[str, JSONSerializable]],
+        mode: LoadTestMode,
+        levels: Sequence[float],
+        step_duration: float = 10.,
+        **global_config_override: Any
+    ) -> Dict[DataSetTitle, Dict[FrameworkTitle, List[LoadTestStep]]]:
+        """
+        Load and run a full load test from a single configuration dictionary. The results are
+        written to a new directory in the output directory, see
+        :attr:`~nlutestframework.global_config.GlobalConfig.output_directory`.
+
+        Args:
+            config: A dictionary containing the full configuration, see
+                :ref:`configuration-full`. The number of iterations is ignored.
+            mode: How to generate the load, see :meth:`run`.
+            levels: The load levels to step through, see :meth:`run`.
+            step_duration: The time to generate load for at each level, in seconds. Defaults to 10.
+            **global_config_override: Options to override in the global configuration.
+
+        Returns:
+            The steps of each framework on each data set.
+
+        Raises:
+            :exc:`ValueError`: if a load level or the step duration is not positive, if a number of
+                concurrent requests is not a positive integer, or if the profiling options are
+                invalid.
+            :exc:`OSError`: if the results could not be written.
+        """
+
+        # Validate the levels before any frameworks are created or data sets are loaded
+        self.__validate(mode, levels, step_duration)
+
+        global_config = GlobalConfig.fromConfig(config["global"], **global_config_override)
+
+        data_sets = NLUBenchmarker.loadDataSets(
+            config["data_sets"],
+            global_config.ignore_cache,
+            global_config.lazy_data_sets
+        )
+
+        run_directory = ResultsWriter.createRunDirectory(
+            global_config.output_directory,
+            time.strftime("load-test_%Y-%m-%d_%H-%M-%S")
+        )
+
+        report_renderer = ReportRenderer.getInstance()
+        report_renderer.start(os.path.join(run_directory, "charts"), global_config.chart_formats)
+
+        loop_lag_monitor = LoopLagMonitor.getInstance()
+        if global_config.loop_lag_threshold is not None:
+            loop_lag_monitor.start(global_config.loop_lag_threshold)
+
+        stage_profiler = StageProfiler.getInstance()
+
+        try:
+            stage_profiler.start(
+                global_config.profile,
+                os.path.join(run_directory, "profiles"),
+                ProfilerMode(global_config.profiler)
+            )
+
+            frameworks = await NLUBenchmarker.getInstance().createFrameworks(
+                global_config,
+                config["frameworks"]
+            )
+
+            results = await self.run(frameworks, data_sets, mode, levels, step_duration)
+
+            self.__writeResults(
+                os.path.join(run_directory, self.FILE_NAME),
+                results,
+                mode,
+                step_duration
+            )
+
+            return results
+        finally:
+            stage_profiler.stop()
+            loop_lag_monitor.stop()
+
+            # Wait for the charts without blocking the event loop
+            await asyncio.get_event_loop().run_in_executor(None, report_renderer.stop)
+
+    async def runFromConfigFile(
+        self,
+        path: str,
+        mode: LoadTestMode,
+        levels: Sequence[float],
+        step_duration: float = 10.,
+        **global_config_override: Any
+    ) -> Dict[DataSetTitle, Dict[FrameworkTitle, List[LoadTestStep]]]:
+        """
+        Load and run a full load test from a configuration file, see :meth:`runFromConfig`.
+
+        Args:
+            path: The path to the configuration file. See :ref:`configuration-file` for more
+                information.
+            mode: How to generate the load, see :meth:`run`.
+            levels: The load levels to step through, see :meth:`run`.
+            step_duration: The time to generate load for at each level, in seconds. Defaults to 10.
+            **global_config_override: Options to override in the global configuration.
+
+        Returns:
+            The steps of each framework on each data set.
+
+        Raises:
+            :exc:`OSError`: in case the config file could not be read due to I/O or other OS-related
+                issues.
+            :exc:`yaml.YAMLError`: in case the config file contains invalid YAML.
+            :exc:`ValueError`: if a load level or the step duration is not positive, or if a number
+                of concurrent requests is not a positive integer.
+        """
+
+        config = load_config_file(path)
+
+        return await self.runFromConfig(
+            config,
+            mode,
+            levels,
+            step_duration,
+            **global_config_override
+        )
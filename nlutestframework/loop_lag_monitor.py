@@ -0,0 +1,176 @@
+import asyncio
+import contextlib
+import sys
+import threading
+import time
+
+from .has_logger import HasLogger
+
+# Other imports only for the type hints
+from types import FrameType
+from typing import ClassVar, Dict, Iterator, List, Optional, Set, Tuple
+from .lifecycle_stage import LifecycleStage
+
+class LoopLagMonitor(HasLogger):
+    """
+    Detects phases in which the event loop is blocked, for example by synchronous calls to the SDK
+    of an NLU framework, and logs which framework and which lifecycle stage blocked the loop and for
+    how long.
+
+    The monitor consists of two parts: a heartbeat task on the event loop and a watchdog thread.
+    Whenever the heartbeat is overdue, the watchdog inspects the stack of the blocked event loop
+    thread to find the framework that is currently running. The lifecycle stages that framework is
+    in are known from :meth:`track`.
+    """
+
+    __instance: ClassVar["LoopLagMonitor"]
+
+    @classmethod
+    def getInstance(cls) -> "LoopLagMonitor":
+        """
+        Returns:
+            The singleton instance of this class.
+        """
+
+        try:
+            return cls.__instance
+        except AttributeError:
+            cls.__instance = cls()
+            return cls.__instance
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        # Maps the ids of the frameworks to their titles and the stages they are currently in
+        self.__active: Dict[int, Tuple[str, List[LifecycleStage]]] = {}
+
+        # The places the watchdog found the event loop thread blocked in, since the last heartbeat
+        self.__culprits: Set[str] = set()
+
+        self.__heartbeat = time.monotonic()
+        self.__heartbeat_task: Optional["asyncio.Task[None]"] = None
+        self.__watchdog_stop = threading.Event()
+
+    @contextlib.contextmanager
+    def track(self, framework: object, title: str, stage: LifecycleStage) -> Iterator[None]:
+        """
+        Mark a framework as being in a lifecycle stage for the duration of the context.
+
+        Args:
+            framework: The framework instance.
+            title: The title of the framework.
+            stage: The lifecycle stage.
+        """
+
+        _, stages = self.__active.setdefault(id(framework), (title, []))
+        stages.append(stage)
+
+        try:
+            yield
+        finally:
+            stages.remove(stage)
+            if len(stages) == 0:
+                del self.__active[id(framework)]
+
+    @property
+    def running(self) -> bool:
+        return self.__heartbeat_task is not None
+
+    def start(self, threshold: float) -> None:
+        """
+        Start monitoring the running event loop.
+
+        Args:
+            threshold: Blocking phases longer than this number of seconds are logged.
+        """
+
+        if self.running:
+            return
+
+        loop = asyncio.get_event_loop()
+        interval = threshold / 2
+
+        self.__heartbeat = time.monotonic()
+        self.__watchdog_stop.clear()
+
+        self.__heartbeat_task = loop.create_task(self.__runHeartbeat(threshold, interval))
+
+        threading.Thread(
+            target=self.__runWatchdog,
+            args=(threading.get_ident(), threshold, interval),
+            name="LoopLagMonitor",
+            daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        """
+        Stop monitoring.
+        """
+
+        if self.__heartbeat_task is not None:
+            self.__heartbeat_task.cancel()
+            self.__heartbeat_task = None
+
+        self.__watchdog_stop.set()
+
+    async def __runHeartbeat(self, threshold: float, interval: float) -> None:
+        loop = asyncio.get_event_loop()
+
+        while True:
+            self.__heartbeat = time.monotonic()
+            before = loop.time()
+
+            await asyncio.sleep(interval)
+
+            lag = loop.time() - before - interval
+            culprits = self.__culprits
+            self.__culprits = set()
+
+            if lag > threshold:
+                self._logger.warning(
+                    "The event loop was blocked for %.3f seconds by: %s",
+                    lag,
+                    "; ".join(sorted(culprits)) if len(culprits) > 0 else "unknown"
+                )
+
+    def __runWatchdog(self, loop_thread_id: int, threshold: float, interval: float) -> None:
+        while not self.__watchdog_stop.wait(interval):
+            if time.monotonic() - self.__heartbeat > threshold:
+                # sys._current_frames is the documented way to inspect the stacks of other threads
+                frame = sys._current_frames().get(loop_thread_id) # pylint: disable=protected-access
+                if frame is not None:
+                    self.__culprits.add(self.__attribute(frame))
+
+    def __attribute(self, frame: Optional[FrameType]) -> str:
+        """
+        Walk the stack of the blocked event loop thread from the innermost frame outwards and find
+        the first method of a tracked framework.
+
+        Returns:
+            A description of the framework, its active stages and the blocking call.
+        """
+
+        innermost = frame
+
+        while frame is not None:
+            instance = frame.f_locals.get("self", None)
+            tracked  = self.__active.get(id(instance), None)
+
+            if tracked is not None:
+                title, stages = tracked
+
+                location = "{}.{}".format(instance.__class__.__name__, frame.f_code.co_name)
+                if frame is not innermost and innermost is not None:
+                    location += " calling {}".format(innermost.f_code.co_name)
+
+                return "framework \"{}\" in stage {} ({})".format(
+                    title,
+                    "/".join(stage.value for stage in stages),
+                    location
+                )
+
+            frame = frame.f_back
+
+        return "code outside of any framework ({})".format(
+            "unknown" if innermost is None else innermost.f_code.co_name
+        )
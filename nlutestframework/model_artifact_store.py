@@ -0,0 +1,157 @@
+import os
+import shutil
+import tempfile
+
+from .has_logger import HasLogger
+
+# Other imports only for the type hints
+from typing import List, Optional, Tuple
+
+class ModelArtifactStore(HasLogger):
+    """
+    A persistent store for trained model artifacts, like model files or directories exported by NLU
+    frameworks. Artifacts are addressed by keys, which are usually fingerprints of the training data
+    and the framework configuration (see :mod:`nlutestframework.fingerprint`).
+
+    The total size of the store is bounded. When adding an artifact exceeds the maximum size, the
+    least recently used artifacts are evicted.
+    """
+
+    __STAGING_PREFIX = ".staging-"
+
+    def __init__(self, directory: str, max_size: int):
+        """
+        Args:
+            directory: The directory to store the artifacts in. User directory references and
+                environment variables are expanded. The directory is created if it doesn't exist.
+            max_size: The maximum total size of all artifacts in bytes.
+
+        Raises:
+            :exc:`OSError`: if the directory could not be created.
+        """
+
+        super().__init__()
+
+        self.__directory = os.path.abspath(os.path.expandvars(os.path.expanduser(directory)))
+        self.__max_size  = max_size
+
+        os.makedirs(self.__directory, exist_ok=True)
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Args:
+            key: The key of the artifact.
+
+        Returns:
+            The path to the artifact, or :obj:`None` if the store doesn't contain the artifact. The
+            artifact is marked as recently used.
+        """
+
+        path = os.path.join(self.__directory, key)
+
+        if not os.path.exists(path):
+            return None
+
+        # The modification time of the artifact is used to track when it was used last
+        os.utime(path)
+
+        return path
+
+    def stagingPath(self) -> str:
+        """
+        Returns:
+            A path inside of the store which doesn't exist yet, which can be used to prepare a new
+            artifact before adding it to the store using :meth:`put`.
+        """
+
+        # Create and remove a temporary directory to reserve an unused name
+        path = tempfile.mkdtemp(prefix=self.__class__.__STAGING_PREFIX, dir=self.__directory)
+        os.rmdir(path)
+
+        return path
+
+    def put(self, key: str, source: str) -> str:
+        """
+        Move an artifact into the store and evict the least recently used artifacts, if the store
+        exceeds its maximum size.
+
+        Args:
+            key: The key of the artifact.
+            source: The path to the file or directory to move into the store. Should be located on
+                the same file system as the store, see :meth:`stagingPath`.
+
+        Returns:
+            The path to the artifact in the store.
+
+        Raises:
+            :exc:`OSError`: if moving the artifact fails.
+        """
+
+        path = os.path.join(self.__directory, key)
+
+        try:
+            # Atomically replace existing files, remove existing directories first
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+
+            os.replace(source, path)
+        except OSError:
+            shutil.move(source, path)
+
+        os.utime(path)
+
+        self.__evict(keep=path)
+
+        return path
+
+    def __evict(self, keep: str) -> None:
+        """
+        Remove the least recently used artifacts until the store doesn't exceed its maximum size.
+
+        Args:
+            keep: The path of an artifact which must not be evicted.
+        """
+
+        artifacts: List[Tuple[float, int, str]] = []
+        for name in os.listdir(self.__directory):
+            if name.startswith(self.__class__.__STAGING_PREFIX):
+                continue
+
+            path = os.path.join(self.__directory, name)
+            artifacts.append((os.path.getmtime(path), self.__size(path), path))
+
+        total_size = sum(size for _, size, _ in artifacts)
+
+        for _, size, path in sorted(artifacts):
+            if total_size <= self.__max_size:
+                break
+
+            if path == keep:
+                continue
+
+            self._logger.debug("Evicting model artifact %s", path)
+
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+            total_size -= size
+
+    @staticmethod
+    def __size(path: str) -> int:
+        if not os.path.isdir(path):
+            return os.path.getsize(path)
+
+        return sum(
+            os.path.getsize(os.path.join(directory, file_name))
+            for directory, _, file_names in os.walk(path)
+            for file_name in file_names
+        )
+
+    def __str__(self) -> str:
+        return "Model artifact store in \"{}\".".format(self.__directory)
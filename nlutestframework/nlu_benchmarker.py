@@ -1,27 +1,33 @@
-import importlib
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import os
-import sys
-
-# This setting prevents cut-off labels in plots created by matplotlib
-from matplotlib import rcParams; rcParams.update({ "figure.autolayout": True }); del rcParams
-import matplotlib.pyplot as plt
-
-import yaml
+import time
 
+from .config_file import load_config_file
+from .benchmark_report import BenchmarkReport
+from .dense_confusion_matrix import DenseConfusionMatrix
+from .event_bus import EventBus
+from .events import IterationFinished, IterationStarted, RunFinished, RunStarted
 from .global_config import GlobalConfig
 from .has_logger import HasLogger
+from .latency_histogram import LatencyHistogram
+from .lifecycle_stage import LifecycleStage
+from .lazy_nlu_data_set import LazyNLUDataSet
+from .loop_lag_monitor import LoopLagMonitor
 from .parallel_exception import run_in_parallel
+from .registry import DATA_SETS, FRAMEWORKS, resolve_class
+from .report_renderer import ReportRenderer
+from .resource_monitor import ResourceUsage
+from .results_writer import ResultsWriter, RunResults
+from .stage_profiler import ProfilerMode, StageProfiler
 
 # Other imports only for the type hints
-from typing import Tuple, Dict, List, ClassVar, Optional, Any, NamedTuple
+from typing import Dict, List, ClassVar, Optional, Any, Union, Sequence
 from .types import ConfusionMatrix, Intent, DataSetTitle, FrameworkTitle, JSONSerializable
-from .nlu_data_set import NLUDataSet
+from .nlu_data_set import NLUDataSet, NLUDataSetSummary
+from .nlu_data_split import NLUDataSplit
 from .nlu_framework import NLUFramework
 
-class _Performance(NamedTuple):
-    mean: float
-    variance: float
-
 class NLUBenchmarker(HasLogger):
     __instance: ClassVar["NLUBenchmarker"]
 
@@ -47,117 +53,142 @@ class NLUBenchmarker(HasLogger):
         self.__cancel_flag = True
 
     @staticmethod
-    def __safeDivide(dividend: float, divisor: float) -> float:
+    def confusionMatrixToF1Scores(
+        confusion_matrix: Union[ConfusionMatrix, DenseConfusionMatrix]
+    ) -> Dict[Intent, float]:
         """
-        Returns 0 for 0/0, the normal quotient otherwise.
+        Args:
+            confusion_matrix: The confusion matrix to calculate F1 scores from, either in nested
+                dictionary form or in dense form.
+
+        Returns:
+            A mapping from intents to their respective F1 scores.
         """
 
-        if dividend == 0 and divisor == 0:
-            return 0
+        if not isinstance(confusion_matrix, DenseConfusionMatrix):
+            confusion_matrix = DenseConfusionMatrix.fromConfusionMatrix(confusion_matrix)
 
-        return dividend / divisor
+        # Note: The values are multiplied times 100, which is not the standard for F1 scores. This
+        # is to get a more intuitive score that is (roughly) between 0 and 100. It also makes
+        # variances more graspable.
+        return confusion_matrix.f1Scores()
 
     @staticmethod
-    def __prepareF1Score(
-        intent: Intent,
-        confusion_matrix: ConfusionMatrix
-    ) -> Tuple[int, int, int, int]:
-        true_positives  = 0
-        true_negatives  = 0
-        false_positives = 0
-        false_negatives = 0
-
-        for expected, actual in confusion_matrix.items():
-            for detected, amount in actual.items():
-                if intent == expected:
-                    if detected == intent:
-                        true_positives += amount
-                    else:
-                        false_negatives += amount
-                else:
-                    if detected == intent:
-                        false_positives += amount
-                    else:
-                        true_negatives += amount
-
-        return (true_positives, true_negatives, false_positives, false_negatives)
+    async def __prepareDataSet(framework: NLUFramework, data_set: NLUDataSet) -> None:
+        async with framework.stage(LifecycleStage.PREPARE_DATA_SET, data_set.title):
+            await framework.prepareDataSet(data_set)
 
-    @classmethod
-    def confusionMatrixToF1Scores(cls, confusion_matrix: ConfusionMatrix) -> Dict[Intent, float]:
+    @staticmethod
+    async def __unprepareDataSet(framework: NLUFramework, data_set: NLUDataSet) -> None:
+        async with framework.stage(LifecycleStage.UNPREPARE_DATA_SET, data_set.title):
+            await framework.unprepareDataSet()
+
+    async def __benchmarkIterations(
+        self,
+        framework: NLUFramework,
+        data_set: NLUDataSet,
+        splits: List[NLUDataSplit],
+        results_writer: Optional[ResultsWriter],
+        completed: Dict[int, ConfusionMatrix],
+        latencies: List[Dict[DataSetTitle, Dict[FrameworkTitle, LatencyHistogram]]]
+    ) -> List[ConfusionMatrix]:
         """
+        Run one benchmark iteration per split. Frameworks that support it run up to
+        :attr:`~nlutestframework.nlu_framework.NLUFramework.concurrent_iterations` iterations at the
+        same time, using forks of the framework.
+
         Args:
-            confusion_matrix: The confusion matrix to calculate F1 scores from.
+            framework: The framework to benchmark, prepared for the data set.
+            data_set: The data set to benchmark on.
+            splits: The splits of the data set, one for each iteration.
+            results_writer: The writer to stream the result of each iteration to, if any.
+            completed: The results of iterations that were completed in a previous run, by index.
+                These iterations are skipped.
+            latencies: Receives the latencies of the ratings of each iteration that was run, by
+                iteration index, data set title and framework title. Iterations that were served
+                from the rating cache are left out.
 
         Returns:
-            A mapping from intents to their respective F1 scores.
+            The performance of the framework for each split, in the same order as the splits. Empty,
+            if the benchmark was cancelled.
         """
 
-        f1_scores = {}
+        performances: List[Optional[ConfusionMatrix]] = [
+            completed.get(i, None) for i in range(len(splits))
+        ]
 
-        for intent in confusion_matrix.keys():
-            true_positives, _, false_positives, false_negatives = cls.__prepareF1Score(
-                intent,
-                confusion_matrix
-            )
+        pending = [ (i, split) for i, split in enumerate(splits) if performances[i] is None ]
 
-            precision = cls.__safeDivide(true_positives, true_positives + false_positives)
-            recall    = cls.__safeDivide(true_positives, true_positives + false_negatives)
+        # The iterations are distributed among the instances. The iterator is shared, which is safe
+        # as all instances run on the same event loop.
+        pending_iterations = iter(pending)
 
-            # Note: The value is multiplied times 100 here, which is not the standard for F1 scores.
-            # This is to get a more intuitive score that is (roughly) between 0 and 100. It also
-            # makes variances more graspable.
-            f1_score = cls.__safeDivide(100 * 2 * precision * recall, precision + recall)
+        event_bus = EventBus.getInstance()
 
-            f1_scores[intent] = f1_score
+        async def run_iterations(instance: NLUFramework) -> None:
+            for i, split in pending_iterations:
+                # Don't start new iterations after the benchmark was cancelled
+                if self.__cancel_flag:
+                    return
 
-        return f1_scores
+                self._logger.info("\tIteration %d of \"%s\"", i + 1, framework.title)
 
-    @staticmethod
-    def __plot(
-        performances: Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, _Performance]]]
-    ) -> None:
-        # Create one chart per data set
-        for framework_performances in performances.values():
-            # Collect all intents that the frameworks were evaluated on
-            intents: List[Intent] = []
-            for intent_performances in framework_performances.values():
-                intents.extend(intent_performances.keys())
+                if event_bus.subscribed(IterationStarted):
+                    event_bus.publish(IterationStarted(framework.title, data_set.title, i))
 
-            # Filter out the None-intent, because None can't be sorted together with strings
-            intents = list(filter(lambda x: x is not None, intents))
+                performance = await instance.benchmark(data_set, split)
 
-            # Remove duplicates and sort alphabetically
-            intents = sorted(set(intents))
+                if event_bus.subscribed(IterationFinished):
+                    event_bus.publish(IterationFinished(
+                        framework.title,
+                        data_set.title,
+                        i,
+                        performance
+                    ))
 
-            # Append the None-intent again, as the last entry
-            intents.append(None)
+                # No latencies are recorded if all ratings were cached
+                latency_histogram: Optional[LatencyHistogram] = None
+                if instance.latency_histogram.count > 0:
+                    latency_histogram = instance.latency_histogram
+                    latencies[i].setdefault(data_set.title, {})[framework.title] = latency_histogram
+
+                if results_writer is not None:
+                    results_writer.writeResult(
+                        data_set.title,
+                        framework.title,
+                        i,
+                        performance,
+                        latency_histogram
+                    )
 
-            # Convert None to the string "None"
-            intent_labels = list(map(str, intents))
+                performances[i] = performance
 
-            for framework_title, intent_performances in framework_performances.items():
-                scores: List[Optional[float]] = []
-                for intent in intents:
-                    try:
-                        scores.append(intent_performances[intent].mean)
-                    except KeyError:
-                        scores.append(None)
+        num_instances = max(min(framework.concurrent_iterations, len(pending)), 1)
+        instances = [ framework ] + [ framework.fork() for _ in range(num_instances - 1) ]
 
-                plt.plot(intent_labels, scores, label="${}$".format(str(framework_title)))
+        tasks = [ asyncio.ensure_future(run_iterations(instance)) for instance in instances ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop the other instances, too
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
 
-            plt.legend(loc="upper left")
-            plt.ylabel("F1 score * 100")
-            plt.xlabel("Intents")
-            plt.xticks(rotation=90)
+        if self.__cancel_flag:
+            return []
 
-            plt.show()
+        return performances # type: ignore
 
     async def __run(
         self,
         frameworks: List[NLUFramework],
-        data_sets: List[NLUDataSet],
-        num_iterations: int
-    ) -> List[Dict[DataSetTitle, Dict[FrameworkTitle, ConfusionMatrix]]]:
+        data_sets: Sequence[Union[NLUDataSet, LazyNLUDataSet]],
+        num_iterations: int,
+        results_writer: Optional[ResultsWriter],
+        previous_results: Optional[RunResults]
+    ) -> RunResults:
         """
         Run n iterations of benchmarking for each framework on each data set. The benchmark results
         are returned "raw", that is one confusion matrix for each framework on each data set for
@@ -165,265 +196,343 @@ class NLUBenchmarker(HasLogger):
 
         Args:
             frameworks: The frameworks to benchmark.
-            data_sets: The data sets to benchmark on.
+            data_sets: The data sets to benchmark on. Lazy data sets are loaded just before
+                benchmarking on them and released afterwards.
             num_iterations: The number of iterations to repeat the evaluation process.
+            results_writer: The writer to stream the summaries and results to, if any.
+            previous_results: The results of a previous run to resume, if any. Iterations that were
+                completed in the previous run are not run again.
 
         Returns:
-            The performance of each framework on each data set over n iterations.
+            The performance of each framework on each data set over n iterations, a summary of each
+            data set, the latencies of the ratings of each framework on each data set over n
+            iterations, where recorded, and the resources used by each framework on each data set.
+
+        Raises:
+            :exc:`ValueError`: if a data set doesn't match the data set of the previous run.
         """
 
-        # Mypy requires the repetition of the return type
-        iterations: List[Dict[DataSetTitle, Dict[FrameworkTitle, ConfusionMatrix]]] = []
+        if previous_results is None:
+            previous_results = RunResults(data_sets=[], iterations=[], latencies=[], resources={})
+
+        previous_summaries = { x.title: x for x in previous_results.data_sets }
+
+        results = RunResults(
+            data_sets  = [],
+            iterations = [ {} for _ in range(num_iterations) ],
+            latencies  = previous_results.copyLatencies(num_iterations),
+            resources  = previous_results.copyResources()
+        )
 
         # Run the evaluation, one data set after another
         for data_set in data_sets:
             self._logger.info("Data set \"%s\"", data_set.title)
 
-            await run_in_parallel(
-                frameworks,
-                # How could mypy possibly know the type of this lamda?
-                lambda x, data_set=data_set: x.prepareDataSet(data_set), # type: ignore
-                lambda x, _: x.unprepareDataSet(),
-                "Error while preparing all frameworks for the {} data set.".format(data_set.title)
-            )
-
-            try:
-                if self.__cancel_flag:
-                    raise KeyboardInterrupt
-
-                for i in range(num_iterations):
-                    self._logger.info("\tIteration %d", i + 1)
-
-                    performances = await run_in_parallel(
-                        frameworks,
-                        # Another one of these impossible-to-infer lambdas
-                        lambda x, data_set=data_set: x.benchmark(data_set), # type: ignore
-                        None,
-                        "Error while benchmarking all frameworks."
-                    )
-
-                    data_set.reshuffle()
-
-                    if len(iterations) == i:
-                        iterations.append({})
-                    iterations[i][data_set.title] = {
-                        framework.title: performance
-                        for framework, performance
-                        in zip(frameworks, performances)
-                    }
-
-                    if self.__cancel_flag:
-                        raise KeyboardInterrupt
-            finally:
-                # Make sure to always give the frameworks the chance to unprepare, even if something
-                # went wrong.
-                await run_in_parallel(
-                    frameworks,
-                    lambda x: x.unprepareDataSet(),
-                    None,
-                    "Error unpreparing all frameworks."
+            completed = previous_results.completedIterations(data_set.title)
+
+            # The frameworks that have iterations left to run on this data set
+            pending_frameworks = [
+                framework for framework in frameworks
+                if len(completed.get(framework.title, {}).keys() & range(num_iterations))
+                    < num_iterations
+            ]
+
+            if len(pending_frameworks) == 0 and data_set.title in previous_summaries:
+                # Don't even load the data set if all of its iterations were completed before
+                self._logger.info("All iterations were completed in the previous run.")
+                results.data_sets.append(previous_summaries[data_set.title])
+                performances = []
+            else:
+                if isinstance(data_set, LazyNLUDataSet):
+                    self._logger.debug("Loading the data set...")
+                    data_set = await asyncio.get_event_loop().run_in_executor(None, data_set.load)
+
+                results.data_sets.append(data_set.summary)
+
+                self.__checkResumable(results.data_sets[-1], previous_summaries)
+
+                if results_writer is not None:
+                    results_writer.writeDataSet(results.data_sets[-1])
+
+                performances = await self.__runDataSet(
+                    pending_frameworks,
+                    data_set,
+                    num_iterations,
+                    results_writer,
+                    completed,
+                    results
                 )
 
-        return iterations
+            # Only the summary and the performances are kept, which releases lazily loaded data
+            # sets before loading the next one.
+            del data_set
 
-    @classmethod
-    def __confusionMatricesToF1Scores(
-        cls,
-        iterations: List[Dict[DataSetTitle, Dict[FrameworkTitle, ConfusionMatrix]]]
-    ) -> List[Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, float]]]]:
-        """
-        Calculate F1 scores from confusion matrices.
-        """
+            framework_performances = {
+                framework.title: performance
+                for framework, performance
+                in zip(pending_frameworks, performances)
+            }
 
-        iterations_result = []
+            for i in range(num_iterations):
+                results.iterations[i][results.data_sets[-1].title] = {
+                    framework.title: (
+                        framework_performances[framework.title][i]
+                        if framework.title in framework_performances
+                        else completed[framework.title][i]
+                    ) for framework in frameworks
+                }
 
-        for iteration in iterations:
-            iteration_result = {}
+        return results
 
-            for data_set_title, performances in iteration.items():
-                performances_result = {}
-
-                for framework_title, confusion_matrix in performances.items():
-                    performances_result[framework_title] = cls.confusionMatrixToF1Scores(
-                        confusion_matrix
-                    )
-
-                iteration_result[data_set_title] = performances_result
-
-            iterations_result.append(iteration_result)
-
-        return iterations_result
-
-    @staticmethod
-    def __f1ScoreMeansAndVariances(
+    async def __runDataSet(
+        self,
         frameworks: List[NLUFramework],
-        data_sets: List[NLUDataSet],
-        iterations: List[Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, float]]]]
-    ) -> Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, _Performance]]]:
-        """
-        Calculate F1 score means and variances for each intent over all iterations.
+        data_set: NLUDataSet,
+        num_iterations: int,
+        results_writer: Optional[ResultsWriter],
+        completed: Dict[FrameworkTitle, Dict[int, ConfusionMatrix]],
+        results: RunResults
+    ) -> List[List[ConfusionMatrix]]:
         """
+        Run n iterations of benchmarking for each framework on a single data set.
 
-        performances: Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, _Performance]]] = {}
-
-        for data_set in data_sets:
-            performances[data_set.title] = {}
-
-            intents = { x.intent for x in data_set.validation_data }
-
-            for framework in frameworks:
-                performances[data_set.title][framework.title] = {}
-
-                for intent in intents:
-                    def score_getter(
-                        x: Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, float]]],
-                        data_set: NLUDataSet = data_set,
-                        framework: NLUFramework = framework,
-                        intent: Intent = intent
-                    ) -> Optional[float]:
-                        return x[data_set.title][framework.title].get(intent, None)
-
-                    # mypy doesn't understand that you can call score_getter without passing all
-                    # four arguments.
-                    scores = list(map(
-                        # Some intents may not have been part of the validation data in all
-                        # runs. In these runs, the score is set to None and is excluded from the
-                        # calculations later.
-                        score_getter,
-                        iterations
-                    ))
+        Args:
+            frameworks: The frameworks to benchmark.
+            data_set: The data set to benchmark on.
+            num_iterations: The number of iterations to repeat the evaluation process.
+            results_writer: The writer to stream the result of each iteration to, if any.
+            completed: The results of iterations that were completed in a previous run, by framework
+                title and iteration index. These iterations are skipped.
+            results: Receives the latencies of the ratings of each framework in each iteration
+                that was run and the resources used by each framework on the data set, which are
+                added to the resources used in a previous run.
 
-                    # Remove None-scores, see comments above
-                    filtered_scores: List[float] = list(filter(
-                        lambda x: x is not None,
-                        scores # type: ignore
-                    ))
+        Returns:
+            The performance of each framework over n iterations, in the order of the frameworks.
 
-                    # If an intent was not included in any of the validation data, ignore the
-                    # intent completely.
-                    if len(filtered_scores) == 0:
-                        continue
+        Raises:
+            :exc:`KeyboardInterrupt`: if the benchmark was cancelled.
+        """
 
-                    mean     = sum(filtered_scores) / len(filtered_scores)
-                    variance = sum(map(
-                        lambda x, mean=mean: (x - mean) ** 2, # type: ignore
-                    filtered_scores)) / len(filtered_scores)
+        # All frameworks are benchmarked on the same splits. The splits are drawn before preparing
+        # the frameworks, which may draw further splits (e.g. to optimize thresholds), so that a
+        # resumed run with the same seed draws the same splits again.
+        splits = [ data_set.current_split ] + [
+            data_set.split() for _ in range(num_iterations - 1)
+        ]
+
+        for framework in frameworks:
+            framework.resetResourceUsage()
+
+        await run_in_parallel(
+            frameworks,
+            lambda x: self.__prepareDataSet(x, data_set),
+            lambda x, _: self.__unprepareDataSet(x, data_set),
+            "Error while preparing all frameworks for the {} data set.".format(data_set.title)
+        )
 
-                    performances[data_set.title][framework.title][intent] = _Performance(
-                        mean     = mean,
-                        variance = variance
-                    )
+        try:
+            if self.__cancel_flag:
+                raise KeyboardInterrupt
 
-        return performances
+            performances: List[List[ConfusionMatrix]] = await run_in_parallel(
+                frameworks,
+                lambda x: self.__benchmarkIterations(
+                    x,
+                    data_set,
+                    splits,
+                    results_writer,
+                    completed.get(x.title, {}),
+                    results.latencies
+                ),
+                None,
+                "Error while benchmarking all frameworks."
+            )
 
-    @staticmethod
-    def __mergeIntentPerformances(
-        performances: Dict[DataSetTitle, Dict[FrameworkTitle, Dict[Intent, _Performance]]]
-    ) -> Dict[DataSetTitle, Dict[FrameworkTitle, _Performance]]:
-        """
-        Calculate the average performances across all intents for each data set and each framework.
-        """
+            if self.__cancel_flag:
+                raise KeyboardInterrupt
 
-        # Mypy requires the repetition of the return type
-        result: Dict[DataSetTitle, Dict[FrameworkTitle, _Performance]] = {}
+            return performances
+        finally:
+            # Make sure to always give the frameworks the chance to unprepare, even if something
+            # went wrong.
+            await run_in_parallel(
+                frameworks,
+                lambda x: self.__unprepareDataSet(x, data_set),
+                None,
+                "Error unpreparing all frameworks."
+            )
 
-        for data_set_title, framework_performances in performances.items():
-            result[data_set_title] = {}
+            for framework in frameworks:
+                usage = dict(framework.resource_usage)
 
-            for framework_title, intent_performances in framework_performances.items():
-                means: List[float] = list(map(lambda x: x.mean, intent_performances.values()))
-                variances: List[float] = list(map(
-                    lambda x: x.variance,
-                    intent_performances.values()
-                ))
+                if results_writer is not None:
+                    results_writer.writeResources(data_set.title, framework.title, usage)
 
-                result[data_set_title][framework_title] = _Performance(
-                    mean     = sum(means)     / len(means),
-                    variance = sum(variances) / len(variances)
+                data_set_resources = results.resources.setdefault(data_set.title, {})
+                ResourceUsage.mergeStages(
+                    data_set_resources.setdefault(framework.title, {}),
+                    usage
                 )
 
-        return result
-
     @staticmethod
-    def __sortPerformances(
-        performances: Dict[DataSetTitle, Dict[FrameworkTitle, _Performance]]
-    ) -> Dict[DataSetTitle, List[Tuple[FrameworkTitle, _Performance]]]:
-        """
-        Sort the frameworks by their performances, best to worst, looking only at the mean.
-        """
-
-        result: Dict[DataSetTitle, List[Tuple[FrameworkTitle, _Performance]]] = {}
-
-        for data_set_title, framework_performances in performances.items():
-            result[data_set_title] = sorted(
-                framework_performances.items(),
-                key=lambda x: x[1].mean,
-                reverse=True
-            )
-
-        return result
-
-    def __printWinner(
-        self,
-        performances: Dict[DataSetTitle, List[Tuple[FrameworkTitle, _Performance]]],
-        data_sets: List[NLUDataSet]
+    def __checkResumable(
+        summary: NLUDataSetSummary,
+        previous_summaries: Dict[DataSetTitle, NLUDataSetSummary]
     ) -> None:
         """
-        Print the "winner" for each data set, together with the average mean and variance.
+        Make sure that a data set is split the same way as in the previous run.
         """
 
-        longest_data_set_title_length = max(map(lambda x: len(x.title), data_sets))
-        self._logger.info("Best performing frameworks for each data set:")
-        for data_set_title, framework_performances in performances.items():
-            self._logger.info(
-                "\t%s : %s; Average performance: %6.2f (variance: %6.2f)",
-                data_set_title.ljust(longest_data_set_title_length),
-                framework_performances[0][0],
-                framework_performances[0][1].mean,
-                framework_performances[0][1].variance
+        previous = previous_summaries.get(summary.title, None)
+        if previous is not None and previous != summary:
+            raise ValueError(
+                "The data set \"{}\" is split differently than in the run to resume. Make sure"
+                " that the data, the validation percentage and the seed didn't change.".format(
+                    summary.title
+                )
             )
 
     async def run(
         self,
         frameworks: List[NLUFramework],
-        data_sets: List[NLUDataSet],
-        num_iterations: int
+        data_sets: Sequence[Union[NLUDataSet, LazyNLUDataSet]],
+        num_iterations: int,
+        results_writer: Optional[ResultsWriter] = None,
+        previous_results: Optional[RunResults] = None
     ) -> None:
         """
         Measure the performance of each framework on each data set. Outputs a summary about which
         framework performed best on each data set; also generates charts with more details about all
-        performances.
+        performances, if the :class:`~nlutestframework.report_renderer.ReportRenderer` is running.
 
         This method guarantees that all frameworks are destroyed before returning.
 
         Args:
             frameworks: The frameworks to benchmark.
-            data_sets: The data sets to benchmark on.
+            data_sets: The data sets to benchmark on. Lazy data sets are loaded just before
+                benchmarking on them and released afterwards, see
+                :class:`~nlutestframework.lazy_nlu_data_set.LazyNLUDataSet`.
             num_iterations: The number of iterations to repeat the evaluation process. The result is
                 the average over all iterations.
+            results_writer: If set, the summary of each data set and the result of each iteration
+                are written to disk as soon as they are available, see
+                :class:`~nlutestframework.results_writer.ResultsWriter`. Defaults to :obj:`None`.
+            previous_results: The results of a previous (incomplete) run to resume, see
+                :meth:`~nlutestframework.results_writer.ResultsWriter.read`. Iterations that were
+                completed in that run are not run again, frameworks that completed all iterations on
+                a data set are not even prepared for it. The data sets must be split the same way as
+                in the previous run, which requires the same data, validation percentages and seeds.
+                Defaults to :obj:`None`.
+
+        The progress is published on the :class:`~nlutestframework.event_bus.EventBus`, see
+        :mod:`~nlutestframework.events`.
+
+        Raises:
+            :exc:`ValueError`: if a data set is split differently than in the previous run.
         """
 
+        event_bus = EventBus.getInstance()
+        if event_bus.subscribed(RunStarted):
+            event_bus.publish(RunStarted(
+                [ framework.title for framework in frameworks ],
+                [ data_set.title for data_set in data_sets ],
+                num_iterations
+            ))
+
+        completed = False
         try:
-            iterations = await self.__run(frameworks, data_sets, num_iterations)
+            results = await self.__run(
+                frameworks,
+                data_sets,
+                num_iterations,
+                results_writer,
+                previous_results
+            )
+
+            completed = True
         finally:
             # Make sure that the frameworks are destructed even if something goes wrong during the
             # benchmarking.
             await run_in_parallel(
                 frameworks,
-                lambda x: x.destruct(),
+                lambda x: x.destroy(),
                 None,
                 "Error deconstructing all frameworks."
             )
 
-        iterations_  = self.__confusionMatricesToF1Scores(iterations)
-        performances = self.__f1ScoreMeansAndVariances(frameworks, data_sets, iterations_)
+            if event_bus.subscribed(RunFinished):
+                event_bus.publish(RunFinished(completed))
 
-        self.__plot(performances)
+        self.report(results.data_sets, results.iterations, results.latencies, results.resources)
 
-        performances_  = self.__mergeIntentPerformances(performances)
-        performances__ = self.__sortPerformances(performances_)
+    def report(
+        self,
+        data_sets: List[NLUDataSetSummary],
+        iterations: List[Dict[DataSetTitle, Dict[FrameworkTitle, ConfusionMatrix]]],
+        latencies: Optional[
+            List[Dict[DataSetTitle, Dict[FrameworkTitle, LatencyHistogram]]]
+        ] = None,
+        resources: Optional[
+            Dict[DataSetTitle, Dict[FrameworkTitle, Dict[LifecycleStage, ResourceUsage]]]
+        ] = None
+    ) -> None:
+        """
+        Output the F1 scores, the rating latencies and the resources used of all frameworks and the
+        best performing framework for each data set, and generate charts with the F1 scores per
+        intent, if the :class:`~nlutestframework.report_renderer.ReportRenderer` is running. See
+        :class:`~nlutestframework.benchmark_report.BenchmarkReport`.
+
+        Args:
+            data_sets: The summaries of the data sets.
+            iterations: The confusion matrix of each framework on each data set, for each iteration.
+                Frameworks and data sets may be missing from some of the iterations.
+            latencies: The latencies of the ratings of each framework on each data set, for each
+                iteration. The latencies of all iterations are merged, so that the quantiles are
+                taken over all ratings. Defaults to :obj:`None`, which omits the latencies.
+            resources: The resources used by each framework on each data set, by lifecycle stage.
+                Defaults to :obj:`None`, which omits the resources.
+        """
+
+        BenchmarkReport().output(RunResults(
+            data_sets  = data_sets,
+            iterations = iterations,
+            latencies  = latencies or [],
+            resources  = resources or {}
+        ))
+
+    def reportFromRunDirectory(
+        self,
+        run_directory: str,
+        chart_formats: Sequence[str] = ("png",)
+    ) -> None:
+        """
+        Report the results of a previous run again, without running any framework, see
+        :meth:`report`. The charts are rendered into the "charts" subdirectory of the run.
 
-        self.__printWinner(performances__, data_sets)
+        Args:
+            run_directory: The directory of the run, as created by :meth:`runFromConfig`.
+            chart_formats: The formats to render the charts in, any of "png", "svg" and "html".
+                Defaults to PNG only.
+
+        Raises:
+            :exc:`OSError`: if the results could not be read.
+            :exc:`ValueError`: if the results are malformed or a chart format is not supported.
+        """
+
+        results = ResultsWriter.read(run_directory)
+
+        report_renderer = ReportRenderer.getInstance()
+        report_renderer.start(os.path.join(run_directory, "charts"), chart_formats)
+        try:
+            self.report(
+                results.data_sets,
+                results.iterations,
+                results.latencies,
+                results.resources
+            )
+        finally:
+            report_renderer.stop()
 
     async def createFrameworks(
         self,
@@ -451,65 +560,74 @@ class NLUBenchmarker(HasLogger):
             title: FrameworkTitle,
             framework_config: JSONSerializable
         ) -> NLUFramework:
-            # Split at the last dot, which should result in the package name and the class name
+            # Dynamically import the class and get a reference
             # mypy is technically right that the framework_config, which is a JSONSerializable, is
             # not guaranteed to be a Dict here.
-            module, class_name = framework_config["class"].rsplit(".", 1) # type: ignore
+            cls = resolve_class(framework_config["class"], FRAMEWORKS) # type: ignore
 
             # Remove the "class" key from the framework config
             del framework_config["class"] # type: ignore
 
-            # Dynamically import the class and get a reference
-            cls = getattr(importlib.import_module(module), class_name)
-
             # Create the framework instance
             return await cls.create(global_config, framework_config, title) # type: ignore
 
         return await run_in_parallel( # type: ignore
             framework_configs.items(), # type: ignore
             lambda x: create_framework(*x),
-            lambda _, x: x.destruct(),
+            lambda _, x: x.destroy(),
             "Failed to create framework instances."
         )
 
     @staticmethod
     def loadDataSets(
         configs: Dict[DataSetTitle, JSONSerializable],
-        global_ignore_cache: bool = False
-    ) -> List[NLUDataSet]:
+        global_ignore_cache: bool = False,
+        lazy: bool = False
+    ) -> List[Union[NLUDataSet, LazyNLUDataSet]]:
         """
-        Load data sets based on the configuration dictionary.
+        Load data sets based on the configuration dictionary. The data sets are loaded concurrently,
+        in a thread pool. Loading from the cache (see
+        :class:`~nlutestframework.nlu_corpus_cache.NLUCorpusCache`) mostly consists of reading,
+        hashing and memory-mapping files, which runs in parallel. Parsing the original data on a
+        cache miss holds the GIL, so the first load of multiple data sets barely benefits from the
+        thread pool.
 
         Args:
             configs: A dictionary containing the configuration of the data sets to load. See
                 :ref:`configuration-data-set` for more information.
             global_ignore_cache: A boolean indicating whether caches should be ignored globally.
                 Defaults to False.
+            lazy: A boolean indicating whether to defer loading the data sets until they are
+                benchmarked on, see :class:`~nlutestframework.lazy_nlu_data_set.LazyNLUDataSet`.
+                Defaults to False.
         """
 
-        instances = []
+        data_sets: List[LazyNLUDataSet] = []
         for title, config in configs.items():
-            # Split at the last dot, which should result in the package name and the class name
-            module, class_name = config["class"].rsplit(".", 1) # type: ignore
+            # Dynamically import the class and get a reference
+            cls = resolve_class(config["class"], DATA_SETS) # type: ignore
 
             # Remove the "class" key from the config
             del config["class"] # type: ignore
 
-            # Dynamically import the class and get a reference
-            cls = getattr(importlib.import_module(module), class_name)
-
             # If the cache is disabled globally, override the setting in the config
             if global_ignore_cache:
                 config["ignore_cache"] = True # type: ignore
 
-            # Create the data set instance
-            instances.append(cls(title, **config))
+            data_sets.append(LazyNLUDataSet(title, cls, config)) # type: ignore
 
-        return instances
+        if lazy or len(data_sets) == 0:
+            return list(data_sets)
+
+        # Threads rather than processes, because memory-mapped corpora can't be pickled. Reading,
+        # hashing and mapping the cache files releases the GIL, parsing the original data doesn't.
+        with ThreadPoolExecutor(max_workers=len(data_sets)) as executor:
+            return list(executor.map(lambda x: x.load(), data_sets))
 
     async def runFromConfig(
         self,
         config: Dict[str, Dict[str, JSONSerializable]],
+        resume_directory: Optional[str] = None,
         **global_config_override: Any
     ) -> None:
         """
@@ -518,68 +636,114 @@ class NLUBenchmarker(HasLogger):
         Args:
             config: A dictionary containing the full configuration required to load and run the
                 benchmark. See :ref:`configuration-full` for more information.
+            resume_directory: The directory of a previous (incomplete) run to resume. The data sets
+                are loaded with the seeds of the previous run and only the iterations that were not
+                completed in the previous run are run, see :meth:`run`. The results are added to
+                the previous run directory. Defaults to :obj:`None`, which starts a new run in a
+                new directory.
             **global_config_override: Options to override in the global configuration.
+
+        Raises:
+            :exc:`OSError`: if the results of the run to resume could not be read.
+            :exc:`ValueError`: if the results of the run to resume are malformed or don't match the
+                configuration, or if the profiling options are invalid.
         """
 
-        global_config = {
-            "python"       : config["global"].get("python", sys.executable),
-            "iterations"   : config["global"]["iterations"],
-            "ignore_cache" : config["global"].get("ignore_cache", False)
-        }
-        global_config.update(global_config_override)
-        global_config_ = GlobalConfig(**global_config) # type: ignore
+        global_config_ = GlobalConfig.fromConfig(config["global"], **global_config_override)
+
+        # Each run writes its output to a new directory, named after the time the run started
+        run_name = time.strftime("%Y-%m-%d_%H-%M-%S")
+
+        previous_results: Optional[RunResults] = None
+        if resume_directory is not None:
+            previous_results = ResultsWriter.read(resume_directory)
+
+            self._logger.info("Resuming the run in %s", resume_directory)
+
+            # Load the data sets with the seeds of the previous run, to reproduce its splits
+            for summary in previous_results.data_sets:
+                data_set_config = config["data_sets"].get(summary.title, None)
+                if data_set_config is not None and summary.seed is not None:
+                    data_set_config["seed"] = summary.seed # type: ignore
 
         # Load the data sets first, so that the frameworks don't have to be destroyed if loading the
-        # data sets fails.
-        data_sets  = self.loadDataSets(config["data_sets"], global_config_.ignore_cache)
-        frameworks = await self.createFrameworks(global_config_, config["frameworks"])
+        # data sets fails. Lazy data sets are only loaded when they are benchmarked on.
+        data_sets  = self.loadDataSets(
+            config["data_sets"],
+            global_config_.ignore_cache,
+            global_config_.lazy_data_sets
+        )
+
+        # Only create the run directory once the data sets loaded, so that no empty run directories
+        # are left behind
+        if resume_directory is None:
+            run_directory = ResultsWriter.createRunDirectory(
+                global_config_.output_directory,
+                run_name
+            )
+        else:
+            run_directory = resume_directory
+
+        results_writer = ResultsWriter(run_directory)
+        self._logger.info("Writing the results to %s", results_writer.path)
 
-        await self.run(frameworks, data_sets, global_config_.iterations)
+        report_renderer = ReportRenderer.getInstance()
+        report_renderer.start(os.path.join(run_directory, "charts"), global_config_.chart_formats)
 
-    async def runFromConfigFile(self, path: str, **global_config_override: Any) -> None:
+        loop_lag_monitor = LoopLagMonitor.getInstance()
+        if global_config_.loop_lag_threshold is not None:
+            loop_lag_monitor.start(global_config_.loop_lag_threshold)
+
+        stage_profiler = StageProfiler.getInstance()
+
+        try:
+            stage_profiler.start(
+                global_config_.profile,
+                os.path.join(run_directory, "profiles"),
+                ProfilerMode(global_config_.profiler)
+            )
+
+            frameworks = await self.createFrameworks(global_config_, config["frameworks"])
+
+            await self.run(
+                frameworks,
+                data_sets,
+                global_config_.iterations,
+                results_writer,
+                previous_results
+            )
+        finally:
+            stage_profiler.stop()
+            loop_lag_monitor.stop()
+            results_writer.close()
+
+            # Wait for the charts without blocking the event loop
+            await asyncio.get_event_loop().run_in_executor(None, report_renderer.stop)
+
+    async def runFromConfigFile(
+        self,
+        path: str,
+        resume_directory: Optional[str] = None,
+        **global_config_override: Any
+    ) -> None:
         """
         Load and run a full benchmark from a configuration file.
 
         Args:
             path: The path to the configuration file. See :ref:`configuration-file` for more
                 information.
+            resume_directory: The directory of a previous (incomplete) run to resume, see
+                :meth:`runFromConfig`. Defaults to :obj:`None`, which starts a new run.
             **global_config_override: Options to override in the global configuration.
 
         Raises:
             :exc:`OSError`: in case the config file could not be read due to I/O or other OS-related
                 issues.
             :exc:`yaml.YAMLError`: in case the config file contains invalid YAML.
+            :exc:`ValueError`: if the run to resume doesn't match the configuration, see
+                :meth:`runFromConfig`.
         """
 
-        with open(path, "r") as f:
-            config = yaml.safe_load(f)
-
-        # Data set configuration file convenience: The data paths may be given relative to the
-        # configuration file location.
-        for data_set_config in config["data_sets"].values():
-            # Make the data paths absolute, relative to the location of the configuration file.
-            if not os.path.isabs(data_set_config["data_path"]):
-                data_set_config["data_path"] = os.path.abspath(os.path.join(
-                    os.path.dirname(path),
-                    data_set_config["data_path"]
-                ))
-
-        # Data set convenience: Implementations included in this library don't have to be specified
-        # using the whole package name.
-        for data_set_config in config["data_sets"].values():
-            if "." not in data_set_config["class"]:
-                data_set_config["class"] = "nlutestframework.implementations.{}DataSet".format(
-                    data_set_config["class"]
-                )
-
-        # Framework convenience: Implementations included in this library don't have to be specified
-        # using the whole package name.
-        for framework_config in config["frameworks"].values():
-            if "." not in framework_config["class"]:
-                framework_config["class"] = (
-                    "nlutestframework.implementations.{}NLUFramework".format(
-                        framework_config["class"]
-                    )
-                )
+        config = load_config_file(path)
 
-        await self.runFromConfig(config, **global_config_override)
+        await self.runFromConfig(config, resume_directory, **global_config_override)
@@ -0,0 +1,245 @@
+import numpy as np
+
+from .intent_codebook import IntentCodebook
+from .nlu_data_entry import NLUDataEntry
+
+# Other imports only for the type hints
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+from .types import Intent
+
+class SentenceBlob:
+    """
+    A sentence column stored as one UTF-8 encoded blob and the start and end offsets of each
+    sentence in that blob. The blob can be any bytes-like object, for example a memory map, in which
+    case the sentences are only read and decoded on access.
+    """
+
+    def __init__(self, blob: Union[bytes, memoryview], starts: np.ndarray, ends: np.ndarray):
+        """
+        Args:
+            blob: The UTF-8 encoded sentences.
+            starts: The offset of the first byte of each sentence in the blob.
+            ends: The offset after the last byte of each sentence in the blob.
+        """
+
+        self.__blob   = blob
+        self.__starts = starts
+        self.__ends   = ends
+
+    @property
+    def blob(self) -> Union[bytes, memoryview]:
+        return self.__blob
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self.__starts
+
+    @property
+    def ends(self) -> np.ndarray:
+        return self.__ends
+
+    def take(self, indices: np.ndarray) -> "SentenceBlob":
+        """
+        Args:
+            indices: The indices of the sentences to select.
+
+        Returns:
+            A column containing the selected sentences, sharing the blob with this column.
+        """
+
+        return self.__class__(self.__blob, self.__starts[indices], self.__ends[indices])
+
+    def __len__(self) -> int:
+        return len(self.__starts)
+
+    def __getitem__(self, index: int) -> str:
+        return bytes(self.__blob[self.__starts[index]:self.__ends[index]]).decode("utf-8")
+
+class NLUCorpus:
+    """
+    A columnar store of NLU data: one array of sentences and one array of intent codes, where the
+    codes are assigned by an :class:`~nlutestframework.intent_codebook.IntentCodebook`. Each intent
+    string is stored only once, no matter how many sentences are assigned to it.
+
+    Entries are not stored as objects, accessing an entry creates a lightweight
+    :class:`~nlutestframework.nlu_data_entry.NLUDataEntry` view into the corpus.
+    """
+
+    def __init__(
+        self,
+        sentences: Union[np.ndarray, SentenceBlob],
+        codes: np.ndarray,
+        codebook: IntentCodebook
+    ):
+        """
+        Args:
+            sentences: A one-dimensional array of sentences, or a :class:`SentenceBlob`.
+            codes: A one-dimensional array of intent codes, of the same length as the sentences.
+            codebook: The codebook used to encode the intents.
+
+        Raises:
+            :exc:`ValueError`: if the arrays differ in length or contain unknown intent codes.
+        """
+
+        if not isinstance(sentences, SentenceBlob):
+            sentences = np.asarray(sentences, dtype=object)
+
+            if sentences.ndim != 1:
+                raise ValueError("The sentence array must be one-dimensional.")
+
+            # The column is shared with views and subsets, make sure it is not modified
+            sentences.flags.writeable = False
+
+        codes = np.asarray(codes, dtype=np.int32)
+
+        if len(sentences) != len(codes):
+            raise ValueError("The sentence and intent code arrays must be of the same length.")
+
+        if len(codes) > 0 and (codes.min() < 0 or codes.max() >= len(codebook)):
+            raise ValueError("The intent code array contains codes unknown to the codebook.")
+
+        codes.flags.writeable = False
+
+        self.__sentences = sentences
+        self.__codes     = codes
+        self.__codebook  = codebook
+
+    @classmethod
+    def fromPairs(cls, pairs: Iterable[Tuple[str, Intent]]) -> "NLUCorpus":
+        """
+        Args:
+            pairs: Pairs of sentences and their correct intents.
+
+        Returns:
+            A corpus containing the sentences in the given order.
+        """
+
+        codebook = IntentCodebook()
+
+        sentences = []
+        codes     = []
+        for sentence, intent in pairs:
+            sentences.append(sentence)
+            codes.append(codebook.encode(intent))
+
+        sentence_array = np.empty(len(sentences), dtype=object)
+        sentence_array[:] = sentences
+
+        return cls(sentence_array, np.array(codes, dtype=np.int32), codebook)
+
+    @classmethod
+    def fromEntries(cls, entries: Iterable[NLUDataEntry]) -> "NLUCorpus":
+        """
+        Args:
+            entries: The entries to store.
+
+        Returns:
+            A corpus containing the entries in the given order.
+        """
+
+        return cls.fromPairs((entry.sentence, entry.intent) for entry in entries)
+
+    @property
+    def sentences(self) -> Union[np.ndarray, SentenceBlob]:
+        """
+        Returns:
+            The sentences, as a read-only array or a :class:`SentenceBlob`.
+        """
+
+        return self.__sentences
+
+    @property
+    def codes(self) -> np.ndarray:
+        """
+        Returns:
+            The intent codes of the sentences, as a read-only array.
+        """
+
+        return self.__codes
+
+    @property
+    def codebook(self) -> IntentCodebook:
+        return self.__codebook
+
+    def sentence(self, index: int) -> str:
+        """
+        Args:
+            index: The index of the entry.
+
+        Returns:
+            The sentence of the entry.
+        """
+
+        return str(self.__sentences[index])
+
+    def intent(self, index: int) -> Intent:
+        """
+        Args:
+            index: The index of the entry.
+
+        Returns:
+            The correct intent of the entry.
+        """
+
+        return self.__codebook.decode(int(self.__codes[index]))
+
+    def take(self, indices: np.ndarray) -> "NLUCorpus":
+        """
+        Args:
+            indices: The indices of the entries to select.
+
+        Returns:
+            A new corpus containing only the selected entries, in the order of the indices. The
+            codebook is shared with this corpus.
+        """
+
+        return self.__class__(
+            self.__sentences.take(indices),
+            self.__codes[indices],
+            self.__codebook
+        )
+
+    def groupByIntent(self, indices: Optional[np.ndarray] = None) -> Dict[Intent, np.ndarray]:
+        """
+        Group entries by their intents, without looking at the entries one by one.
+
+        Args:
+            indices: The indices of the entries to group. Defaults to :obj:`None`, which groups all
+                entries of the corpus.
+
+        Returns:
+            A mapping from each intent to the indices of its entries, in their original order.
+        """
+
+        if indices is None:
+            indices = np.arange(len(self.__codes))
+
+        codes = self.__codes[indices]
+
+        # Sort the entries by intent code (keeping the original order for equal codes) and cut the
+        # sorted indices at the boundaries between the codes
+        order = np.argsort(codes, kind="stable")
+        unique_codes, starts = np.unique(codes[order], return_index=True)
+
+        return {
+            self.__codebook.decode(int(code)): indices[group]
+            for code, group in zip(unique_codes, np.split(order, starts[1:]))
+        }
+
+    def __len__(self) -> int:
+        return len(self.__codes)
+
+    def __getitem__(self, index: int) -> NLUDataEntry:
+        if not -len(self) <= index < len(self):
+            raise IndexError("Corpus index out of range.")
+
+        return NLUDataEntry.view(self, index % len(self))
+
+    def __iter__(self) -> Iterator[NLUDataEntry]:
+        return (NLUDataEntry.view(self, index) for index in range(len(self)))
+
+    def __str__(self) -> str:
+        return "NLU corpus with {} entries and {} intents.".format(
+            len(self),
+            len(self.__codebook)
+        )
@@ -0,0 +1,301 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import uuid
+
+import numpy as np
+
+from .has_logger import HasLogger
+from .intent_codebook import IntentCodebook
+from .nlu_corpus import NLUCorpus, SentenceBlob
+
+# Other imports only for the type hints
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+class NLUCorpusCache(HasLogger):
+    """
+    A binary cache for the :class:`~nlutestframework.nlu_corpus.NLUCorpus` of a data set, which is
+    memory-mapped on load instead of being parsed.
+
+    The cache file consists of a fixed-size preamble (magic bytes, format version and header size),
+    a JSON header and the columns of the corpus: the sentence offsets (int64), the intent codes
+    (int32) and the UTF-8 encoded sentence blob. The header contains the language, the intents and
+    a fingerprint (size, modification time and SHA-256 hash) of the source data. The cache is
+    ignored if its format version or the fingerprint don't match.
+    """
+
+    MAGIC   = b"NLUCACHE"
+    VERSION = 1
+
+    # Magic bytes, format version (uint32) and header size in bytes (uint32)
+    __PREAMBLE = struct.Struct("<8sII")
+
+    # The columns are aligned to this many bytes
+    __ALIGNMENT = 8
+
+    def __init__(self, cache_file: str, source_path: str):
+        """
+        Args:
+            cache_file: The path to the cache file.
+            source_path: The path to the file or directory containing the original data. A
+                snapshot of the size and modification time of the source is taken immediately, so
+                construct the cache before loading the original data.
+        """
+
+        super().__init__()
+
+        self.__cache_file  = cache_file
+        self.__source_path = source_path
+        self.__source_stat = self.__statSource()
+
+    @property
+    def cache_file(self) -> str:
+        return self.__cache_file
+
+    def __sourceFiles(self) -> List[str]:
+        """
+        Returns:
+            The paths of all files that make up the source, in a stable order. The cache file
+            itself is excluded, in case it is stored inside of a source directory.
+        """
+
+        if os.path.isfile(self.__source_path):
+            return [ self.__source_path ]
+
+        files = []
+        for directory, _, names in os.walk(self.__source_path):
+            for name in names:
+                path = os.path.join(directory, name)
+                if not path.startswith(self.__cache_file):
+                    files.append(path)
+
+        return sorted(files)
+
+    def __statSource(self) -> Dict[str, int]:
+        """
+        Returns:
+            The total size and the latest modification time (in nanoseconds) of the source files.
+        """
+
+        stats = [ os.stat(path) for path in self.__sourceFiles() ]
+
+        return {
+            "size"     : sum(stat.st_size for stat in stats),
+            "mtime_ns" : max((stat.st_mtime_ns for stat in stats), default=0)
+        }
+
+    def __hashSource(self) -> str:
+        """
+        Returns:
+            The SHA-256 hash of the (relative paths and) contents of all source files.
+        """
+
+        sha256 = hashlib.sha256()
+
+        for path in self.__sourceFiles():
+            sha256.update(os.path.relpath(path, self.__source_path).encode("utf-8"))
+
+            with open(path, "rb") as f:
+                chunk = f.read(1 << 20)
+                while len(chunk) > 0:
+                    sha256.update(chunk)
+                    chunk = f.read(1 << 20)
+
+        return sha256.hexdigest()
+
+    def load(self) -> Optional[Tuple[Optional[str], NLUCorpus]]:
+        """
+        Returns:
+            The language and the corpus stored in the cache, or :obj:`None` if the cache doesn't
+            exist or doesn't match the source. The columns of the corpus are memory-mapped.
+
+        Raises:
+            :exc:`OSError`: if the cache could not be read.
+            :exc:`ValueError`: if the cache is corrupted.
+        """
+
+        if not os.path.isfile(self.__cache_file):
+            return None
+
+        with open(self.__cache_file, "rb") as f:
+            # The memory map stays valid after closing the file
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_size = self.__PREAMBLE.unpack_from(buf, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self._logger.info("Rebuilding cache %s, unknown cache format.", self.__cache_file)
+            return None
+
+        header_offset = self.__PREAMBLE.size
+        header = json.loads(bytes(buf[header_offset:header_offset + header_size]).decode("utf-8"))
+
+        offset = self.__align(header_offset + header_size)
+
+        if not self.__matchesSource(header, memoryview(buf)[offset:]):
+            self._logger.info("Rebuilding cache %s, the source changed.", self.__cache_file)
+            return None
+
+        size = header["size"]
+
+        offsets = np.frombuffer(buf, dtype="<i8", count=size + 1, offset=offset)
+
+        offset += offsets.nbytes
+        codes   = np.frombuffer(buf, dtype="<i4", count=size, offset=offset)
+
+        offset += codes.nbytes
+        blob    = memoryview(buf)[offset:offset + int(offsets[-1])]
+
+        if len(blob) != int(offsets[-1]):
+            raise ValueError("The cache file is truncated.")
+
+        corpus = NLUCorpus(
+            SentenceBlob(blob, offsets[:-1], offsets[1:]),
+            codes,
+            IntentCodebook(header["intents"][1:])
+        )
+
+        return header["language"], corpus
+
+    def __matchesSource(self, header: Dict[str, Any], columns: memoryview) -> bool:
+        """
+        Returns:
+            Whether the fingerprint in the header of the cache matches the source.
+        """
+
+        # Compare the cheap part of the fingerprint first and only hash the source on a mismatch,
+        # e.g. if the source was touched without changing its contents.
+        source = header["source"]
+        stat = self.__source_stat
+        if source["size"] == stat["size"] and source["mtime_ns"] == stat["mtime_ns"]:
+            return True
+
+        if source["size"] != stat["size"] or source["sha256"] != self.__hashSource():
+            return False
+
+        self.__refreshSource(header, columns)
+
+        return True
+
+    def __refreshSource(self, header: Dict[str, Any], columns: memoryview) -> None:
+        """
+        Replace the fingerprint of the source in the cache file after the source was touched
+        without changing its contents, so that the next load doesn't have to hash the source again.
+        The columns are copied as they are. Errors are logged and otherwise ignored.
+        """
+
+        # Make sure that the source didn't change while it was hashed
+        if self.__statSource() != self.__source_stat:
+            return
+
+        header = dict(header, source=dict(self.__source_stat, sha256=header["source"]["sha256"]))
+
+        try:
+            self.__write(header, [ columns ])
+        except OSError as e:
+            self._logger.warning("Error refreshing cache %s", self.__cache_file, exc_info=e)
+
+    def store(self, language: Optional[str], corpus: NLUCorpus) -> threading.Thread:
+        """
+        Write the cache in a background thread. The cache file is replaced atomically, readers
+        either see the previous cache or the complete new one. Errors are logged and otherwise
+        ignored, the cache is not written if the source changes in the meantime.
+
+        Args:
+            language: The language of the data.
+            corpus: The data to cache.
+
+        Returns:
+            The (started) thread writing the cache.
+        """
+
+        thread = threading.Thread(
+            target=self.__storeAndLog,
+            args=(language, corpus),
+            name="nlucache-writer"
+        )
+
+        thread.start()
+
+        return thread
+
+    def __storeAndLog(self, language: Optional[str], corpus: NLUCorpus) -> None:
+        try:
+            self.storeSync(language, corpus)
+        except BaseException as e: # pylint: disable=broad-except
+            self._logger.warning("Error storing cached data", exc_info=e)
+
+    def storeSync(self, language: Optional[str], corpus: NLUCorpus) -> bool:
+        """
+        Write the cache in the calling thread, see :meth:`store`.
+
+        Args:
+            language: The language of the data.
+            corpus: The data to cache.
+
+        Returns:
+            A boolean indicating whether the cache was written. The cache is not written if the
+            source changed since the construction of this instance.
+
+        Raises:
+            :exc:`OSError`: if the cache could not be written.
+        """
+
+        source_hash = self.__hashSource()
+
+        # Make sure that the hash belongs to the same version of the source as the corpus
+        if self.__statSource() != self.__source_stat:
+            self._logger.info("Not caching %s, the source changed.", self.__source_path)
+            return False
+
+        encoded = [ corpus.sentence(index).encode("utf-8") for index in range(len(corpus)) ]
+
+        offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+        np.cumsum([ len(x) for x in encoded ], out=offsets[1:])
+
+        header: Dict[str, Any] = {
+            "language" : language,
+            "size"     : len(corpus),
+            "intents"  : corpus.codebook.intents,
+            "source"   : dict(self.__source_stat, sha256=source_hash)
+        }
+
+        self.__write(header, [
+            offsets.tobytes(),
+            corpus.codes.astype("<i4").tobytes(),
+            b"".join(encoded)
+        ])
+
+        return True
+
+    def __write(self, header: Dict[str, Any], columns: List[Union[bytes, memoryview]]) -> None:
+        """
+        Write the preamble, the header and the (already encoded) columns to a temporary file and
+        replace the cache file with it.
+        """
+
+        encoded_header = json.dumps(header).encode("utf-8")
+        header_end = self.__PREAMBLE.size + len(encoded_header)
+
+        # Unlike tempfile.mkstemp, os.open applies the umask to the permissions of the new file, so
+        # that the cache is as accessible as the other files in the directory
+        temp_path = "{}.{}.tmp".format(self.__cache_file, uuid.uuid4().hex)
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.__PREAMBLE.pack(self.MAGIC, self.VERSION, len(encoded_header)))
+                f.write(encoded_header)
+                f.write(b"\0" * (self.__align(header_end) - header_end))
+                for column in columns:
+                    f.write(column)
+
+            os.replace(temp_path, self.__cache_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def __align(cls, offset: int) -> int:
+        return -(-offset // cls.__ALIGNMENT) * cls.__ALIGNMENT
@@ -1,12 +1,22 @@
 from .serializable import Serializable
 
 # Other imports only for the type hints
-from typing import TypeVar, Type
+from typing import Any, Optional, TypeVar, Type, TYPE_CHECKING
 from .types import Intent, JSONSerializable
+if TYPE_CHECKING:
+    from .nlu_corpus import NLUCorpus # pylint: disable=cyclic-import
 
 T = TypeVar("T", bound="NLUDataEntry")
 
 class NLUDataEntry(Serializable):
+    """
+    A sentence and its correct intent. Entries are either standalone or lightweight views into an
+    :class:`~nlutestframework.nlu_corpus.NLUCorpus` (see :meth:`view`), which don't store the
+    sentence and intent themselves.
+    """
+
+    __slots__ = ("__sentence", "__intent", "__corpus", "__index")
+
     def __init__(self, sentence: str, intent: Intent):
         """
         Args:
@@ -16,24 +26,61 @@ class NLUDataEntry(Serializable):
 
         self.__sentence = sentence
         self.__intent   = intent
+        self.__corpus: Optional["NLUCorpus"] = None
+        self.__index    = -1
+
+    @classmethod
+    def view(cls: Type[T], corpus: "NLUCorpus", index: int) -> T:
+        """
+        Args:
+            corpus: The corpus containing the entry.
+            index: The index of the entry in the corpus.
+
+        Returns:
+            A view of the entry, which reads the sentence and intent from the corpus.
+        """
+
+        # pylint: disable=unused-private-member
+        entry = cls.__new__(cls)
+        entry.__sentence = ""
+        entry.__intent   = None
+        entry.__corpus   = corpus
+        entry.__index    = index
+
+        return entry
 
     @property
     def sentence(self) -> str:
-        return self.__sentence
+        if self.__corpus is None:
+            return self.__sentence
+
+        return self.__corpus.sentence(self.__index)
 
     @property
     def intent(self) -> Intent:
-        return self.__intent
+        if self.__corpus is None:
+            return self.__intent
+
+        return self.__corpus.intent(self.__index)
 
     def serialize(self) -> JSONSerializable:
         return {
-            "sentence" : self.__sentence,
-            "intent"   : self.__intent
+            "sentence" : self.sentence,
+            "intent"   : self.intent
         }
 
     @classmethod
     def fromSerialized(cls: Type[T], serialized: JSONSerializable) -> T:
         return cls(serialized["sentence"], serialized["intent"]) # type: ignore
 
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, NLUDataEntry):
+            return NotImplemented
+
+        return self.sentence == other.sentence and self.intent == other.intent
+
+    def __hash__(self) -> int:
+        return hash((self.sentence, self.intent))
+
     def __str__(self) -> str:
-        return "Intent for sentence \"{}\": \"{}\"".format(self.__sentence, self.__intent)
+        return "Intent for sentence \"{}\": \"{}\"".format(self.sentence, self.intent)
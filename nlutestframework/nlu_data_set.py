@@ -1,15 +1,36 @@
-import json
 import os
-import random
 
 from langcodes import Language
+import numpy as np
 
 from .has_logger import HasLogger
-from .nlu_data_entry import NLUDataEntry
+from .intent_codebook import IntentCodebook
+from .nlu_corpus import NLUCorpus
+from .nlu_corpus_cache import NLUCorpusCache
+from .nlu_data_split import NLUDataSplit
+from .nlu_data_view import NLUDataView, group_by_intent
 
 # Other imports only for the type hints
-from typing import Optional, List
-from .types import DataSetTitle
+from typing import FrozenSet, NamedTuple, Optional, List, Sequence
+from .nlu_data_entry import NLUDataEntry
+from .types import DataSetTitle, Intent
+
+class NLUDataSetSummary(NamedTuple):
+    """
+    The information about a data set that is needed to score benchmark results, without the data.
+    """
+
+    title: DataSetTitle
+    language: str
+
+    # The intents of the validation data of the current split
+    intents: FrozenSet[Intent]
+
+    training_size: int
+    validation_size: int
+
+    # The seed used to shuffle the data, see NLUDataSet.seed
+    seed: Optional[int] = None
 
 class NLUDataSet(HasLogger):
     def __init__(
@@ -18,7 +39,8 @@ class NLUDataSet(HasLogger):
         data_path: str,
         validation_percentage: int,
         language: Optional[str] = None,
-        ignore_cache: bool = False
+        ignore_cache: bool = False,
+        seed: Optional[int] = None
     ):
         """
         Args:
@@ -32,11 +54,18 @@ class NLUDataSet(HasLogger):
             language: The language tag of this data set, e.g. "en" or "en-us". If this parameter is
                 set to None or omitted, the implementation is assumed to get that information from
                 somewhere else.
-            ignore_cache: A boolean flag indicating whether the data cache should be ignored.
+            ignore_cache: A boolean flag indicating whether the data cache should be ignored. The
+                cache is rebuilt automatically if the original data changes, see
+                :class:`~nlutestframework.nlu_corpus_cache.NLUCorpusCache`.
+            seed: The seed for shuffling the data. Runs with the same seed split the data the same
+                way, which allows reusing cached ratings (see
+                :attr:`~nlutestframework.global_config.GlobalConfig.rating_cache`). Defaults to
+                :obj:`None`, which draws a different seed on each run. The seed in use is available
+                via :attr:`seed`.
 
         Raises:
-            :exc:`OSError`: in case the data could not be loaded or cached due to I/O or other
-                OS-related issues.
+            :exc:`OSError`: in case the data could not be loaded due to I/O or other OS-related
+                issues. Errors writing the cache are only logged.
             :exc:`ValueError`: if the validation data set or the training data set are empty after
                 splitting the data based on validation_percentage.
             :exc:`ValueError`: if the data path does not point to an existing file or directory.
@@ -44,12 +73,23 @@ class NLUDataSet(HasLogger):
         Sentences assigned to the None-intent are treated differently. These sentences are first
         removed from the data set, the remaining data is then shuffled and split and the None-data
         is added to the validation data in the final step.
+
+        The entries are stored once, in columnar form (see
+        :class:`~nlutestframework.nlu_corpus.NLUCorpus`). Splits only consist of (shuffled) indices
+        into that store and expose the entries via read-only
+        :class:`~nlutestframework.nlu_data_view.NLUDataView` instances.
         """
 
         super().__init__()
 
+        # Draw a seed if none was given, so that the splits of this run can be reproduced later
+        if seed is None:
+            seed = int(np.random.default_rng().integers(2 ** 63))
+
         self.__title    = title
-        self.__language = None
+        self.__language: Optional[str] = None
+        self.__seed     = seed
+        self.__random   = np.random.default_rng(seed)
 
         if language is not None:
             self._setLanguage(language)
@@ -60,24 +100,22 @@ class NLUDataSet(HasLogger):
         if not os.path.exists(data_path):
             raise ValueError("The data path does not point to an existing file or directory.")
 
+        # Snapshot the state of the source before loading, see NLUCorpusCache
+        cache = NLUCorpusCache(self.__cacheFile(data_path), data_path)
+
         # Try to load the cached data
-        if not (ignore_cache or self.__loadCachedData(data_path)):
+        if not (ignore_cache or self.__loadCachedData(cache)):
             ignore_cache = True
 
         # If the cache was ignored (also set if loading the cache failed), load the data "by hand"
         if ignore_cache:
-            data = self._loadData(data_path)
+            self.__setCorpus(self._loadCorpus(data_path))
 
-            # Only the data without None-intent
-            self.__data = list(filter(lambda x: x.intent is not None, data))
-
-            # Only the data with None-intent
-            self.__none_data = list(filter(lambda x: x.intent is None, data))
-
-            self.__cacheData(data_path)
+            # The cache is not needed for this run, write it off the critical path
+            cache.store(self.__language, self.__corpus)
 
         # Apply the split percentage only to the data without None-intent
-        self.__validation_size = (validation_percentage * len(self.__data)) // 100
+        self.__validation_size = (validation_percentage * self.__num_data) // 100
 
         # Perform an initial shuffle-and-split
         self.reshuffle()
@@ -90,6 +128,16 @@ class NLUDataSet(HasLogger):
     def language(self) -> str:
         return self.__language # type: ignore
 
+    @property
+    def seed(self) -> int:
+        """
+        Returns:
+            The seed used to shuffle the data. Loading the data set again with this seed reproduces
+            the same sequence of splits.
+        """
+
+        return self.__seed
+
     def _setLanguage(self, language: str) -> None:
         """
         Args:
@@ -106,127 +154,197 @@ class NLUDataSet(HasLogger):
 
         self.__language = Language.get(language).maximize().to_tag()
 
-    def __loadCachedData(self, data_path: str) -> bool:
+    def __setCorpus(self, corpus: NLUCorpus) -> None:
+        """
+        Args:
+            corpus: The entries of this data set, with and without None-intent. The entries are
+                reordered to store the data without None-intent first.
+        """
+
+        is_none = corpus.codes == IntentCodebook.NONE_CODE
+
+        self.__num_data = len(corpus) - int(np.count_nonzero(is_none))
+
+        # Move the data with None-intent to the end, keeping the order otherwise
+        if is_none[:self.__num_data].any():
+            corpus = corpus.take(np.argsort(is_none, kind="stable"))
+
+        self.__corpus = corpus
+
+    @property
+    def corpus(self) -> NLUCorpus:
+        """
+        Returns:
+            All entries of this data set, the data without None-intent first.
+        """
+
+        return self.__corpus
+
+    @staticmethod
+    def __cacheFile(data_path: str) -> str:
         """
         Args:
             data_path: The absolute path to the file or directory containing the original data.
 
         Returns:
-            A boolean indicating whether loading the cache was successful.
+            The path to the cache file of the data.
         """
 
         if os.path.isfile(data_path):
-            cache_file = data_path + ".nlucache"
-        else:
-            cache_file = os.path.join(data_path, "nlu.cache")
+            return data_path + ".nlucache"
+
+        return os.path.join(data_path, "nlu.cache")
+
+    def __loadCachedData(self, cache: NLUCorpusCache) -> bool:
+        """
+        Args:
+            cache: The cache of the data.
+
+        Returns:
+            A boolean indicating whether loading the cache was successful.
+        """
 
         try:
-            with open(cache_file, "r") as f:
-                data = json.load(f)
+            cached = cache.load()
+            if cached is None:
+                return False
 
             # Load the language and make sure it is consistent with the expected language
-            language = data["language"]
+            language, corpus = cached
             if self.__language is None or self.__language == language:
                 self.__language = language
             else:
                 raise ValueError("Language clash between cached data and expected language.")
 
-            # Load the entries
-            entries = [ NLUDataEntry.fromSerialized(entry) for entry in data["entries"] ]
-
-            # Only the data without None-intent
-            self.__data = list(filter(lambda x: x.intent is not None, entries))
-
-            # Only the data with None-intent
-            self.__none_data = list(filter(lambda x: x.intent is None, entries))
+            self.__setCorpus(corpus)
 
             return True
         except BaseException as e: # pylint: disable=broad-except
             self._logger.warning("Error loading cached data", exc_info=e)
             return False
 
-    def __cacheData(self, data_path: str) -> None:
+    def _loadData(self, data_path: str) -> List[NLUDataEntry]:
         """
         Args:
-            data_path: The absolute path to the file or directory containing the original data.
+            data_path: The absolute path to the file or directory containing the original data in an
+                implementation-specific format.
+
+        Returns:
+            A list of NLUDataEntry instances.
 
         Raises:
-            :exc:`OSError`: if storing the cache fails.
+            :exc:`OSError`: in case the data could not be loaded due to I/O or other OS-related
+                issues.
         """
 
-        if os.path.isfile(data_path):
-            cache_file = data_path + ".nlucache"
-        else:
-            cache_file = os.path.join(data_path, "nlu.cache")
-
-        entries = self.__data + self.__none_data
-
-        data = {
-            "language" : self.__language,
-            "entries"  : [ entry.serialize() for entry in entries ]
-        }
-
-        with open(cache_file, "w") as f:
-            json.dump(data, f)
+        raise NotImplementedError("To be implemented by subclasses.")
 
-    def _loadData(self, data_path: str) -> List[NLUDataEntry]:
+    def _loadCorpus(self, data_path: str) -> NLUCorpus:
         """
+        Load the data in columnar form. Override this method instead of :meth:`_loadData` to build
+        the corpus directly, without creating an NLUDataEntry instance per entry first.
+
         Args:
             data_path: The absolute path to the file or directory containing the original data in an
                 implementation-specific format.
 
         Returns:
-            A list of NLUDataEntry instances.
+            The loaded data.
 
         Raises:
             :exc:`OSError`: in case the data could not be loaded due to I/O or other OS-related
                 issues.
         """
 
-        raise NotImplementedError("To be implemented by subclasses.")
+        return NLUCorpus.fromEntries(self._loadData(data_path))
 
-    def reshuffle(self) -> None:
+    def split(self) -> NLUDataSplit:
         """
         Shuffle the data and split it into training and validation data. This method does not make
         sure that the new splitting is different from previous splittings, but given a decent amount
         of data the chance for that should be low enough.
 
+        In contrast to :meth:`reshuffle`, the current split of this data set (see
+        :attr:`training_data` and :attr:`validation_data`) is not changed.
+
+        Returns:
+            The new split.
+
         Raises:
             :exc:`ValueError`: if the validation data set or the training data set are empty after
                 splitting the data.
         """
 
-        # Shuffle the data without None-intent
-        random.shuffle(self.__data)
+        # Shuffle the indices of the data without None-intent, the data itself is not touched
+        permutation = self.__random.permutation(self.__num_data)
 
         # Split the data without None-intent into training and validation data
-        self.__training   = self.__data[self.__validation_size:]
-        self.__validation = self.__data[:self.__validation_size]
+        training   = permutation[self.__validation_size:]
+        validation = permutation[:self.__validation_size]
 
         # Make sure that both sets are non-empty
-        if len(self.__validation) == 0 or len(self.__training) == 0:
+        if len(validation) == 0 or len(training) == 0:
             raise ValueError("Validation or training data is empty.")
 
-        # Extend the validation data by the None-intent data
-        self.__validation.extend(self.__none_data)
+        # Extend the validation data by the None-intent data, which is stored after the other data
+        validation = np.concatenate((
+            validation,
+            np.arange(self.__num_data, len(self.__corpus))
+        ))
+
+        return NLUDataSplit(
+            NLUDataView(self.__corpus, training),
+            NLUDataView(self.__corpus, validation)
+        )
+
+    def reshuffle(self) -> None:
+        """
+        Replace the current split of this data set by a new one, see :meth:`split`.
+
+        Raises:
+            :exc:`ValueError`: if the validation data set or the training data set are empty after
+                splitting the data.
+        """
+
+        self.__split = self.split()
+
+    @property
+    def current_split(self) -> NLUDataSplit:
+        return self.__split
+
+    @property
+    def training_data(self) -> Sequence[NLUDataEntry]:
+        """
+        Returns:
+            The data to train on, according to the current split.
+        """
+
+        return self.__split.training_data
 
     @property
-    def training_data(self) -> List[NLUDataEntry]:
+    def validation_data(self) -> Sequence[NLUDataEntry]:
         """
         Returns:
-            The data to train on.
+            The data to validate with, according to the current split.
         """
 
-        return list(self.__training)
+        return self.__split.validation_data
 
     @property
-    def validation_data(self) -> List[NLUDataEntry]:
+    def summary(self) -> NLUDataSetSummary:
         """
         Returns:
-            The data to validate with.
+            A summary of this data set and its current split, which doesn't reference the data.
         """
 
-        return list(self.__validation)
+        return NLUDataSetSummary(
+            title           = self.__title,
+            language        = self.language,
+            intents         = frozenset(group_by_intent(self.validation_data)),
+            training_size   = len(self.training_data),
+            validation_size = len(self.validation_data),
+            seed            = self.__seed
+        )
 
     def __str__(self) -> str:
-        return "NLU data set \"{}\" with {} entries.".format(self.title, len(self.__data))
+        return "NLU data set \"{}\" with {} entries.".format(self.title, self.__num_data)
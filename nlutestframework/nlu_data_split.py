@@ -0,0 +1,61 @@
+from .nlu_data_view import NLUDataView
+
+# Other imports only for the type hints
+from typing import Iterable, Sequence
+from .nlu_data_entry import NLUDataEntry
+
+class NLUDataSplit:
+    """
+    One split of an :class:`~nlutestframework.nlu_data_set.NLUDataSet` into training and validation
+    data, see :meth:`~nlutestframework.nlu_data_set.NLUDataSet.split`. Splits are immutable, so
+    that multiple benchmark iterations can work on different splits of the same data set at the
+    same time.
+    """
+
+    def __init__(
+        self,
+        training_data: Iterable[NLUDataEntry],
+        validation_data: Iterable[NLUDataEntry]
+    ):
+        """
+        Args:
+            training_data: The data to train on.
+            validation_data: The data to validate with.
+
+        Instances of :class:`~nlutestframework.nlu_data_view.NLUDataView` are used as-is, all other
+        iterables are copied into tuples.
+        """
+
+        self.__training   = self.__freeze(training_data)
+        self.__validation = self.__freeze(validation_data)
+
+    @staticmethod
+    def __freeze(data: Iterable[NLUDataEntry]) -> Sequence[NLUDataEntry]:
+        if isinstance(data, NLUDataView):
+            return data
+
+        return tuple(data)
+
+    @property
+    def training_data(self) -> Sequence[NLUDataEntry]:
+        """
+        Returns:
+            The data to train on, as a read-only sequence.
+        """
+
+        return self.__training
+
+    @property
+    def validation_data(self) -> Sequence[NLUDataEntry]:
+        """
+        Returns:
+            The data to validate with, as a read-only sequence.
+        """
+
+        return self.__validation
+
+    def __str__(self) -> str:
+        return "NLU data split with {} training and {} validation entries.".format(
+            len(self.__training),
+            len(self.__validation)
+        )
@@ -0,0 +1,123 @@
+from collections.abc import Sequence as SequenceABC
+
+import numpy as np
+
+# Other imports only for the type hints
+from typing import Any, Dict, Iterator, List, Sequence, Set, Union, overload
+from .nlu_corpus import NLUCorpus
+from .nlu_data_entry import NLUDataEntry
+from .types import Intent
+
+class NLUDataView(SequenceABC): # type: ignore
+    """
+    A read-only sequence of :class:`~nlutestframework.nlu_data_entry.NLUDataEntry` instances, which
+    selects entries from a shared :class:`~nlutestframework.nlu_corpus.NLUCorpus` by their indices.
+    Creating a view doesn't copy any entries, only the (integer) indices are stored.
+    """
+
+    def __init__(self, corpus: NLUCorpus, indices: np.ndarray):
+        """
+        Args:
+            corpus: The backing store, shared between views.
+            indices: The indices of the entries in the corpus that this view consists of.
+        """
+
+        self.__corpus  = corpus
+        self.__indices = np.asarray(indices, dtype=np.intp)
+
+        # Views are immutable, make sure that the indices can't be modified through the property
+        self.__indices.flags.writeable = False
+
+    @property
+    def corpus(self) -> NLUCorpus:
+        return self.__corpus
+
+    @property
+    def indices(self) -> np.ndarray:
+        """
+        Returns:
+            The indices of the entries in the corpus, as a read-only array.
+        """
+
+        return self.__indices
+
+    @property
+    def intents(self) -> Set[Intent]:
+        """
+        Returns:
+            The distinct intents of the entries in this view.
+        """
+
+        codebook = self.__corpus.codebook
+
+        return {
+            codebook.decode(int(code))
+            for code in np.unique(self.__corpus.codes[self.__indices])
+        }
+
+    def groupByIntent(self) -> Dict[Intent, "NLUDataView"]:
+        """
+        Returns:
+            A mapping from each intent to a view of its entries, see
+            :meth:`~nlutestframework.nlu_corpus.NLUCorpus.groupByIntent`.
+        """
+
+        return {
+            intent: NLUDataView(self.__corpus, indices)
+            for intent, indices in self.__corpus.groupByIntent(self.__indices).items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.__indices)
+
+    @overload
+    def __getitem__(self, index: int) -> NLUDataEntry:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "NLUDataView":
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[NLUDataEntry, "NLUDataView"]:
+        if isinstance(index, slice):
+            return NLUDataView(self.__corpus, self.__indices[index])
+
+        return NLUDataEntry.view(self.__corpus, int(self.__indices[index]))
+
+    def __iter__(self) -> Iterator[NLUDataEntry]:
+        corpus = self.__corpus
+
+        return (NLUDataEntry.view(corpus, index) for index in self.__indices.tolist())
+
+    def __eq__(self, other: Any) -> bool:
+        # Views on the same corpus can be compared by their indices
+        # pylint: disable=protected-access
+        if isinstance(other, NLUDataView) and other.__corpus is self.__corpus:
+            return bool(np.array_equal(self.__indices, other.indices))
+
+        if not isinstance(other, SequenceABC) or len(other) != len(self):
+            return False
+
+        return all(a == b for a, b in zip(self, other))
+
+    def __str__(self) -> str:
+        return "View of {} NLU data entries.".format(len(self))
+
+def group_by_intent(data: Sequence[NLUDataEntry]) -> Dict[Intent, Sequence[NLUDataEntry]]:
+    """
+    Args:
+        data: The entries to group.
+
+    Returns:
+        A mapping from each intent to its entries, in their original order. Grouping is vectorized
+        if the entries are given as an :class:`NLUDataView`.
+    """
+
+    if isinstance(data, NLUDataView):
+        return dict(data.groupByIntent())
+
+    groups: Dict[Intent, List[NLUDataEntry]] = {}
+    for entry in data:
+        groups.setdefault(entry.intent, []).append(entry)
+
+    return dict(groups)
@@ -1,13 +1,36 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import contextlib
+import copy
+import functools
+import time
+
+from .event_bus import EventBus
+from .events import SentenceRated, StageFinished, StageStarted
+from .fingerprint import fingerprint_json, fingerprint_training_data
 from .has_logger import HasLogger
+from .latency_histogram import LatencyHistogram
+from .lifecycle_stage import LifecycleStage
+from .loop_lag_monitor import LoopLagMonitor
+from .model_artifact_store import ModelArtifactStore
+from .rating_cache import RatingCache
+from .resource_monitor import ResourceMonitor, ResourceUsage
+from .stage_profiler import StageProfiler
 
 # Other imports only for the type hints
-from typing import List, Dict, Any
-from .types import FrameworkTitle, JSONSerializable, ConfusionMatrix
+from typing import (
+    List, Dict, Any, Callable, Awaitable, Optional, Tuple, TypeVar, AsyncIterator, ClassVar,
+    Sequence
+)
+from .types import DataSetTitle, FrameworkTitle, JSONSerializable, ConfusionMatrix
 from .global_config import GlobalConfig
 from .nlu_data_entry import NLUDataEntry
 from .nlu_data_set import NLUDataSet
+from .nlu_data_split import NLUDataSplit
 from .nlu_intent_rating import NLUIntentRating
 
+R = TypeVar("R") # pylint: disable=invalid-name
+
 class NLUFramework(HasLogger):
     """
     Frameworks follow a certain lifecycle while being benchmarked. Implementations can react to new
@@ -27,12 +50,32 @@ class NLUFramework(HasLogger):
 
     Frameworks are not forced to react to all lifecycle events.
 
+    All lifecycle methods are coroutines that run on the event loop shared by all frameworks.
+    Implementations must not block the event loop, otherwise the frameworks can't be benchmarked in
+    parallel. Blocking calls, like calls to synchronous SDKs or CPU-heavy training, have to be
+    offloaded using :meth:`_runBlocking` and :meth:`_runCPUBound`.
+
     See :doc:`../nlu_frameworks`.
     """
 
+    # Whether instances of this framework are able to hold multiple trained models at the same
+    # time, see fork. Frameworks that support it can run multiple benchmark iterations at once.
+    SUPPORTS_CONCURRENT_ITERATIONS: ClassVar[bool] = False
+
     # This is just to satisfy mypy. Please don't call it directly!
     def __init__(self, *args: Any, **kwargs: Any):
         self.__title: str
+        self.__rating_semaphore: asyncio.Semaphore
+        self.__rating_cache: Optional[RatingCache]
+        self.__model_artifact_store: Optional[ModelArtifactStore]
+        self.__config_fingerprint: str
+        self.__executor_type: str
+        self.__executor_workers: Optional[int]
+        self.__blocking_executor: ThreadPoolExecutor
+        self.__cpu_bound_executor: Optional[Executor]
+        self.__concurrent_iterations: int
+        self.__latency_histogram: LatencyHistogram
+        self.__resource_usage: Dict[LifecycleStage, ResourceUsage]
 
         super().__init__(*args, **kwargs)
 
@@ -40,6 +83,54 @@ class NLUFramework(HasLogger):
     def title(self) -> FrameworkTitle:
         return self.__title
 
+    @property
+    def concurrent_iterations(self) -> int:
+        """
+        Returns:
+            The maximum number of benchmark iterations to run at the same time, see :meth:`fork`.
+        """
+
+        return self.__concurrent_iterations
+
+    @property
+    def latency_histogram(self) -> LatencyHistogram:
+        """
+        Returns:
+            The latencies of the calls to :meth:`rateIntents` during the last call to
+            :meth:`benchmark` of this instance. Empty if all ratings were cached.
+        """
+
+        return self.__latency_histogram
+
+    @property
+    def resource_usage(self) -> Dict[LifecycleStage, ResourceUsage]:
+        """
+        Returns:
+            The resources used in each lifecycle stage, summed over all times the stage was entered
+            since the last call to :meth:`resetResourceUsage`, including the stages of forks. See
+            :class:`~nlutestframework.resource_monitor.ResourceMonitor`.
+        """
+
+        return self.__resource_usage
+
+    def resetResourceUsage(self) -> None:
+        """
+        Reset the resources used, see :attr:`resource_usage`.
+        """
+
+        # Clear in place, forks share the dictionary
+        self.__resource_usage.clear()
+
+    @property
+    def _model_artifact_store(self) -> Optional[ModelArtifactStore]:
+        """
+        Returns:
+            The store for trained models, or :obj:`None` if the model cache is disabled. See
+            :attr:`~nlutestframework.global_config.GlobalConfig.model_cache`.
+        """
+
+        return self.__model_artifact_store
+
     # Asynchronous replacement for the usual __init__ constructor
     @classmethod
     async def create(
@@ -55,7 +146,23 @@ class NLUFramework(HasLogger):
             global_config: Global configuration for the whole test framework.
             framework_config: A dictionary containing configuration options specific to this
                 :class:`NLUFramework` implementation. See the specific implementation of
-                :meth:`construct` for more details.
+                :meth:`construct` for more details. Additionally, the following options are
+                supported by all implementations:
+
+                - ``max_concurrent_ratings``: The maximum number of calls to :meth:`rateIntents`
+                  that are in flight at the same time while rating a batch of sentences using the
+                  default implementation of :meth:`rateIntentsBatch`. Defaults to 1, which means
+                  that the sentences are rated one after another.
+                - ``executor``: The executor to run CPU-bound work in, see :meth:`_runCPUBound`.
+                  Either "thread" or "process". Defaults to "thread".
+                - ``executor_workers``: The maximum number of workers of the executors. Defaults to
+                  :obj:`None`, which uses the defaults of the
+                  :class:`~concurrent.futures.ThreadPoolExecutor` and the
+                  :class:`~concurrent.futures.ProcessPoolExecutor`.
+                - ``concurrent_iterations``: The maximum number of benchmark iterations to run at
+                  the same time. Only supported by implementations that set
+                  :attr:`SUPPORTS_CONCURRENT_ITERATIONS`. Defaults to 1.
+
             title: The title of this framework.
 
         Returns:
@@ -66,10 +173,255 @@ class NLUFramework(HasLogger):
         """
 
         instance = cls()
-        instance.__title = title # pylint: disable=protected-access
-        await instance.construct(global_config, **framework_config)
+        framework_config = instance.__initialize(global_config, framework_config, title)
+
+        try:
+            async with instance.stage(LifecycleStage.CONSTRUCT):
+                await instance.construct(global_config, **framework_config)
+        except BaseException:
+            instance.__shutdownExecutors() # pylint: disable=protected-access
+            raise
+
         return instance
 
+    # Called on the new instance by create, which pylint doesn't recognize as a use
+    def __initialize( # pylint: disable=unused-private-member
+        self,
+        global_config: GlobalConfig,
+        framework_config: Dict[str, JSONSerializable],
+        title: FrameworkTitle
+    ) -> Dict[str, JSONSerializable]:
+        """
+        Set up the state held by the base class, see :meth:`create`.
+
+        Returns:
+            The framework configuration without the options handled by the base class.
+
+        Raises:
+            :exc:`TypeError`: if an option handled by the base class is malformed.
+        """
+
+        # Don't modify the dictionary passed by the caller
+        framework_config = dict(framework_config)
+
+        max_concurrent_ratings = framework_config.pop("max_concurrent_ratings", 1)
+        if not isinstance(max_concurrent_ratings, int) or max_concurrent_ratings < 1:
+            raise TypeError("max_concurrent_ratings must be a positive integer.")
+
+        executor_type = framework_config.pop("executor", "thread")
+        if executor_type not in [ "thread", "process" ]:
+            raise TypeError("The executor must be specified as either thread or process.")
+
+        executor_workers = framework_config.pop("executor_workers", None)
+        if executor_workers is not None and (
+            not isinstance(executor_workers, int) or executor_workers < 1
+        ):
+            raise TypeError("executor_workers must be a positive integer.")
+
+        concurrent_iterations = framework_config.pop("concurrent_iterations", 1)
+        if not isinstance(concurrent_iterations, int) or concurrent_iterations < 1:
+            raise TypeError("concurrent_iterations must be a positive integer.")
+
+        if concurrent_iterations > 1 and not self.SUPPORTS_CONCURRENT_ITERATIONS:
+            raise TypeError(
+                "{} does not support concurrent iterations.".format(type(self).__name__)
+            )
+
+        rating_cache = None
+        if global_config.rating_cache is not None and not global_config.ignore_cache:
+            rating_cache = RatingCache(global_config.rating_cache)
+
+        model_artifact_store = None
+        if global_config.model_cache is not None and not global_config.ignore_cache:
+            model_artifact_store = ModelArtifactStore(
+                global_config.model_cache,
+                global_config.model_cache_size * 1024 * 1024
+            )
+
+        self.__title = title
+        self.__rating_semaphore = asyncio.Semaphore(max_concurrent_ratings)
+        self.__rating_cache = rating_cache
+        self.__model_artifact_store = model_artifact_store
+        self.__executor_type = executor_type
+        self.__executor_workers = executor_workers
+        self.__blocking_executor = ThreadPoolExecutor(
+            max_workers        = executor_workers,
+            thread_name_prefix = title
+        )
+        self.__cpu_bound_executor = None
+        self.__concurrent_iterations = concurrent_iterations
+        self.__latency_histogram = LatencyHistogram()
+        self.__resource_usage = {}
+        if rating_cache is not None:
+            self.__config_fingerprint = fingerprint_json({
+                "class"  : "{}.{}".format(type(self).__module__, type(self).__qualname__),
+                "config" : framework_config
+            })
+
+        return framework_config
+
+    async def destroy(self) -> None:
+        """
+        Destruct the framework (see :meth:`destruct`) and release the resources held by the base
+        class, like the executors. Counterpart of :meth:`create`.
+        """
+
+        try:
+            async with self.stage(LifecycleStage.DESTRUCT):
+                await self.destruct()
+        finally:
+            self.__shutdownExecutors()
+
+    def __shutdownExecutors(self) -> None:
+        # Don't wait for running work to finish, that would block the event loop
+        self.__blocking_executor.shutdown(wait=False)
+
+        if self.__cpu_bound_executor is not None:
+            self.__cpu_bound_executor.shutdown(wait=False)
+            self.__cpu_bound_executor = None
+
+    def fork(self) -> "NLUFramework":
+        """
+        Create another instance of this framework that shares the configuration, the prepared data
+        set and the executors with this instance, but is trained independently. Used to run
+        multiple benchmark iterations at the same time, only called if
+        :attr:`SUPPORTS_CONCURRENT_ITERATIONS` is set. Forks are trained and cleaned up, but neither
+        constructed, prepared, unprepared nor destructed.
+
+        The default implementation returns a shallow copy of this instance. Implementations that
+        keep mutable per-training state in shared objects have to override this method.
+
+        Returns:
+            The fork.
+        """
+
+        return copy.copy(self)
+
+    @contextlib.asynccontextmanager
+    async def stage(
+        self,
+        stage: LifecycleStage,
+        data_set_title: Optional[DataSetTitle] = None
+    ) -> AsyncIterator[None]:
+        """
+        Mark this framework as being in a lifecycle stage for the duration of the context. Used to
+        attribute a blocked event loop to the framework and stage that blocked it, see
+        :class:`~nlutestframework.loop_lag_monitor.LoopLagMonitor`, to measure the resources used
+        in each stage, see :attr:`resource_usage`, and to profile selected stages, see
+        :class:`~nlutestframework.stage_profiler.StageProfiler`. Publishes a
+        :class:`~nlutestframework.events.StageStarted` and a
+        :class:`~nlutestframework.events.StageFinished` event, see
+        :class:`~nlutestframework.event_bus.EventBus`.
+
+        Args:
+            stage: The lifecycle stage.
+            data_set_title: The title of the data set the stage belongs to, if any. Defaults to
+                :obj:`None`.
+        """
+
+        event_bus = EventBus.getInstance()
+        if event_bus.subscribed(StageStarted):
+            event_bus.publish(StageStarted(self.__title, data_set_title, stage))
+
+        resource_monitor = ResourceMonitor.getInstance()
+        measurement = resource_monitor.begin(self._resourceContainers())
+
+        try:
+            with LoopLagMonitor.getInstance().track(self, self.__title, stage):
+                with StageProfiler.getInstance().profile(self.__title, data_set_title, stage):
+                    yield
+        finally:
+            usage = resource_monitor.end(measurement, self._resourceContainers())
+
+            self.__resource_usage[stage] = self.__resource_usage.get(
+                stage,
+                ResourceUsage()
+            ).merge(usage)
+
+            if event_bus.subscribed(StageFinished):
+                event_bus.publish(StageFinished(self.__title, data_set_title, stage, usage))
+
+    def _resourceContainers(self) -> List[str]:
+        """
+        Frameworks that run in docker containers return the ids of the containers they use here,
+        so that the resources used by the containers are attributed to the framework, see
+        :class:`~nlutestframework.resource_monitor.ResourceMonitor`. The containers have to be
+        registered with the monitor using
+        :meth:`~nlutestframework.resource_monitor.ResourceMonitor.watchContainer`.
+
+        Returns:
+            The ids of the docker containers used by this framework. The default implementation
+            returns an empty list.
+        """
+
+        return []
+
+    @property
+    def _uses_process_executor(self) -> bool:
+        """
+        Returns:
+            Whether :meth:`_runCPUBound` runs the work in a separate process. If so, the function,
+            its arguments and its result have to be picklable.
+        """
+
+        return self.__executor_type == "process"
+
+    async def _runBlocking(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """
+        Run a blocking function, for example a call to a synchronous SDK or a file operation, in a
+        thread pool without blocking the event loop.
+
+        Args:
+            fn: The function to run.
+            *args: Positional arguments to pass to the function.
+            **kwargs: Keyword arguments to pass to the function.
+
+        Returns:
+            The return value of the function.
+        """
+
+        fn = ResourceMonitor.getInstance().wrap(StageProfiler.getInstance().wrap(fn))
+
+        return await asyncio.get_event_loop().run_in_executor(
+            self.__blocking_executor,
+            functools.partial(fn, *args, **kwargs)
+        )
+
+    async def _runCPUBound(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """
+        Run a CPU-bound function, like the training of an in-process model, in the executor
+        selected using the ``executor`` option (see :meth:`create`). If that is the process
+        executor, the function, its arguments and its result have to be picklable, see
+        :attr:`_uses_process_executor`.
+
+        Args:
+            fn: The function to run.
+            *args: Positional arguments to pass to the function.
+            **kwargs: Keyword arguments to pass to the function.
+
+        Returns:
+            The return value of the function.
+        """
+
+        if not self._uses_process_executor:
+            return await self._runBlocking(fn, *args, **kwargs)
+
+        # Starting the worker processes is expensive, only do so once they are required
+        if self.__cpu_bound_executor is None:
+            self.__cpu_bound_executor = ProcessPoolExecutor(max_workers=self.__executor_workers)
+
+        resource_monitor = ResourceMonitor.getInstance()
+
+        result, cpu_time, peak_rss = await asyncio.get_event_loop().run_in_executor(
+            self.__cpu_bound_executor,
+            functools.partial(resource_monitor.wrapForWorker(fn), *args, **kwargs)
+        )
+
+        # The worker processes are not visible to the resource monitor, they report their usage
+        resource_monitor.chargeWorker(cpu_time, peak_rss)
+
+        return result
+
     async def construct(
         self,
         global_config: GlobalConfig,
@@ -111,7 +463,7 @@ class NLUFramework(HasLogger):
         pass
 
     # pylint: disable=attribute-defined-outside-init
-    async def train(self, training_data: List[NLUDataEntry]) -> None:
+    async def train(self, training_data: Sequence[NLUDataEntry]) -> None:
         """
         Args:
             training_data: The data to train on. Must not be empty.
@@ -130,6 +482,75 @@ class NLUFramework(HasLogger):
 
         raise NotImplementedError("To be implemented by subclasses.")
 
+    async def rateIntentsBatch(self, sentences: List[str]) -> List[NLUIntentRating]:
+        """
+        Rate multiple sentences at once. The default implementation calls :meth:`rateIntents` for
+        each sentence, see :meth:`_rateConcurrently`. Implementations that are able to rate multiple
+        sentences with less overhead can override this method, and should report the latency of
+        each rating using :meth:`_recordLatency`.
+
+        Args:
+            sentences: The sentences to find intents and entities for.
+
+        Returns:
+            The intent rating information as returned by the framework, one entry for each sentence
+            in the same order as the sentences.
+        """
+
+        return await self._rateConcurrently(self.rateIntents, sentences)
+
+    async def _rateConcurrently(
+        self,
+        rate: Callable[[str], Awaitable[NLUIntentRating]],
+        sentences: List[str]
+    ) -> List[NLUIntentRating]:
+        """
+        Rate multiple sentences by calling a rating method once per sentence, keeping at most
+        ``max_concurrent_ratings`` calls in flight at the same time.
+
+        Args:
+            rate: The method to rate a single sentence with.
+            sentences: The sentences to find intents and entities for.
+
+        Returns:
+            The ratings, one entry for each sentence in the same order as the sentences.
+        """
+
+        event_bus = EventBus.getInstance()
+        publish = event_bus.subscribed(SentenceRated)
+
+        async def rate_bounded(sentence: str) -> NLUIntentRating:
+            async with self.__rating_semaphore:
+                # Only the rating itself is timed, not the time spent waiting for the semaphore
+                start = time.perf_counter_ns()
+                rating = await rate(sentence)
+                latency = time.perf_counter_ns() - start
+
+                self.__latency_histogram.record(latency)
+                if publish:
+                    event_bus.publish(SentenceRated(self.__title, rating, latency))
+
+                return rating
+
+        return list(await asyncio.gather(*map(rate_bounded, sentences)))
+
+    def _recordLatency(self, nanoseconds: int, rating: Optional[NLUIntentRating] = None) -> None:
+        """
+        Record the latency of a single rating, see :attr:`latency_histogram`, and publish a
+        :class:`~nlutestframework.events.SentenceRated` event. Ratings done via
+        :meth:`_rateConcurrently` are recorded automatically.
+
+        Args:
+            nanoseconds: The latency of the rating, as measured using :func:`time.perf_counter_ns`.
+            rating: The rating. Defaults to :obj:`None`.
+        """
+
+        self.__latency_histogram.record(nanoseconds)
+
+        event_bus = EventBus.getInstance()
+        if event_bus.subscribed(SentenceRated):
+            event_bus.publish(SentenceRated(self.__title, rating, nanoseconds))
+
     async def cleanupTraining(self) -> None:
         """
         Perform cleanup on the NLU framework. For example, this can include resetting the framework
@@ -138,10 +559,71 @@ class NLUFramework(HasLogger):
 
         raise NotImplementedError("To be implemented by subclasses.")
 
-    async def __validate(self, validation_data: List[NLUDataEntry]) -> ConfusionMatrix:
+    def _ratingCacheVariant(self) -> JSONSerializable:
+        """
+        Ratings are cached per framework class and configuration, see
+        :attr:`~nlutestframework.global_config.GlobalConfig.rating_cache`. Implementations whose
+        ratings depend on additional state which is not part of the configuration have to return
+        that state here, so that it becomes part of the cache key.
+
+        Returns:
+            Additional state that influences the ratings. Defaults to :obj:`None`.
+        """
+
+        return None
+
+    def __ratingCacheKey(
+        self,
+        data_set: NLUDataSet,
+        training_data: Sequence[NLUDataEntry]
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Returns:
+            The framework fingerprint and the training data fingerprint to look up cached ratings
+            with, or :obj:`None` if the rating cache is disabled.
+        """
+
+        if self.__rating_cache is None:
+            return None
+
+        return (
+            fingerprint_json([ self.__config_fingerprint, self._ratingCacheVariant() ]),
+            fingerprint_training_data(data_set.language, training_data)
+        )
+
+    async def __rate(
+        self,
+        sentences: List[str],
+        cached_ratings: Dict[str, NLUIntentRating]
+    ) -> List[NLUIntentRating]:
         """
         Args:
-            validation_data: The data to validate the NLU framework against. Must not be empty.
+            sentences: The sentences to rate.
+            cached_ratings: Ratings that don't have to be requested from the framework again.
+
+        Returns:
+            The ratings, one entry for each sentence in the same order as the sentences.
+        """
+
+        missing_ratings = iter(await self.rateIntentsBatch([
+            sentence for sentence in sentences if sentence not in cached_ratings
+        ]))
+
+        return [
+            cached_ratings[sentence] if sentence in cached_ratings else next(missing_ratings)
+            for sentence
+            in sentences
+        ]
+
+    @staticmethod
+    def __toConfusionMatrix(
+        validation_data: Sequence[NLUDataEntry],
+        ratings: List[NLUIntentRating]
+    ) -> ConfusionMatrix:
+        """
+        Args:
+            validation_data: The data the NLU framework was validated against.
+            ratings: The ratings of the validation data, in the same order.
 
         Returns:
             The validation results encoded in a confusion matrix.
@@ -149,25 +631,29 @@ class NLUFramework(HasLogger):
 
         confusion_matrix: ConfusionMatrix = {}
 
-        for datum in validation_data:
+        for datum, rating in zip(validation_data, ratings):
             confusion_matrix[datum.intent] = confusion_matrix.get(datum.intent, {})
-
-            rating = await self.rateIntents(datum.sentence)
-
             confusion_matrix[datum.intent][rating.detected_intent] = (
                 confusion_matrix[datum.intent].get(rating.detected_intent, 0) + 1
             )
 
         return confusion_matrix
 
-    async def benchmark(self, data_set: NLUDataSet) -> ConfusionMatrix:
+    async def benchmark(
+        self,
+        data_set: NLUDataSet,
+        split: Optional[NLUDataSplit] = None
+    ) -> ConfusionMatrix:
         """
         Benchmark this NLU framework on the given data. This method starts by training the
         framework, followed by measuring the performance of the framework and finished by cleaning
-        up whatever needs to be cleaned.
+        up whatever needs to be cleaned. If the rating cache is enabled and all ratings are cached,
+        the framework is neither trained nor asked for ratings.
 
         Args:
             data_set: The data set to benchmark on.
+            split: The split of the data set into training and validation data to use. Defaults to
+                the current split of the data set.
 
         Returns:
             The validation results encoded in a confusion matrix.
@@ -179,11 +665,44 @@ class NLUFramework(HasLogger):
             data_set.title
         )
 
-        try:
-            await self.train(data_set.training_data)
-            performance = await self.__validate(data_set.validation_data)
-        finally:
-            # Guarantee the cleanup
-            await self.cleanupTraining()
+        if split is None:
+            split = data_set.current_split
+
+        # Forked instances share the histogram of the original until they benchmark for the first
+        # time, replace it to only collect the latencies of this iteration
+        self.__latency_histogram = LatencyHistogram()
+
+        training_data   = split.training_data
+        validation_data = split.validation_data
+        sentences       = [ datum.sentence for datum in validation_data ]
+
+        cache_key = self.__ratingCacheKey(data_set, training_data)
+
+        cached_ratings: Dict[str, NLUIntentRating] = {}
+        if self.__rating_cache is not None and cache_key is not None:
+            cached_ratings = await self._runBlocking(self.__rating_cache.load, *cache_key)
+
+        if cache_key is not None and all(sentence in cached_ratings for sentence in sentences):
+            self._logger.info("All ratings are cached, skipping the training.")
+
+            ratings = [ cached_ratings[sentence] for sentence in sentences ]
+        else:
+            try:
+                async with self.stage(LifecycleStage.TRAIN, data_set.title):
+                    await self.train(training_data)
+
+                async with self.stage(LifecycleStage.VALIDATION, data_set.title):
+                    ratings = await self.__rate(sentences, cached_ratings)
+            finally:
+                # Guarantee the cleanup
+                async with self.stage(LifecycleStage.CLEANUP_TRAINING, data_set.title):
+                    await self.cleanupTraining()
+
+            if self.__rating_cache is not None and cache_key is not None:
+                await self._runBlocking(
+                    self.__rating_cache.store,
+                    *cache_key,
+                    dict(zip(sentences, ratings))
+                )
 
-        return performance
+        return self.__toConfusionMatrix(validation_data, ratings)
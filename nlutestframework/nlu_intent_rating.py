@@ -1,8 +1,12 @@
+from .serializable import Serializable
+
 # Other imports only for the type hints
-from typing import List, Tuple
-from .types import Intent
+from typing import List, Tuple, TypeVar, Type
+from .types import Intent, JSONSerializable
+
+T = TypeVar("T", bound="NLUIntentRating")
 
-class NLUIntentRating:
+class NLUIntentRating(Serializable):
     def __init__(self, sentence: str, rated_intents: List[Tuple[Intent, float]]):
         """
         Args:
@@ -38,6 +42,16 @@ class NLUIntentRating:
 
         return self.__sorted_intents[0][0]
 
+    @property
+    def confidence(self) -> float:
+        """
+        Returns:
+            The confidence of the intent that was rated by the NLU framework with highest
+            confidence.
+        """
+
+        return self.__sorted_intents[0][1]
+
     def noneIfBelow(self, threshold: float) -> None:
         """
         Replace the best-rated intent with the None-intent, if the confidence of the best-rated
@@ -52,6 +66,18 @@ class NLUIntentRating:
             # ...prepend the None-intent and full confidence to the rating list.
             self.__sorted_intents.insert(0, (None, 1.0))
 
+    def serialize(self) -> JSONSerializable:
+        return {
+            "sentence"      : self.__sentence,
+            "rated_intents" : [ [ intent, rating ] for intent, rating in self.__sorted_intents ]
+        }
+
+    @classmethod
+    def fromSerialized(cls: Type[T], serialized: JSONSerializable) -> T:
+        return cls(serialized["sentence"], [ # type: ignore
+            (intent, rating) for intent, rating in serialized["rated_intents"] # type: ignore
+        ])
+
     def __str__(self) -> str:
         intents = ""
 
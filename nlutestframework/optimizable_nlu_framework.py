@@ -2,6 +2,8 @@ from .intent_threshold_optimizer import IntentThresholdOptimizer
 from .nlu_framework import NLUFramework
 
 # Other imports only for the type hints
+from typing import List
+from .types import JSONSerializable
 from .nlu_data_set import NLUDataSet
 from .nlu_intent_rating import NLUIntentRating
 
@@ -10,8 +12,10 @@ class OptimizableNLUFramework(NLUFramework):
     Base class for NLU frameworks that need a threshold-based implementation of the None-intent.
     Beware that some of the method names you have to implement differ from
     :class:`~nlutestframework.nlu_framework.NLUFramework`, namely :meth:`_prepareDataSet`
-    (was: :meth:`~nlutestframework.nlu_framework.NLUFramework.prepareDataSet`) and
-    :meth:`_rateIntents` (was: :meth:`~nlutestframework.nlu_framework.NLUFramework.rateIntents`).
+    (was: :meth:`~nlutestframework.nlu_framework.NLUFramework.prepareDataSet`),
+    :meth:`_rateIntents` (was: :meth:`~nlutestframework.nlu_framework.NLUFramework.rateIntents`)
+    and :meth:`_rateIntentsBatch`
+    (was: :meth:`~nlutestframework.nlu_framework.NLUFramework.rateIntentsBatch`).
     """
 
     # pylint: disable=arguments-differ
@@ -34,9 +38,11 @@ class OptimizableNLUFramework(NLUFramework):
                 during a few additional training iterations.
             optimizer_iterations: The number of iterations to repeat and average the threshold
                 optimization. Defaults to 5.
-            optimizer_grid_search_step_size: The step size for the grid search over the threshold.
-                The optimal threshold is searched for in a window from 0 to 1, so a step size of
-                e.g. 0.01 means that 100 different values are tested.
+            optimizer_grid_search_step_size: The optimal threshold is searched for exactly in a
+                window from 0 to 1, see :meth:`IntentThresholdOptimizer.optimize
+                <nlutestframework.intent_threshold_optimizer.IntentThresholdOptimizer.optimize>`.
+                This step size only controls the resolution of the logged and plotted F1 scores,
+                e.g. a step size of 0.01 means that 100 different values are shown.
         """
 
         self.__intent_threshold = intent_threshold
@@ -82,3 +88,28 @@ class OptimizableNLUFramework(NLUFramework):
         """
 
         raise NotImplementedError("To be implemented by subclasses.")
+
+    def _ratingCacheVariant(self) -> JSONSerializable:
+        # The ratings depend on the (possibly optimized) threshold
+        return { "intent_threshold": self.__intent_threshold }
+
+    async def rateIntentsBatch(self, sentences: List[str]) -> List[NLUIntentRating]:
+        ratings = await self._rateIntentsBatch(sentences)
+
+        for rating in ratings:
+            rating.noneIfBelow(self.__intent_threshold)
+
+        return ratings
+
+    async def _rateIntentsBatch(self, sentences: List[str]) -> List[NLUIntentRating]:
+        """
+        Args:
+            sentences: The sentences to find intents and entities for.
+
+        Returns:
+            The intent rating information as returned by the framework, one entry for each sentence
+            in the same order as the sentences. The default implementation calls
+            :meth:`_rateIntents` for each sentence.
+        """
+
+        return await self._rateConcurrently(self._rateIntents, sentences)
@@ -0,0 +1,207 @@
+import html
+import io
+
+# Other imports only for the type hints
+from typing import Any, List, Mapping, Optional, Sequence
+
+# The supported output formats of :func:`save_figure`
+FORMATS = ("png", "svg", "html")
+
+def performance_chart(
+    title: str,
+    intents: Sequence[str],
+    scores: Mapping[str, Sequence[Optional[float]]]
+) -> Any:
+    """
+    Draw the F1 scores of multiple frameworks per intent. The intents are laid out vertically and
+    the chart grows with the number of intents, which keeps the labels of data sets with hundreds of
+    intents readable.
+
+    Args:
+        title: The title of the chart.
+        intents: The labels of the intents.
+        scores: The F1 scores of each framework, by framework title, in the order of the intents.
+            Missing scores are given as :obj:`None`.
+
+    Returns:
+        The :class:`matplotlib.figure.Figure` containing the chart.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+    from matplotlib.figure import Figure
+
+    # Figures are created without pyplot, which doesn't involve any GUI backend or global state
+    fig = Figure(figsize=(8, max(4., 0.2 * len(intents) + 1.5)))
+    ax  = fig.add_subplot()
+
+    positions = np.arange(len(intents))
+
+    for framework_title, framework_scores in scores.items():
+        values = np.array([ np.nan if x is None else x for x in framework_scores ], dtype=float)
+        ax.plot(values, positions, marker="o", markersize=3, label=framework_title)
+
+    ax.set_yticks(positions)
+    ax.set_yticklabels(intents)
+    ax.set_ylim(len(intents) - 0.5, -0.5)
+    ax.set_xlim(0, 100)
+    ax.set_xlabel("F1 score * 100")
+    ax.set_ylabel("Intents")
+    ax.set_title(title)
+    ax.grid(axis="x", alpha=0.3)
+    ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
+
+    return fig
+
+def threshold_chart(
+    title: str,
+    thresholds: Sequence[float],
+    means: Sequence[float],
+    variances: Sequence[float]
+) -> Any:
+    """
+    Draw the mean F1 score over all intents as a function of the intent threshold.
+
+    Args:
+        title: The title of the chart.
+        thresholds: The thresholds, in ascending order.
+        means: The mean F1 score for each threshold.
+        variances: The variance of the F1 score for each threshold.
+
+    Returns:
+        The :class:`matplotlib.figure.Figure` containing the chart.
+    """
+
+    from matplotlib.figure import Figure # pylint: disable=import-outside-toplevel
+
+    fig = Figure(figsize=(8, 5))
+    ax  = fig.add_subplot()
+
+    ax.errorbar(
+        thresholds,
+        means,
+        yerr=variances,
+        capsize=5,
+        capthick=2,
+        errorevery=max(len(thresholds) // 20, 1)
+    )
+
+    ax.set_ylim(bottom=0)
+    ax.set_ylabel("F1 score * 100 (mean over all iterations)")
+    ax.set_xlabel("threshold")
+    ax.set_title(title)
+
+    return fig
+
+def load_test_chart(
+    title: str,
+    throughputs: Mapping[str, Sequence[float]],
+    medians: Mapping[str, Sequence[Optional[float]]],
+    tails: Mapping[str, Sequence[Optional[float]]],
+    saturation_points: Mapping[str, Optional[int]]
+) -> Any:
+    """
+    Draw the latency of multiple frameworks as a function of their throughput, one curve per
+    framework with one point per load level.
+
+    Args:
+        title: The title of the chart.
+        throughputs: The achieved throughput of each framework in requests per second, by framework
+            title, one entry per load level.
+        medians: The median latency in milliseconds at each load level, by framework title.
+            Missing latencies are given as :obj:`None`.
+        tails: The 99th percentile of the latency in milliseconds at each load level, by framework
+            title. Missing latencies are given as :obj:`None`.
+        saturation_points: The index of the load level at which each framework saturated, by
+            framework title, or :obj:`None` if no saturation point was found.
+
+    Returns:
+        The :class:`matplotlib.figure.Figure` containing the chart.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 5))
+    ax  = fig.add_subplot()
+
+    for framework_title, framework_throughputs in throughputs.items():
+        p50 = np.array([ np.nan if x is None else x for x in medians[framework_title] ], float)
+        p99 = np.array([ np.nan if x is None else x for x in tails[framework_title] ], float)
+
+        line, = ax.plot(framework_throughputs, p99, marker="o", label="{} (p99)".format(
+            framework_title
+        ))
+
+        ax.plot(
+            framework_throughputs,
+            p50,
+            marker="o",
+            linestyle="--",
+            color=line.get_color(),
+            label="{} (p50)".format(framework_title)
+        )
+
+        saturation_point = saturation_points.get(framework_title, None)
+        if saturation_point is not None:
+            ax.plot(
+                [ framework_throughputs[saturation_point] ],
+                [ p99[saturation_point] ],
+                marker="*",
+                markersize=15,
+                color=line.get_color()
+            )
+
+    ax.set_yscale("log")
+    ax.set_xlim(left=0)
+    ax.set_xlabel("Throughput (requests per second)")
+    ax.set_ylabel("Latency (ms)")
+    ax.set_title(title)
+    ax.grid(alpha=0.3)
+    ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
+
+    return fig
+
+def save_figure(fig: Any, path: str, formats: Sequence[str]) -> List[str]:
+    """
+    Save a figure using the non-interactive Agg backend, which works without a display.
+
+    Args:
+        fig: The :class:`matplotlib.figure.Figure` to save.
+        path: The path to save the figure to, without file extension.
+        formats: The formats to save the figure in, any of :data:`FORMATS`. HTML files embed the
+            figure as SVG.
+
+    Returns:
+        The paths of the files written.
+
+    Raises:
+        :exc:`ValueError`: if a format is not supported.
+        :exc:`OSError`: if a file could not be written.
+    """
+
+    paths = []
+
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError("Unsupported chart format \"{}\".".format(fmt))
+
+        file_path = "{}.{}".format(path, fmt)
+
+        if fmt == "html":
+            svg = io.StringIO()
+            fig.savefig(svg, format="svg", bbox_inches="tight")
+
+            title = html.escape(fig.axes[0].get_title() if len(fig.axes) > 0 else "")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n")
+                f.write("<title>{}</title>\n</head>\n<body>\n".format(title))
+                f.write(svg.getvalue()[svg.getvalue().find("<svg"):])
+                f.write("\n</body>\n</html>\n")
+        else:
+            fig.savefig(file_path, format=fmt, bbox_inches="tight")
+
+        paths.append(file_path)
+
+    return paths
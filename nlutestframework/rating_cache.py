@@ -0,0 +1,125 @@
+import json
+import os
+import uuid
+
+from .has_logger import HasLogger
+from .nlu_intent_rating import NLUIntentRating
+
+# Other imports only for the type hints
+from typing import Dict
+
+class RatingCache(HasLogger):
+    """
+    A persistent, content-addressed cache for intent ratings. Ratings are stored per framework
+    configuration and per training data set, both identified by their fingerprints (see
+    :mod:`nlutestframework.fingerprint`), and are looked up by the rated sentence.
+
+    The cache is organized as one JSON file per combination of framework fingerprint and training
+    data fingerprint: ``<directory>/<framework fingerprint>/<training data fingerprint>.json``.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: The directory to store the cached ratings in. User directory references and
+                environment variables are expanded. The directory is created if it doesn't exist.
+
+        Raises:
+            :exc:`OSError`: if the directory could not be created.
+        """
+
+        super().__init__()
+
+        self.__directory = os.path.abspath(os.path.expandvars(os.path.expanduser(directory)))
+
+        os.makedirs(self.__directory, exist_ok=True)
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    def __path(self, framework_fingerprint: str, training_fingerprint: str) -> str:
+        return os.path.join(
+            self.__directory,
+            framework_fingerprint,
+            "{}.json".format(training_fingerprint)
+        )
+
+    def load(
+        self,
+        framework_fingerprint: str,
+        training_fingerprint: str
+    ) -> Dict[str, NLUIntentRating]:
+        """
+        Args:
+            framework_fingerprint: The fingerprint of the framework class and its configuration.
+            training_fingerprint: The fingerprint of the training data.
+
+        Returns:
+            A mapping from sentences to their cached ratings. Empty, if nothing was cached yet or if
+            loading the cache failed.
+        """
+
+        path = self.__path(framework_fingerprint, training_fingerprint)
+
+        if not os.path.isfile(path):
+            return {}
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                serialized = json.load(f)
+
+            return {
+                sentence: NLUIntentRating.fromSerialized(rating)
+                for sentence, rating
+                in serialized.items()
+            }
+        except BaseException as e: # pylint: disable=broad-except
+            self._logger.warning("Error loading cached ratings", exc_info=e)
+            return {}
+
+    def store(
+        self,
+        framework_fingerprint: str,
+        training_fingerprint: str,
+        ratings: Dict[str, NLUIntentRating]
+    ) -> None:
+        """
+        Add ratings to the cache. Ratings that were cached before are kept.
+
+        Args:
+            framework_fingerprint: The fingerprint of the framework class and its configuration.
+            training_fingerprint: The fingerprint of the training data.
+            ratings: A mapping from sentences to their ratings.
+
+        Raises:
+            :exc:`OSError`: if storing the ratings fails.
+        """
+
+        path = self.__path(framework_fingerprint, training_fingerprint)
+
+        merged = self.load(framework_fingerprint, training_fingerprint)
+        merged.update(ratings)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temporary file first and replace the cache file afterwards, so that the cache
+        # file is never left in a partially written state. Unlike tempfile.mkstemp, os.open applies
+        # the umask to the permissions of the new file, so that the cache can be shared.
+        temp_path = "{}.{}.tmp".format(path, uuid.uuid4().hex)
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({
+                    sentence: rating.serialize()
+                    for sentence, rating
+                    in merged.items()
+                }, f)
+
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def __str__(self) -> str:
+        return "Rating cache in \"{}\".".format(self.__directory)
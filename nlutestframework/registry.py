@@ -0,0 +1,103 @@
+import importlib
+import logging
+
+# Other imports only for the type hints
+from typing import Any, Dict, List, NamedTuple
+
+class Registry(NamedTuple):
+    """
+    A kind of pluggable classes, like NLU frameworks or data sets.
+    """
+
+    # The name of the entry point group that third-party packages register their classes in
+    group: str
+
+    # The classes included in this library, by short name
+    builtins: Dict[str, str]
+
+FRAMEWORKS = Registry("nlutestframework.frameworks", {
+    "Dialogflow" : (
+        "nlutestframework.implementations.dialogflow_nlu_framework:DialogflowNLUFramework"
+    ),
+    "LUIS"       : "nlutestframework.implementations.luis_nlu_framework:LUISNLUFramework",
+    "Rasa"       : "nlutestframework.implementations.rasa_nlu_framework:RasaNLUFramework",
+    "Snips"      : "nlutestframework.implementations.snips_nlu_framework:SnipsNLUFramework"
+})
+
+DATA_SETS = Registry("nlutestframework.data_sets", {
+    "JSONL"      : "nlutestframework.implementations.jsonl_data_set:JSONLDataSet",
+    "SimpleJSON" : "nlutestframework.implementations.simple_json_data_set:SimpleJSONDataSet"
+})
+
+def _entry_points(group: str) -> List[Any]:
+    """
+    Args:
+        group: The entry point group.
+
+    Returns:
+        The entry points of all installed packages in the group, not loaded yet.
+    """
+
+    try:
+        from importlib import metadata # pylint: disable=import-outside-toplevel
+    except ImportError:
+        # importlib.metadata was added in Python 3.8, fall back to pkg_resources of setuptools
+        try:
+            import pkg_resources # pylint: disable=import-outside-toplevel
+        except ImportError:
+            logging.getLogger("Registry").warning(
+                "Neither importlib.metadata nor pkg_resources is available, classes registered in"
+                " the entry point group \"%s\" can't be looked up by their short names.",
+                group
+            )
+            return []
+
+        return list(pkg_resources.iter_entry_points(group))
+
+    entry_points = metadata.entry_points()
+
+    # The selection interface was added in Python 3.10
+    if hasattr(entry_points, "select"):
+        return list(entry_points.select(group=group))
+
+    return list(entry_points.get(group, []))
+
+def resolve_class(name: str, registry: Registry) -> Any:
+    """
+    Import and return a class by name. Only the module containing the class is imported, which
+    keeps the SDKs of unused implementations from being loaded.
+
+    Args:
+        name: Either the short name of a class in the registry (e.g. "Rasa"), or the full name of
+            a class, either as "package.module.Class" or as "package.module:Class".
+        registry: The registry to look short names up in. Short names of classes included in this
+            library are resolved first, followed by the entry points of the registry's group.
+
+    Returns:
+        The class.
+
+    Raises:
+        :exc:`ValueError`: if a short name is not registered.
+        :exc:`ImportError`: if the module containing the class could not be imported.
+        :exc:`AttributeError`: if the module doesn't contain the class.
+    """
+
+    if name in registry.builtins:
+        name = registry.builtins[name]
+    elif ":" not in name and "." not in name:
+        for entry_point in _entry_points(registry.group):
+            if entry_point.name == name:
+                return entry_point.load()
+
+        raise ValueError("No class named \"{}\" is registered in \"{}\".".format(
+            name,
+            registry.group
+        ))
+
+    # Split at the colon or the last dot, which should result in the module name and the class name
+    if ":" in name:
+        module, class_name = name.split(":", 1)
+    else:
+        module, class_name = name.rsplit(".", 1)
+
+    return getattr(importlib.import_module(module), class_name)
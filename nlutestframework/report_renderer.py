@@ -0,0 +1,253 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+import multiprocessing
+import os
+import re
+
+from .has_logger import HasLogger
+from . import plotting
+
+# Other imports only for the type hints
+from typing import Any, Callable, ClassVar, List, Mapping, Optional, Sequence
+
+def _render(
+    draw: Callable[..., Any],
+    path: str,
+    formats: Sequence[str],
+    *args: Any
+) -> List[str]:
+    """
+    Draw and save a chart. Runs in the worker process.
+    """
+
+    return plotting.save_figure(draw(*args), path, formats)
+
+class ReportRenderer(HasLogger):
+    """
+    Renders charts into files in a separate worker process, so that neither the event loop nor the
+    reporting of results ever wait for matplotlib. Charts are rendered with the non-interactive Agg
+    backend, which also works on machines without a display.
+
+    Only plain data is sent to the worker. Charts that are requested while the renderer is not
+    running are skipped.
+    """
+
+    __instance: ClassVar["ReportRenderer"]
+
+    @classmethod
+    def getInstance(cls) -> "ReportRenderer":
+        """
+        Returns:
+            The singleton instance of this class.
+        """
+
+        try:
+            return cls.__instance
+        except AttributeError:
+            cls.__instance = cls()
+            return cls.__instance
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.__executor: Optional[ProcessPoolExecutor] = None
+        self.__directory = ""
+        self.__formats: List[str] = []
+        self.__pending: List["Future[List[str]]"] = []
+
+    @property
+    def running(self) -> bool:
+        return self.__executor is not None
+
+    @property
+    def directory(self) -> str:
+        """
+        Returns:
+            The directory charts are written to, empty if the renderer is not running.
+        """
+
+        return self.__directory
+
+    def start(self, directory: str, formats: Sequence[str] = ("png",)) -> None:
+        """
+        Start the worker process. Does nothing if the renderer is running already.
+
+        Args:
+            directory: The directory to write the charts to. Created if it doesn't exist.
+            formats: The formats to write each chart in, any of "png", "svg" and "html". Defaults to
+                PNG only.
+
+        Raises:
+            :exc:`ValueError`: if a format is not supported.
+            :exc:`OSError`: if the directory could not be created.
+        """
+
+        if self.running:
+            return
+
+        for fmt in formats:
+            if fmt not in plotting.FORMATS:
+                raise ValueError("Unsupported chart format \"{}\".".format(fmt))
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.__directory = directory
+        self.__formats   = list(formats)
+
+        # Spawn instead of forking, the benchmarking process runs threads which must not be forked
+        self.__executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        Stop the worker process.
+
+        Args:
+            wait: A boolean indicating whether to wait for all pending charts to be rendered.
+                Defaults to True. This call blocks while waiting, run it in an executor when called
+                from the event loop.
+        """
+
+        if self.__executor is None:
+            return
+
+        if wait and len(self.__pending) > 0:
+            self._logger.info("Waiting for %d chart(s) to render...", len(self.__pending))
+
+        self.__executor.shutdown(wait=wait)
+        self.__executor = None
+        self.__directory = ""
+
+    def renderPerformances(
+        self,
+        name: str,
+        title: str,
+        intents: Sequence[str],
+        scores: Mapping[str, Sequence[Optional[float]]]
+    ) -> Optional["Future[List[str]]"]:
+        """
+        Render the F1 scores of multiple frameworks per intent, see
+        :func:`~nlutestframework.plotting.performance_chart`.
+
+        Args:
+            name: The file name of the chart, without extension.
+            title: The title of the chart.
+            intents: The labels of the intents.
+            scores: The F1 scores of each framework, by framework title, in the order of the
+                intents. Missing scores are given as :obj:`None`.
+
+        Returns:
+            A future resolving to the paths of the written files, or :obj:`None` if the renderer is
+            not running.
+        """
+
+        return self.__submit(
+            plotting.performance_chart,
+            name,
+            title,
+            list(intents),
+            { key: list(value) for key, value in scores.items() }
+        )
+
+    def renderThresholdSweep(
+        self,
+        name: str,
+        title: str,
+        thresholds: Sequence[float],
+        means: Sequence[float],
+        variances: Sequence[float]
+    ) -> Optional["Future[List[str]]"]:
+        """
+        Render the mean F1 score as a function of the intent threshold, see
+        :func:`~nlutestframework.plotting.threshold_chart`.
+
+        Args:
+            name: The file name of the chart, without extension.
+            title: The title of the chart.
+            thresholds: The thresholds, in ascending order.
+            means: The mean F1 score for each threshold.
+            variances: The variance of the F1 score for each threshold.
+
+        Returns:
+            A future resolving to the paths of the written files, or :obj:`None` if the renderer is
+            not running.
+        """
+
+        return self.__submit(
+            plotting.threshold_chart,
+            name,
+            title,
+            list(thresholds),
+            list(means),
+            list(variances)
+        )
+
+    def renderLoadTest(
+        self,
+        name: str,
+        title: str,
+        throughputs: Mapping[str, Sequence[float]],
+        medians: Mapping[str, Sequence[Optional[float]]],
+        tails: Mapping[str, Sequence[Optional[float]]],
+        saturation_points: Mapping[str, Optional[int]]
+    ) -> Optional["Future[List[str]]"]:
+        """
+        Render the latency of multiple frameworks as a function of their throughput, see
+        :func:`~nlutestframework.plotting.load_test_chart`.
+
+        Args:
+            name: The file name of the chart, without extension.
+            title: The title of the chart.
+            throughputs: The achieved throughput of each framework at each load level.
+            medians: The median latency in milliseconds of each framework at each load level.
+            tails: The 99th percentile of the latency in milliseconds of each framework at each
+                load level.
+            saturation_points: The index of the load level at which each framework saturated.
+
+        Returns:
+            A future resolving to the paths of the written files, or :obj:`None` if the renderer is
+            not running.
+        """
+
+        return self.__submit(
+            plotting.load_test_chart,
+            name,
+            title,
+            { key: list(value) for key, value in throughputs.items() },
+            { key: list(value) for key, value in medians.items() },
+            { key: list(value) for key, value in tails.items() },
+            dict(saturation_points)
+        )
+
+    def __submit(
+        self,
+        draw: Callable[..., Any],
+        name: str,
+        *args: Any
+    ) -> Optional["Future[List[str]]"]:
+        if self.__executor is None:
+            self._logger.debug("Not rendering chart \"%s\", the renderer is not running.", name)
+            return None
+
+        # Replace characters that are not safe to use in file names
+        path = os.path.join(self.__directory, re.sub(r"[^\w.-]+", "_", name))
+
+        future = self.__executor.submit(_render, draw, path, self.__formats, *args)
+
+        self.__pending.append(future)
+        future.add_done_callback(self.__done)
+
+        return future
+
+    def __done(self, future: "Future[List[str]]") -> None:
+        self.__pending.remove(future)
+
+        if future.cancelled():
+            return
+
+        exception = future.exception()
+        if exception is None:
+            self._logger.debug("Rendered %s", ", ".join(future.result()))
+        else:
+            self._logger.warning("Error rendering a chart", exc_info=exception)
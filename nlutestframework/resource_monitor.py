@@ -0,0 +1,518 @@
+import contextvars
+import functools
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:
+    # The resource module is only available on Unix
+    resource = None # type: ignore
+
+from .has_logger import HasLogger
+
+# Other imports only for the type hints
+from typing import (
+    Any, Callable, ClassVar, Dict, Iterable, NamedTuple, Optional, Set, Tuple, TypeVar
+)
+from .lifecycle_stage import LifecycleStage
+
+R = TypeVar("R") # pylint: disable=invalid-name
+
+class ResourceUsage(NamedTuple):
+    """
+    The resources used during one or more lifecycle stages of a framework. Times are summed and
+    memory peaks are maximized when merging the usage of multiple stages, see :meth:`merge`.
+    """
+
+    # The elapsed time in seconds
+    wall_time: float = 0.
+
+    # The user and system CPU time used by the framework in seconds, see ResourceMonitor
+    cpu_time: float = 0.
+
+    # The peak resident set size of the benchmarking process in bytes, None if not available
+    peak_rss: Optional[int] = None
+
+    # The peak resident set size of the worker processes of the process executor in bytes, None if
+    # not used or not available
+    worker_peak_rss: Optional[int] = None
+
+    # The CPU time of the docker containers used by the framework in seconds, None if not applicable
+    container_cpu_time: Optional[float] = None
+
+    # The peak memory usage of the docker containers used by the framework in bytes, None if not
+    # applicable
+    container_peak_memory: Optional[int] = None
+
+    # Whether other stages, of other frameworks or of forks, ran at the same time. If so, the CPU
+    # time of the event loop is not included and the peak RSS of the process is shared with them.
+    overlapped: bool = False
+
+    def merge(self, other: "ResourceUsage") -> "ResourceUsage":
+        """
+        Args:
+            other: The usage to merge with this usage.
+
+        Returns:
+            The combined usage of both.
+        """
+
+        def add(a: Optional[float], b: Optional[float]) -> Optional[float]:
+            return b if a is None else a if b is None else a + b
+
+        def peak(a: Optional[int], b: Optional[int]) -> Optional[int]:
+            return b if a is None else a if b is None else max(a, b)
+
+        return ResourceUsage(
+            wall_time             = self.wall_time + other.wall_time,
+            cpu_time              = self.cpu_time + other.cpu_time,
+            peak_rss              = peak(self.peak_rss, other.peak_rss),
+            worker_peak_rss       = peak(self.worker_peak_rss, other.worker_peak_rss),
+            container_cpu_time    = add(self.container_cpu_time, other.container_cpu_time),
+            container_peak_memory = peak(self.container_peak_memory, other.container_peak_memory),
+            overlapped            = self.overlapped or other.overlapped
+        )
+
+    def summary(self) -> str:
+        """
+        Returns:
+            The usage in a human-readable form.
+        """
+
+        parts = [ "wall {:.1f}s".format(self.wall_time), "CPU {:.1f}s".format(self.cpu_time) ]
+
+        if self.peak_rss is not None:
+            parts.append("peak RSS {}".format(self.formatBytes(self.peak_rss)))
+
+        if self.worker_peak_rss is not None:
+            parts.append("worker peak RSS {}".format(self.formatBytes(self.worker_peak_rss)))
+
+        if self.container_cpu_time is not None:
+            parts.append("container CPU {:.1f}s".format(self.container_cpu_time))
+
+        if self.container_peak_memory is not None:
+            parts.append("container peak memory {}".format(
+                self.formatBytes(self.container_peak_memory)
+            ))
+
+        if self.overlapped:
+            parts.append("overlapped with other stages")
+
+        return ", ".join(parts)
+
+    def toDict(self) -> Dict[str, Any]:
+        """
+        Returns:
+            The usage in a JSON-serializable form, which restores the usage when passed as keyword
+            arguments.
+        """
+
+        return {
+            "wall_time"             : self.wall_time,
+            "cpu_time"              : self.cpu_time,
+            "peak_rss"              : self.peak_rss,
+            "worker_peak_rss"       : self.worker_peak_rss,
+            "container_cpu_time"    : self.container_cpu_time,
+            "container_peak_memory" : self.container_peak_memory,
+            "overlapped"            : self.overlapped
+        }
+
+    @staticmethod
+    def mergeStages(
+        usage: Dict[LifecycleStage, "ResourceUsage"],
+        other: Dict[LifecycleStage, "ResourceUsage"]
+    ) -> None:
+        """
+        Args:
+            usage: The usage by lifecycle stage to merge the other usage into. Modified in place.
+            other: The usage by lifecycle stage to merge. Not modified.
+        """
+
+        for stage, stage_usage in other.items():
+            usage[stage] = usage.get(stage, ResourceUsage()).merge(stage_usage)
+
+    @staticmethod
+    def formatBytes(num_bytes: int) -> str:
+        """
+        Args:
+            num_bytes: A number of bytes.
+
+        Returns:
+            The number in a human-readable form, using the largest fitting unit of kB, MB and GB.
+        """
+
+        if num_bytes < 1024 ** 2:
+            return "{:.1f}kB".format(num_bytes / 1024)
+
+        if num_bytes < 1024 ** 3:
+            return "{:.1f}MB".format(num_bytes / 1024 ** 2)
+
+        return "{:.2f}GB".format(num_bytes / 1024 ** 3)
+
+class ResourceMeasurement:
+    """
+    An ongoing measurement, see :meth:`ResourceMonitor.begin`. Opaque to users of the monitor.
+    """
+
+    def __init__(self, container_cpu: Dict[str, int]) -> None:
+        self.wall_time = time.perf_counter()
+        self.cpu_time  = time.thread_time()
+        self.max_rss   = ResourceMonitor.maxRSS()
+        self.peak_rss  = ResourceMonitor.currentRSS()
+
+        # The CPU time of the work run in executor threads and worker processes during the
+        # measurement, and the peak RSS of the worker processes
+        self.executor_cpu_time = 0.
+        self.worker_peak_rss: Optional[int] = None
+
+        # Whether other measurements were active at the same time
+        self.overlapped = False
+
+        # Restores the previous measurement of the context, see ResourceMonitor.end
+        self.token: Optional["contextvars.Token[Optional[ResourceMeasurement]]"] = None
+
+        # The cumulative CPU time of each container in nanoseconds when the measurement began
+        self.container_cpu = container_cpu
+
+        # The peak memory usage of each container since the measurement began
+        self.container_peaks: Dict[str, int] = {}
+
+# The measurement of the stage the current task is in, if any
+_current_measurement: "contextvars.ContextVar[Optional[ResourceMeasurement]]" = \
+    contextvars.ContextVar("current_measurement", default=None)
+
+def _measure_in_worker(
+    fn: Callable[..., R],
+    *args: Any,
+    **kwargs: Any
+) -> Tuple[R, float, Optional[int]]:
+    """
+    Run a function in a worker process of the process executor, see
+    :meth:`ResourceMonitor.wrapForWorker`.
+
+    Returns:
+        The return value of the function, the CPU time used by the worker process while running it
+        and the peak RSS of the worker process since it started.
+    """
+
+    # Worker processes run one function at a time, the CPU time of the process belongs to it
+    cpu_time = time.process_time()
+    result = fn(*args, **kwargs)
+
+    return result, time.process_time() - cpu_time, ResourceMonitor.maxRSS()
+
+class ResourceMonitor(HasLogger):
+    """
+    Measures the resources used during the lifecycle stages of the frameworks, see
+    :meth:`~nlutestframework.nlu_framework.NLUFramework.stage`.
+
+    The CPU time of a stage is the CPU time of the thread running the event loop while the stage is
+    active, plus the CPU time of the functions the framework runs in its executors during the
+    stage, see :meth:`~nlutestframework.nlu_framework.NLUFramework._runBlocking` and
+    :meth:`~nlutestframework.nlu_framework.NLUFramework._runCPUBound`. The executor threads are
+    measured per thread and the worker processes of the process executor per function, so that
+    this part is attributed to the right framework even if frameworks run at the same time. The
+    event loop is shared though: if other stages, of other frameworks or of forks (see
+    :meth:`~nlutestframework.nlu_framework.NLUFramework.fork`), are active at the same time, the
+    stage is marked as overlapped and the CPU time of the event loop is left out.
+
+    The peak resident set size (RSS) of the benchmarking process is process-wide, overlapped stages
+    share it. The RSS is sampled every few milliseconds by a background thread, short peaks may be
+    missed unless they raise the peak RSS of the whole process. The RSS is only available on Linux.
+    The peak RSS of the worker processes of the process executor is reported separately, since
+    their start.
+
+    Frameworks that run in docker containers report the ids of their containers (see
+    :meth:`~nlutestframework.nlu_framework.NLUFramework._resourceContainers`), whose CPU time and
+    memory usage are taken from the statistics the Docker daemon publishes about once per second.
+    Containers have to be registered using :meth:`watchContainer` first.
+    """
+
+    __instance: ClassVar["ResourceMonitor"]
+
+    # The interval in seconds to sample the RSS of the process in
+    SAMPLING_INTERVAL = 0.02
+
+    @classmethod
+    def getInstance(cls) -> "ResourceMonitor":
+        """
+        Returns:
+            The singleton instance of this class.
+        """
+
+        try:
+            return cls.__instance
+        except AttributeError:
+            cls.__instance = cls()
+            return cls.__instance
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.__lock = threading.Lock()
+        self.__active: Set[ResourceMeasurement] = set()
+        self.__sampler: Optional[threading.Thread] = None
+
+        # The latest cumulative CPU time in nanoseconds and memory usage in bytes of each container
+        self.__containers: Dict[str, Tuple[int, int]] = {}
+
+    @staticmethod
+    def currentRSS() -> Optional[int]:
+        """
+        Returns:
+            The current resident set size of this process in bytes, or :obj:`None` if not available
+            on this platform.
+        """
+
+        try:
+            with open("/proc/self/statm", "r", encoding="ascii") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError, AttributeError):
+            return None
+
+    @staticmethod
+    def maxRSS() -> Optional[int]:
+        """
+        Returns:
+            The peak resident set size of this process since it started in bytes, or :obj:`None` if
+            not available on this platform.
+        """
+
+        if resource is None:
+            return None
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # The peak RSS is given in bytes on macOS and in kilobytes everywhere else
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+    def begin(self, container_ids: Iterable[str] = ()) -> ResourceMeasurement:
+        """
+        Begin measuring the resources used, in the thread running the event loop. The measurement
+        becomes the current one of the context (i.e. the task), which the executor work is charged
+        to. End the measurement using :meth:`end`, in the same context.
+
+        Args:
+            container_ids: The ids of the docker containers to measure.
+
+        Returns:
+            The measurement.
+        """
+
+        with self.__lock:
+            measurement = ResourceMeasurement({
+                container_id: self.__containers[container_id][0]
+                for container_id in container_ids
+                if container_id in self.__containers
+            })
+
+            # The event loop and the process are shared with the other active measurements
+            if len(self.__active) > 0:
+                measurement.overlapped = True
+                for other in self.__active:
+                    other.overlapped = True
+
+            self.__active.add(measurement)
+
+            if self.__sampler is None:
+                self.__sampler = threading.Thread(
+                    target=self.__sample,
+                    name="ResourceMonitor",
+                    daemon=True
+                )
+                self.__sampler.start()
+
+        measurement.token = _current_measurement.set(measurement)
+
+        return measurement
+
+    def end(
+        self,
+        measurement: ResourceMeasurement,
+        container_ids: Iterable[str] = ()
+    ) -> ResourceUsage:
+        """
+        End a measurement.
+
+        Args:
+            measurement: The measurement, as returned by :meth:`begin`.
+            container_ids: The ids of the docker containers to measure. Containers that were not
+                passed to :meth:`begin` are measured from the time they started.
+
+        Returns:
+            The resources used since the measurement began.
+        """
+
+        if measurement.token is not None:
+            _current_measurement.reset(measurement.token)
+            measurement.token = None
+
+        cpu_time = time.thread_time() - measurement.cpu_time
+
+        with self.__lock:
+            self.__active.discard(measurement)
+
+            cpu_time = measurement.executor_cpu_time + (0. if measurement.overlapped else cpu_time)
+
+            containers = [ x for x in container_ids if x in self.__containers ]
+
+            container_cpu_time: Optional[float] = None
+            container_peak_memory: Optional[int] = None
+            if len(containers) > 0:
+                container_cpu_time = sum(
+                    self.__containers[x][0] - measurement.container_cpu.get(x, 0)
+                    for x in containers
+                ) / 1e9
+
+                container_peak_memory = sum(
+                    measurement.container_peaks.get(x, self.__containers[x][1])
+                    for x in containers
+                )
+
+        peak_rss = measurement.peak_rss
+        current_rss = self.currentRSS()
+        if peak_rss is not None and current_rss is not None:
+            peak_rss = max(peak_rss, current_rss)
+
+        # If the peak RSS of the process grew, the new peak was reached during this measurement
+        max_rss = self.maxRSS()
+        if peak_rss is not None and max_rss is not None and max_rss > (measurement.max_rss or 0):
+            peak_rss = max(peak_rss, max_rss)
+
+        return ResourceUsage(
+            wall_time             = time.perf_counter() - measurement.wall_time,
+            cpu_time              = cpu_time,
+            peak_rss              = peak_rss,
+            worker_peak_rss       = measurement.worker_peak_rss,
+            container_cpu_time    = container_cpu_time,
+            container_peak_memory = container_peak_memory,
+            overlapped            = measurement.overlapped
+        )
+
+    def wrap(self, fn: Callable[..., R]) -> Callable[..., R]:
+        """
+        Args:
+            fn: A function that is about to be run in an executor thread.
+
+        Returns:
+            The function, wrapped to charge the CPU time of the thread running it to the current
+            measurement, if any.
+        """
+
+        measurement = _current_measurement.get()
+        if measurement is None:
+            return fn
+
+        @functools.wraps(fn)
+        def measured(*args: Any, **kwargs: Any) -> R:
+            cpu_time = time.thread_time()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                cpu_time = time.thread_time() - cpu_time
+
+                with self.__lock:
+                    measurement.executor_cpu_time += cpu_time
+
+        return measured
+
+    @staticmethod
+    def wrapForWorker(fn: Callable[..., R]) -> Callable[..., Tuple[R, float, Optional[int]]]:
+        """
+        Args:
+            fn: A picklable function that is about to be run in a worker process of the process
+                executor.
+
+        Returns:
+            A picklable function that runs the function and returns its return value along with the
+            resources used by the worker process. Pass these to :meth:`chargeWorker`.
+        """
+
+        return functools.partial(_measure_in_worker, fn)
+
+    def chargeWorker(self, cpu_time: float, peak_rss: Optional[int]) -> None:
+        """
+        Charge the resources used by a worker process to the current measurement, if any.
+
+        Args:
+            cpu_time: The CPU time used by the worker process in seconds.
+            peak_rss: The peak RSS of the worker process in bytes, if available.
+        """
+
+        measurement = _current_measurement.get()
+        if measurement is None:
+            return
+
+        with self.__lock:
+            measurement.executor_cpu_time += cpu_time
+
+            if peak_rss is not None:
+                measurement.worker_peak_rss = max(measurement.worker_peak_rss or 0, peak_rss)
+
+    def __sample(self) -> None:
+        while True:
+            rss = self.currentRSS()
+
+            with self.__lock:
+                # Stop sampling while there are no measurements
+                if len(self.__active) == 0:
+                    self.__sampler = None
+                    return
+
+                if rss is not None:
+                    for measurement in self.__active:
+                        measurement.peak_rss = max(measurement.peak_rss or 0, rss)
+
+            time.sleep(self.SAMPLING_INTERVAL)
+
+    def watchContainer(self, container: Any) -> None:
+        """
+        Start collecting the statistics of a docker container in a background thread, until the
+        container stops. Does nothing if the container is watched already.
+
+        Args:
+            container: The :class:`docker.models.containers.Container`.
+        """
+
+        with self.__lock:
+            if container.id in self.__containers:
+                return
+
+            self.__containers[container.id] = (0, 0)
+
+        threading.Thread(
+            target=self.__watch,
+            args=(container,),
+            name="ResourceMonitor-{}".format(container.short_id),
+            daemon=True
+        ).start()
+
+    def __watch(self, container: Any) -> None:
+        try:
+            # The stream yields the statistics about once per second and ends with the container
+            for stats in container.stats(decode=True, stream=True):
+                memory_stats = stats.get("memory_stats", {})
+
+                # Exclude the page cache, like the docker CLI does
+                memory = memory_stats.get("usage", 0) - memory_stats.get("stats", {}).get(
+                    "inactive_file",
+                    memory_stats.get("stats", {}).get("cache", 0)
+                )
+                cpu = stats["cpu_stats"]["cpu_usage"]["total_usage"]
+
+                with self.__lock:
+                    self.__containers[container.id] = (cpu, memory)
+
+                    for measurement in self.__active:
+                        measurement.container_peaks[container.id] = max(
+                            measurement.container_peaks.get(container.id, 0),
+                            memory
+                        )
+        except Exception as e: # pylint: disable=broad-except
+            self._logger.debug("Stopped collecting statistics of container %s: %s", container.id, e)
+        finally:
+            with self.__lock:
+                self.__containers.pop(container.id, None)
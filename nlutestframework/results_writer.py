@@ -0,0 +1,421 @@
+import json
+import logging
+import os
+
+import numpy as np
+
+from .dense_confusion_matrix import DenseConfusionMatrix
+from .has_logger import HasLogger
+from .intent_codebook import IntentCodebook
+from .latency_histogram import LatencyHistogram
+from .lifecycle_stage import LifecycleStage
+from .nlu_data_set import NLUDataSetSummary
+from .resource_monitor import ResourceUsage
+
+# Other imports only for the type hints
+from typing import Any, Dict, List, NamedTuple, Optional, TextIO
+from .types import ConfusionMatrix, DataSetTitle, FrameworkTitle
+
+class RunResults(NamedTuple):
+    """
+    The results of a benchmark run, as read by :meth:`ResultsWriter.read`.
+    """
+
+    # The summaries of the data sets, in the order they were benchmarked on
+    data_sets: List[NLUDataSetSummary]
+
+    # The confusion matrix of each framework on each data set, for each iteration
+    iterations: List[Dict[DataSetTitle, Dict[FrameworkTitle, ConfusionMatrix]]]
+
+    # The latencies of the ratings of each framework on each data set, for each iteration. Only
+    # contains the results that latencies were recorded for.
+    latencies: List[Dict[DataSetTitle, Dict[FrameworkTitle, LatencyHistogram]]]
+
+    # The resources used by each framework on each data set, for each lifecycle stage and summed
+    # over all iterations
+    resources: Dict[DataSetTitle, Dict[FrameworkTitle, Dict[LifecycleStage, ResourceUsage]]]
+
+    def completedIterations(
+        self,
+        data_set_title: DataSetTitle
+    ) -> Dict[FrameworkTitle, Dict[int, ConfusionMatrix]]:
+        """
+        Args:
+            data_set_title: The title of the data set.
+
+        Returns:
+            The results on the data set, by framework title and iteration index.
+        """
+
+        completed: Dict[FrameworkTitle, Dict[int, ConfusionMatrix]] = {}
+
+        for i, iteration in enumerate(self.iterations):
+            for framework_title, result in iteration.get(data_set_title, {}).items():
+                completed.setdefault(framework_title, {})[i] = result
+
+        return completed
+
+    def copyLatencies(
+        self,
+        num_iterations: int
+    ) -> List[Dict[DataSetTitle, Dict[FrameworkTitle, LatencyHistogram]]]:
+        """
+        Args:
+            num_iterations: The number of iterations to copy the latencies of. Missing iterations
+                are filled with empty dictionaries, further iterations are dropped.
+
+        Returns:
+            A copy of the latencies, which can be extended without modifying these results.
+        """
+
+        latencies: List[Dict[DataSetTitle, Dict[FrameworkTitle, LatencyHistogram]]] = [
+            {} for _ in range(num_iterations)
+        ]
+
+        for i, iteration in enumerate(self.latencies[:num_iterations]):
+            for data_set_title, framework_latencies in iteration.items():
+                latencies[i][data_set_title] = dict(framework_latencies)
+
+        return latencies
+
+    def copyResources(
+        self
+    ) -> Dict[DataSetTitle, Dict[FrameworkTitle, Dict[LifecycleStage, ResourceUsage]]]:
+        """
+        Returns:
+            A copy of the resources, which can be extended without modifying these results.
+        """
+
+        return {
+            data_set_title: {
+                framework_title: dict(usage)
+                for framework_title, usage in framework_resources.items()
+            }
+            for data_set_title, framework_resources in self.resources.items()
+        }
+
+class ResultsWriter(HasLogger):
+    """
+    Streams the results of a benchmark run to an append-only JSON Lines file in the run directory,
+    as soon as they are available. Each line is one self-contained record:
+
+    - ``{"type": "header", "version": ...}``, the first line of the file.
+    - ``{"type": "data_set", "title": ..., "language": ..., "intents": [...], "training_size":
+      ..., "validation_size": ..., "seed": ...}``, the summary of a data set, written before
+      benchmarking on it.
+    - ``{"type": "result", "data_set": ..., "framework": ..., "iteration": ..., "intents": [...],
+      "counts": [[...], ...], "latencies": {...}}``, the confusion matrix of one benchmark
+      iteration in dense form. The intents label the rows (expected) and columns (detected) of the
+      counts, the None-intent is stored as :obj:`None`. The optional latencies are the latencies of
+      the ratings, see :meth:`~nlutestframework.latency_histogram.LatencyHistogram.toDict`.
+    - ``{"type": "resources", "data_set": ..., "framework": ..., "stages": {...}}``, the resources
+      used by a framework on a data set, by lifecycle stage, see
+      :class:`~nlutestframework.resource_monitor.ResourceUsage`.
+
+    Later records replace earlier ones for the same data set (and framework and iteration), except
+    for the resources, which are summed up, so that the resources used by a resumed run include
+    those of the aborted run. Results can be analysed again without rerunning any framework, see
+    :meth:`~nlutestframework.nlu_benchmarker.NLUBenchmarker.reportFromRunDirectory`.
+    """
+
+    FILE_NAME = "results.jsonl"
+    VERSION   = 1
+
+    def __init__(self, run_directory: str):
+        """
+        Args:
+            run_directory: The directory of the run, see :meth:`createRunDirectory`. Created if it
+                doesn't exist. Results are appended to the file in this directory, if it exists
+                already.
+
+        Raises:
+            :exc:`OSError`: if the results file could not be opened.
+        """
+
+        super().__init__()
+
+        os.makedirs(run_directory, exist_ok=True)
+
+        self.__path = os.path.join(run_directory, self.FILE_NAME)
+
+        self.__truncateIncompleteLine()
+        # The file stays open until the writer is closed
+        self.__file: Optional[TextIO] = open( # pylint: disable=consider-using-with
+            self.__path,
+            "a",
+            encoding="utf-8"
+        )
+
+        if self.__file.tell() == 0:
+            self.__write({ "type": "header", "version": self.VERSION })
+
+    @staticmethod
+    def createRunDirectory(output_directory: str, name: str) -> str:
+        """
+        Create the directory of a new run. Runs never share a directory: if the directory exists
+        already, e.g. because another run started in the same second, a numeric suffix is appended
+        to the name.
+
+        Args:
+            output_directory: The directory to create the run directory in. Created if it doesn't
+                exist.
+            name: The name of the run directory.
+
+        Returns:
+            The path to the newly created run directory.
+
+        Raises:
+            :exc:`OSError`: if the directory could not be created.
+        """
+
+        os.makedirs(output_directory, exist_ok=True)
+
+        run_directory = os.path.join(output_directory, name)
+        suffix = 1
+        while True:
+            try:
+                os.mkdir(run_directory)
+                return run_directory
+            except FileExistsError:
+                suffix += 1
+                run_directory = os.path.join(output_directory, "{}_{}".format(name, suffix))
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def __truncateIncompleteLine(self) -> None:
+        """
+        Remove an incomplete last line, as left by a run that was killed while writing, so that new
+        records are not appended to it.
+        """
+
+        try:
+            f = open(self.__path, "r+b") # pylint: disable=consider-using-with
+        except FileNotFoundError:
+            return
+
+        with f:
+            size = f.seek(0, os.SEEK_END)
+
+            # Search backwards for the last line break, one block at a time
+            end = size
+            while end > 0:
+                start = max(end - 4096, 0)
+                f.seek(start)
+                block = f.read(end - start)
+
+                index = block.rfind(b"\n")
+                if index != -1:
+                    end = start + index + 1
+                    break
+
+                end = start
+
+            if end != size:
+                self._logger.warning("Removing the incomplete last line of %s.", self.__path)
+                f.truncate(end)
+
+    def __write(self, record: Dict[str, Any]) -> None:
+        if self.__file is None:
+            raise ValueError("The results writer is closed.")
+
+        # Each record is flushed on its own, so that a crash loses at most the record being written
+        self.__file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.__file.flush()
+
+    def writeDataSet(self, summary: NLUDataSetSummary) -> None:
+        """
+        Args:
+            summary: The summary of a data set that is about to be benchmarked on.
+
+        Raises:
+            :exc:`ValueError`: if the writer is closed.
+            :exc:`OSError`: if the record could not be written.
+        """
+
+        self.__write({
+            "type"            : "data_set",
+            "title"           : summary.title,
+            "language"        : summary.language,
+            # Sort the intents to make the files reproducible, with the None-intent first
+            "intents"         : sorted(summary.intents, key=lambda x: (x is not None, x or "")),
+            "training_size"   : summary.training_size,
+            "validation_size" : summary.validation_size,
+            "seed"            : summary.seed
+        })
+
+    def writeResult(
+        self,
+        data_set_title: DataSetTitle,
+        framework_title: FrameworkTitle,
+        iteration: int,
+        confusion_matrix: ConfusionMatrix,
+        latencies: Optional[LatencyHistogram] = None
+    ) -> None:
+        """
+        Args:
+            data_set_title: The title of the data set.
+            framework_title: The title of the framework.
+            iteration: The index of the iteration, starting at 0.
+            confusion_matrix: The result of the iteration.
+            latencies: The latencies of the ratings of the iteration, if recorded.
+
+        Raises:
+            :exc:`ValueError`: if the writer is closed.
+            :exc:`OSError`: if the record could not be written.
+        """
+
+        dense = DenseConfusionMatrix.fromConfusionMatrix(confusion_matrix)
+
+        record: Dict[str, Any] = {
+            "type"      : "result",
+            "data_set"  : data_set_title,
+            "framework" : framework_title,
+            "iteration" : iteration,
+            "intents"   : dense.codebook.intents,
+            "counts"    : dense.counts.tolist()
+        }
+
+        if latencies is not None:
+            record["latencies"] = latencies.toDict()
+
+        self.__write(record)
+
+    def writeResources(
+        self,
+        data_set_title: DataSetTitle,
+        framework_title: FrameworkTitle,
+        usage: Dict[LifecycleStage, ResourceUsage]
+    ) -> None:
+        """
+        Args:
+            data_set_title: The title of the data set.
+            framework_title: The title of the framework.
+            usage: The resources used by the framework on the data set, by lifecycle stage.
+
+        Raises:
+            :exc:`ValueError`: if the writer is closed.
+            :exc:`OSError`: if the record could not be written.
+        """
+
+        self.__write({
+            "type"      : "resources",
+            "data_set"  : data_set_title,
+            "framework" : framework_title,
+            "stages"    : { stage.value: x.toDict() for stage, x in usage.items() }
+        })
+
+    def close(self) -> None:
+        """
+        Close the results file. Does nothing if the writer is closed already.
+        """
+
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    @classmethod
+    def read(cls, run_directory: str) -> RunResults:
+        """
+        Args:
+            run_directory: The directory of the run.
+
+        Returns:
+            The results stored in the run directory. An incomplete last line, as left by a run that
+            was killed while writing, is ignored.
+
+        Raises:
+            :exc:`OSError`: if the results file could not be read.
+            :exc:`ValueError`: if the results file is malformed or of an unsupported version.
+        """
+
+        data_sets: Dict[DataSetTitle, NLUDataSetSummary] = {}
+        results: Dict[int, Dict[DataSetTitle, Dict[FrameworkTitle, ConfusionMatrix]]] = {}
+        latencies: Dict[int, Dict[DataSetTitle, Dict[FrameworkTitle, LatencyHistogram]]] = {}
+        resources: Dict[
+            DataSetTitle,
+            Dict[FrameworkTitle, Dict[LifecycleStage, ResourceUsage]]
+        ] = {}
+
+        path = os.path.join(run_directory, cls.FILE_NAME)
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().split("\n")
+
+        # A complete file ends with a line break, which leaves an empty string after the last line
+        if lines[-1] != "":
+            logging.getLogger(cls.__name__).warning(
+                "Ignoring the incomplete last line of %s.",
+                path
+            )
+        lines = lines[:-1]
+
+        for line_number, line in enumerate(lines, 1):
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError("Malformed record in line {} of {}.".format(
+                    line_number,
+                    path
+                )) from e
+
+            if record["type"] == "header":
+                if record["version"] != cls.VERSION:
+                    raise ValueError("Unsupported results file version {}.".format(
+                        record["version"]
+                    ))
+
+            if record["type"] == "data_set":
+                data_sets[record["title"]] = NLUDataSetSummary(
+                    title           = record["title"],
+                    language        = record["language"],
+                    intents         = frozenset(record["intents"]),
+                    training_size   = record["training_size"],
+                    validation_size = record["validation_size"],
+                    seed            = record.get("seed", None)
+                )
+
+            if record["type"] == "result":
+                dense = DenseConfusionMatrix(
+                    IntentCodebook(record["intents"]),
+                    np.array(record["counts"], dtype=np.int64)
+                )
+
+                results.setdefault(record["iteration"], {}).setdefault(
+                    record["data_set"],
+                    {}
+                )[record["framework"]] = dense.toConfusionMatrix()
+
+                iteration_latencies = latencies.setdefault(record["iteration"], {}).setdefault(
+                    record["data_set"],
+                    {}
+                )
+
+                # Replace the latencies of earlier records for the same result, if any
+                iteration_latencies.pop(record["framework"], None)
+                if "latencies" in record:
+                    iteration_latencies[record["framework"]] = LatencyHistogram.fromDict(
+                        record["latencies"]
+                    )
+
+            if record["type"] == "resources":
+                # Sum up the resources of earlier records, if any
+                ResourceUsage.mergeStages(
+                    resources.setdefault(record["data_set"], {}).setdefault(
+                        record["framework"],
+                        {}
+                    ),
+                    {
+                        LifecycleStage(stage): ResourceUsage(**usage)
+                        for stage, usage in record["stages"].items()
+                    }
+                )
+
+        num_iterations = max(results.keys(), default=-1) + 1
+
+        return RunResults(
+            data_sets  = list(data_sets.values()),
+            iterations = [ results.get(i, {}) for i in range(num_iterations) ],
+            latencies  = [ latencies.get(i, {}) for i in range(num_iterations) ],
+            resources  = resources
+        )
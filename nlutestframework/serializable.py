@@ -2,6 +2,9 @@
 from .types import JSONSerializable
 
 class Serializable:
+    # Allow subclasses to use __slots__
+    __slots__ = ()
+
     def serialize(self) -> JSONSerializable:
         """
         Returns:
@@ -0,0 +1,392 @@
+import contextlib
+import contextvars
+import cProfile
+from enum import Enum
+import functools
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+
+from .has_logger import HasLogger
+from .lifecycle_stage import LifecycleStage
+
+# Other imports only for the type hints
+from types import CodeType, FrameType
+from typing import (
+    Any, Callable, ClassVar, Dict, Iterator, List, Optional, Sequence, Set, Tuple, TypeVar
+)
+from .types import DataSetTitle, FrameworkTitle
+
+R = TypeVar("R") # pylint: disable=invalid-name
+
+class ProfilerMode(Enum):
+    """
+    The profilers available to the :class:`StageProfiler`.
+    """
+
+    # Samples the stacks of all threads in regular intervals and writes the number of samples per
+    # stack in the folded format (".folded"), which flamegraph.pl, inferno and speedscope accept
+    SAMPLING      = "sampling"
+
+    # Records every function call using cProfile and writes the statistics in the pstats format
+    # (".prof"), which snakeviz, tuna and flameprof accept
+    DETERMINISTIC = "deterministic"
+
+class _Profile:
+    """
+    The profile of one lifecycle stage of one framework on one data set, accumulated over all times
+    the stage was entered.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+        # The number of samples per folded stack, for the sampling profiler
+        self.stacks: Dict[str, int] = {}
+
+        # The statistics, for the deterministic profiler
+        self.stats: Optional[pstats.Stats] = None
+
+        # The profiles of the functions run in executor threads while the stage was active, for the
+        # deterministic profiler
+        self.thread_profiles: List[cProfile.Profile] = []
+
+# The profile of the stage the current task is in, if it is profiled deterministically
+_current_profile: "contextvars.ContextVar[Optional[_Profile]]" = contextvars.ContextVar(
+    "current_profile",
+    default=None
+)
+
+class StageProfiler(HasLogger):
+    """
+    Profiles selected lifecycle stages of selected frameworks, see
+    :meth:`~nlutestframework.nlu_framework.NLUFramework.stage`. One profile file is written per
+    framework, data set and stage, containing all times the stage was entered. The files are
+    rewritten each time a profiled stage ends, so that they are available while the benchmark is
+    still running.
+
+    The sampling profiler records the stacks of all threads, so that time spent in executor threads
+    (e.g. training an in-process model) and time spent waiting for a remote backend both show up.
+    Each stack starts with the name of its thread. Stages of other frameworks that run at the same
+    time are included in the samples.
+
+    The deterministic profiler records the thread that runs the event loop and the functions that
+    the framework runs in executor threads, see
+    :meth:`~nlutestframework.nlu_framework.NLUFramework._runBlocking`. Only one stage can be
+    profiled deterministically at a time, overlapping stages are skipped with a warning.
+
+    Neither profiler sees work done in other processes, like in the process executor or in docker
+    containers.
+    """
+
+    __instance: ClassVar["StageProfiler"]
+
+    # The interval in seconds to sample the stacks of all threads in
+    SAMPLING_INTERVAL = 0.005
+
+    @classmethod
+    def getInstance(cls) -> "StageProfiler":
+        """
+        Returns:
+            The singleton instance of this class.
+        """
+
+        try:
+            return cls.__instance
+        except AttributeError:
+            cls.__instance = cls()
+            return cls.__instance
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.__targets: Set[Tuple[FrameworkTitle, LifecycleStage]] = set()
+        self.__directory = ""
+        self.__mode = ProfilerMode.SAMPLING
+
+        self.__lock = threading.Lock()
+        self.__profiles: Dict[str, _Profile] = {}
+
+        # The profiles that are currently sampled, with the number of stages active for each
+        self.__sampled: Dict[_Profile, int] = {}
+        self.__sampler: Optional[threading.Thread] = None
+        self.__labels: Dict[CodeType, str] = {}
+
+        # The profile that is currently recorded deterministically, if any
+        self.__deterministic: Optional[_Profile] = None
+
+    @staticmethod
+    def parseTarget(target: str) -> Tuple[FrameworkTitle, LifecycleStage]:
+        """
+        Args:
+            target: A framework title and a lifecycle stage, separated by a colon, e.g.
+                "Snips:train". See :class:`~nlutestframework.lifecycle_stage.LifecycleStage` for
+                the names of the stages.
+
+        Returns:
+            The framework title and the lifecycle stage.
+
+        Raises:
+            :exc:`ValueError`: if the target is malformed or names an unknown stage.
+        """
+
+        framework_title, _, stage = target.rpartition(":")
+        if framework_title == "":
+            raise ValueError(
+                "Profiling targets must be given as framework:stage, got \"{}\".".format(target)
+            )
+
+        try:
+            return framework_title, LifecycleStage(stage)
+        except ValueError as e:
+            raise ValueError("Unknown lifecycle stage \"{}\", expected one of {}.".format(
+                stage,
+                ", ".join(x.value for x in LifecycleStage)
+            )) from e
+
+    @property
+    def running(self) -> bool:
+        return len(self.__targets) > 0
+
+    def start(
+        self,
+        targets: Sequence[str],
+        directory: str,
+        mode: ProfilerMode = ProfilerMode.SAMPLING
+    ) -> None:
+        """
+        Start profiling the given stages. Does nothing if no targets are given.
+
+        Args:
+            targets: The stages to profile, see :meth:`parseTarget`.
+            directory: The directory to write the profile files to. Created if it doesn't exist.
+            mode: The profiler to use. Defaults to the sampling profiler.
+
+        Raises:
+            :exc:`ValueError`: if a target is malformed.
+        """
+
+        parsed_targets = set(map(self.parseTarget, targets))
+        if len(parsed_targets) == 0:
+            return
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.__targets   = parsed_targets
+        self.__directory = directory
+        self.__mode      = mode
+
+        self._logger.info(
+            "Profiling %s using the %s profiler, writing the profiles to %s",
+            ", ".join(sorted(targets)),
+            mode.value,
+            directory
+        )
+
+    def stop(self) -> None:
+        """
+        Stop profiling. Stages that are being profiled still finish their profiles.
+        """
+
+        self.__targets = set()
+
+        with self.__lock:
+            self.__profiles = {}
+
+    @contextlib.contextmanager
+    def profile(
+        self,
+        framework_title: FrameworkTitle,
+        data_set_title: Optional[DataSetTitle],
+        stage: LifecycleStage
+    ) -> Iterator[None]:
+        """
+        Profile the duration of the context, if the stage of the framework is a target.
+
+        Args:
+            framework_title: The title of the framework.
+            data_set_title: The title of the data set the framework is prepared for, if any.
+            stage: The lifecycle stage.
+        """
+
+        if (framework_title, stage) not in self.__targets:
+            yield
+            return
+
+        profile = self.__getProfile(framework_title, data_set_title, stage)
+
+        if self.__mode is ProfilerMode.SAMPLING:
+            with self.__sample(profile):
+                yield
+        else:
+            with self.__record(profile):
+                yield
+
+    def __getProfile(
+        self,
+        framework_title: FrameworkTitle,
+        data_set_title: Optional[DataSetTitle],
+        stage: LifecycleStage
+    ) -> _Profile:
+        parts = [ framework_title ] + ([] if data_set_title is None else [ data_set_title ])
+        parts.append(stage.value)
+
+        file_name = "_".join(re.sub(r"[^\w.-]+", "-", part) for part in parts)
+        file_name += ".folded" if self.__mode is ProfilerMode.SAMPLING else ".prof"
+
+        with self.__lock:
+            return self.__profiles.setdefault(file_name, _Profile(
+                os.path.join(self.__directory, file_name)
+            ))
+
+    @contextlib.contextmanager
+    def __sample(self, profile: _Profile) -> Iterator[None]:
+        with self.__lock:
+            self.__sampled[profile] = self.__sampled.get(profile, 0) + 1
+
+            if self.__sampler is None:
+                self.__sampler = threading.Thread(
+                    target=self.__runSampler,
+                    name="StageProfiler",
+                    daemon=True
+                )
+                self.__sampler.start()
+
+        try:
+            yield
+        finally:
+            with self.__lock:
+                self.__sampled[profile] -= 1
+                if self.__sampled[profile] == 0:
+                    del self.__sampled[profile]
+
+                lines = [
+                    "{} {}\n".format(stack, count)
+                    for stack, count in sorted(profile.stacks.items())
+                ]
+
+            with open(profile.path, "w", encoding="utf-8") as f:
+                f.writelines(lines)
+
+    def __runSampler(self) -> None:
+        sampler_id = threading.get_ident()
+
+        while True:
+            with self.__lock:
+                # Stop sampling while there are no profiles to sample
+                if len(self.__sampled) == 0:
+                    self.__sampler = None
+                    return
+
+                profiles = list(self.__sampled)
+
+            thread_names = { thread.ident: thread.name for thread in threading.enumerate() }
+
+            # sys._current_frames is the documented way to inspect the stacks of other threads
+            stacks = [
+                self.__fold(thread_names.get(thread_id, str(thread_id)), frame)
+                for thread_id, frame in sys._current_frames().items() # pylint: disable=protected-access
+                if thread_id != sampler_id
+            ]
+
+            with self.__lock:
+                for profile in profiles:
+                    for stack in stacks:
+                        profile.stacks[stack] = profile.stacks.get(stack, 0) + 1
+
+            time.sleep(self.SAMPLING_INTERVAL)
+
+    def __fold(self, thread_name: str, frame: Optional[FrameType]) -> str:
+        """
+        Returns:
+            The stack of a thread in the folded format, outermost frame first. Semicolons separate
+            the frames and are therefore replaced in the labels of the frames.
+        """
+
+        labels = []
+        while frame is not None:
+            code  = frame.f_code
+            label = self.__labels.get(code, None)
+            if label is None:
+                label = "{} ({}:{})".format(code.co_name, code.co_filename, code.co_firstlineno)
+                label = self.__labels.setdefault(code, label.replace(";", ":"))
+
+            labels.append(label)
+            frame = frame.f_back
+
+        labels.append(thread_name.replace(";", ":"))
+
+        return ";".join(reversed(labels))
+
+    @contextlib.contextmanager
+    def __record(self, profile: _Profile) -> Iterator[None]:
+        with self.__lock:
+            if self.__deterministic is not None:
+                self._logger.warning(
+                    "Not profiling %s, another stage is being profiled deterministically already.",
+                    os.path.basename(profile.path)
+                )
+                busy = True
+            else:
+                self.__deterministic = profile
+                busy = False
+
+        if busy:
+            yield
+            return
+
+        token = _current_profile.set(profile)
+
+        loop_profile = cProfile.Profile()
+        loop_profile.enable()
+        try:
+            yield
+        finally:
+            loop_profile.disable()
+
+            _current_profile.reset(token)
+
+            with self.__lock:
+                self.__deterministic = None
+
+                if profile.stats is None:
+                    profile.stats = pstats.Stats(loop_profile)
+                else:
+                    profile.stats.add(loop_profile)
+
+                for thread_profile in profile.thread_profiles:
+                    profile.stats.add(thread_profile)
+                profile.thread_profiles = []
+
+                profile.stats.dump_stats(profile.path)
+
+    def wrap(self, fn: Callable[..., R]) -> Callable[..., R]:
+        """
+        Args:
+            fn: A function that is about to be run in an executor thread.
+
+        Returns:
+            The function, wrapped to be profiled if the current stage is profiled deterministically.
+            Since Python 3.12, cProfile records all threads, the function is returned unwrapped.
+        """
+
+        profile = _current_profile.get()
+        if profile is None or sys.version_info >= (3, 12):
+            return fn
+
+        @functools.wraps(fn)
+        def profiled(*args: Any, **kwargs: Any) -> R:
+            thread_profile = cProfile.Profile()
+            thread_profile.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                thread_profile.disable()
+
+                with self.__lock:
+                    profile.thread_profiles.append(thread_profile)
+
+        return profiled
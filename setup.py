@@ -32,16 +32,27 @@ setup(
         "console_scripts": [
             "nlutestframework=nlutestframework.__main__:main"
         ],
+        "nlutestframework.frameworks": [
+            "Dialogflow=nlutestframework.implementations.dialogflow_nlu_framework:DialogflowNLUFramework",
+            "LUIS=nlutestframework.implementations.luis_nlu_framework:LUISNLUFramework",
+            "Rasa=nlutestframework.implementations.rasa_nlu_framework:RasaNLUFramework",
+            "Snips=nlutestframework.implementations.snips_nlu_framework:SnipsNLUFramework"
+        ],
+        "nlutestframework.data_sets": [
+            "JSONL=nlutestframework.implementations.jsonl_data_set:JSONLDataSet",
+            "SimpleJSON=nlutestframework.implementations.simple_json_data_set:SimpleJSONDataSet"
+        ],
     },
     install_requires = [
         "snips-nlu>=0.20.0,<0.21",
         "dialogflow>=0.7.2,<0.8",
         "docker>=4.1.0,<5",
-        "requests>=2.22,<3",
         "matplotlib>=3.1.2,<4",
         "pyyaml>=5.1.2,<6",
         "azure-cognitiveservices-language-luis>=0.5.0,<0.6",
-        "langcodes>=1.4.1,<2"
+        "langcodes>=1.4.1,<2",
+        "numpy>=1.17,<3",
+        "aiohttp>=3.6,<4"
     ],
     python_requires = ">=3.7, <4",
     zip_safe = False,
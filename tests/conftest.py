@@ -0,0 +1,112 @@
+import asyncio
+import os
+
+import pytest
+
+from nlutestframework import GlobalConfig, NLUDataSplit, NLUFramework, NLUIntentRating
+
+script_directory  = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+corpora_directory = os.path.abspath(os.path.join(script_directory, "..", "data", "corpora"))
+
+class StubFramework(NLUFramework):
+    """
+    Doesn't learn anything and rates each sentence as the None-intent. Tests subclass it to override
+    the parts of the lifecycle they are interested in.
+    """
+
+    async def construct(self, global_config):
+        pass
+
+    async def train(self, training_data):
+        pass
+
+    async def rateIntents(self, sentence):
+        return NLUIntentRating(sentence, [ (None, 1.) ])
+
+    async def cleanupTraining(self):
+        pass
+
+class FixedDataSet:
+    """
+    Implements the parts of the NLUDataSet interface used by the benchmark and the threshold
+    optimizer. Each split consists of the same training and validation data.
+    """
+
+    def __init__(self, training_data, validation_data):
+        self.title = "Fixed"
+        self.language = "en"
+        self.training_data = training_data
+        self.validation_data = validation_data
+
+    def split(self):
+        return NLUDataSplit(self.training_data, self.validation_data)
+
+def benchmark(
+    framework_class,
+    framework_config,
+    training_data,
+    validation_data,
+    global_config=None
+):
+    """
+    Create a framework and benchmark it once on a :class:`FixedDataSet`. The global configuration
+    defaults to ignoring the cache.
+
+    Returns:
+        The confusion matrix and the framework.
+    """
+
+    if global_config is None:
+        global_config = GlobalConfig("python", 1, True)
+
+    async def run():
+        framework = await framework_class.create(
+            global_config,
+            framework_config,
+            framework_class.__name__
+        )
+
+        data_set = FixedDataSet(training_data, validation_data)
+
+        return await framework.benchmark(data_set, data_set.split()), framework
+
+    return asyncio.run(run())
+
+class BenchmarkSetup:
+    """
+    Builds benchmark configurations over the ChatbotCorpus which write their results to a temporary
+    output directory.
+    """
+
+    def __init__(self, output_directory):
+        self.output_directory = output_directory
+
+    def config(self, frameworks, iterations=2, **global_config):
+        # The benchmarker modifies the configuration, thus a new one is built for each run
+        return {
+            "global": {
+                "iterations": iterations,
+                "ignore_cache": True,
+                "output_directory": self.output_directory,
+                **global_config
+            },
+            "data_sets": {
+                "ChatbotCorpus": {
+                    "class": "SimpleJSON",
+                    "data_path": os.path.join(corpora_directory, "ChatbotCorpus.json"),
+                    "validation_percentage": 50
+                }
+            },
+            "frameworks": frameworks
+        }
+
+    def runDirectory(self):
+        # The directory of the first and only run so far
+        run_directories = os.listdir(self.output_directory)
+        assert len(run_directories) == 1
+
+        return os.path.join(self.output_directory, run_directories[0])
+
+@pytest.fixture
+def benchmark_setup(tmp_path):
+    return BenchmarkSetup(str(tmp_path))
@@ -0,0 +1,60 @@
+import time
+
+from conftest import StubFramework, benchmark
+from nlutestframework import NLUDataEntry, NLUIntentRating, OptimizableNLUFramework
+
+class PerSentenceFramework(OptimizableNLUFramework, StubFramework):
+    # Detects the first word of each sentence as the intent, with the confidence given by the last
+    # word. Keeps the default batch implementation, which rates each sentence on its own. The
+    # training lifecycle is taken from the stub.
+    async def construct(self, global_config, **kwargs):
+        await super().construct(**kwargs)
+
+        self.ratings = 0
+
+    async def _rateIntents(self, sentence):
+        self.ratings += 1
+
+        words = sentence.split()
+        return NLUIntentRating(sentence, [ (words[0], float(words[-1])) ])
+
+class BatchFramework(PerSentenceFramework):
+    # Rates all sentences in one go and reports the latencies itself
+    async def _rateIntentsBatch(self, sentences):
+        self.batches = getattr(self, "batches", 0) + 1
+
+        ratings = []
+        for sentence in sentences:
+            start = time.perf_counter_ns()
+            rating = await self._rateIntents(sentence)
+            self._recordLatency(time.perf_counter_ns() - start, rating)
+
+            ratings.append(rating)
+
+        return ratings
+
+TRAINING_DATA = [ NLUDataEntry("a 1", "a"), NLUDataEntry("b 1", "b") ]
+VALIDATION_DATA = [
+    NLUDataEntry("a 0.9", "a"),
+    NLUDataEntry("a 0.2", "a"),
+    NLUDataEntry("b 0.6", "a"),
+    NLUDataEntry("b 0.4", None)
+]
+
+def benchmarkWithThreshold(framework_class):
+    return benchmark(framework_class, { "intent_threshold": 0.5 }, TRAINING_DATA, VALIDATION_DATA)
+
+def test_DefaultAndOverriddenBatchAgree():
+    default_result, default_framework = benchmarkWithThreshold(PerSentenceFramework)
+    batch_result, batch_framework = benchmarkWithThreshold(BatchFramework)
+
+    # The threshold is applied to the ratings of both variants
+    assert default_result == { "a": { "a": 1, None: 1, "b": 1 }, None: { None: 1 } }
+    assert batch_result == default_result
+
+    assert batch_framework.batches == 1
+    assert default_framework.ratings == batch_framework.ratings == len(VALIDATION_DATA)
+
+    # Both variants record one latency per rating
+    assert default_framework.latency_histogram.count == len(VALIDATION_DATA)
+    assert batch_framework.latency_histogram.count == len(VALIDATION_DATA)
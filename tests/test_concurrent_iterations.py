@@ -0,0 +1,67 @@
+import asyncio
+import os
+
+from conftest import StubFramework, corpora_directory
+from nlutestframework import GlobalConfig, NLUBenchmarker, NLUIntentRating
+from nlutestframework.implementations import SimpleJSONDataSet
+
+class MemorizingFramework(StubFramework):
+    # Memorizes the training data and counts how many trainings overlap
+    SUPPORTS_CONCURRENT_ITERATIONS = True
+
+    async def construct(self, global_config, stats):
+        self.stats = stats
+
+    async def train(self, training_data):
+        self.stats["running"] += 1
+        self.stats["peak"] = max(self.stats["peak"], self.stats["running"])
+        self.stats["training_sets"].append(frozenset(x.sentence for x in training_data))
+
+        self.memory = { x.sentence: x.intent for x in training_data }
+
+        await asyncio.sleep(0.05)
+
+    async def rateIntents(self, sentence):
+        return NLUIntentRating(sentence, [ (self.memory.get(sentence, None), 1.) ])
+
+    async def cleanupTraining(self):
+        self.stats["running"] -= 1
+        del self.memory
+
+def benchmark(concurrent_iterations):
+    stats = { "running": 0, "peak": 0, "training_sets": [] }
+
+    async def run():
+        framework = await MemorizingFramework.create(
+            GlobalConfig("python", 4, True),
+            { "stats": stats, "concurrent_iterations": concurrent_iterations },
+            "Memorizing"
+        )
+
+        data_set = SimpleJSONDataSet(
+            "ChatbotCorpus",
+            os.path.join(corpora_directory, "ChatbotCorpus.json"),
+            50,
+            ignore_cache=True
+        )
+
+        await NLUBenchmarker.getInstance().run([ framework ], [ data_set ], 4)
+
+    asyncio.run(run())
+
+    return stats
+
+def test_SequentialIterations():
+    stats = benchmark(1)
+
+    assert stats["peak"] == 1
+    assert len(stats["training_sets"]) == 4
+
+def test_ConcurrentIterations():
+    stats = benchmark(3)
+
+    assert stats["peak"] == 3
+    assert stats["running"] == 0
+
+    # Each iteration trains on its own split
+    assert len(set(stats["training_sets"])) == 4
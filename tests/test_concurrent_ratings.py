@@ -0,0 +1,59 @@
+import asyncio
+import random
+
+import pytest
+
+from conftest import StubFramework, benchmark
+from nlutestframework import NLUDataEntry, NLUIntentRating
+
+class SlowFramework(StubFramework):
+    # Detects the first word of each sentence as the intent, takes a random time for each rating
+    # and records the order in which the ratings finish and the number of ratings in flight
+    async def construct(self, global_config):
+        self.running = 0
+        self.peak = 0
+        self.finished = []
+
+    async def rateIntents(self, sentence):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+
+        await asyncio.sleep(random.uniform(0, 0.01))
+
+        self.running -= 1
+        self.finished.append(sentence)
+
+        return NLUIntentRating(sentence, [ (sentence.split()[0], 1.) ])
+
+TRAINING_DATA = [ NLUDataEntry("a sentence", "a"), NLUDataEntry("b sentence", "b") ]
+VALIDATION_DATA = [
+    NLUDataEntry("{} sentence {}".format(intent, i), intent) for i in range(20) for intent in "ab"
+]
+
+def benchmarkSlow(max_concurrent_ratings):
+    return benchmark(
+        SlowFramework,
+        { "max_concurrent_ratings": max_concurrent_ratings },
+        TRAINING_DATA,
+        VALIDATION_DATA
+    )
+
+@pytest.mark.parametrize("max_concurrent_ratings", [ 1, 4, 8 ])
+def test_BoundedConcurrency(max_concurrent_ratings):
+    random.seed(max_concurrent_ratings)
+
+    result, framework = benchmarkSlow(max_concurrent_ratings)
+
+    assert framework.peak == max_concurrent_ratings
+    assert framework.running == 0
+
+    # The ratings finish out of order once they run concurrently, but each rating is still
+    # assigned to its own sentence, which makes all of them correct
+    sentences = [ x.sentence for x in VALIDATION_DATA ]
+    assert (framework.finished == sentences) == (max_concurrent_ratings == 1)
+    assert result == { "a": { "a": 20 }, "b": { "b": 20 } }
+
+@pytest.mark.parametrize("max_concurrent_ratings", [ 0, -1, 1.5, "2", None ])
+def test_InvalidMaxConcurrentRatings(max_concurrent_ratings):
+    with pytest.raises(TypeError):
+        benchmarkSlow(max_concurrent_ratings)
@@ -1,5 +1,7 @@
 import os
 
+import pytest
+
 from nlutestframework.implementations import SimpleJSONDataSet
 
 from langcodes import Language
@@ -46,9 +48,11 @@ def runSimpleJSONDataSetTests(path, title, constructor_language, expected_langua
         assert training_data != data_set.training_data
         assert validation_data != data_set.validation_data
 
-        # Make sure that a copy of the data is returned and not a reference
-        data_set.training_data.pop()
-        data_set.validation_data.pop()
+        # Make sure that the data can't be modified through the returned views
+        with pytest.raises(TypeError):
+            data_set.training_data[0] = data_set.validation_data[0]
+        assert not hasattr(data_set.training_data, "pop")
+        assert not hasattr(data_set.validation_data, "pop")
         assert len(data_set.training_data) + len(data_set.validation_data) == size
 
 def test_AskUbuntuDataSet():
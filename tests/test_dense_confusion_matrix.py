@@ -0,0 +1,89 @@
+import random
+
+from nlutestframework import DenseConfusionMatrix, IntentCodebook, NLUBenchmarker
+
+def referenceF1Scores(confusion_matrix):
+    # Straightforward per-intent calculation, used to verify the vectorized implementation
+    def safe_divide(dividend, divisor):
+        return 0 if dividend == 0 and divisor == 0 else dividend / divisor
+
+    f1_scores = {}
+    for intent in confusion_matrix.keys():
+        true_positives = confusion_matrix[intent].get(intent, 0)
+        false_positives = sum(
+            actual.get(intent, 0)
+            for expected, actual in confusion_matrix.items()
+            if expected != intent
+        )
+        false_negatives = sum(
+            amount
+            for detected, amount in confusion_matrix[intent].items()
+            if detected != intent
+        )
+
+        precision = safe_divide(true_positives, true_positives + false_positives)
+        recall    = safe_divide(true_positives, true_positives + false_negatives)
+
+        f1_scores[intent] = safe_divide(100 * 2 * precision * recall, precision + recall)
+
+    return f1_scores
+
+def randomConfusionMatrix(rng, num_intents, num_entries):
+    intents = [ None ] + [ "intent{}".format(i) for i in range(num_intents) ]
+
+    confusion_matrix = {}
+    for _ in range(num_entries):
+        expected = rng.choice(intents)
+        detected = rng.choice(intents)
+
+        confusion_matrix[expected] = confusion_matrix.get(expected, {})
+        confusion_matrix[expected][detected] = confusion_matrix[expected].get(detected, 0) + 1
+
+    return confusion_matrix
+
+def test_IntentCodebook():
+    codebook = IntentCodebook([ "a", "b", "a" ])
+
+    assert len(codebook) == 3
+    assert codebook.encode(None) == IntentCodebook.NONE_CODE
+    assert codebook.encode("a") == 1
+    assert codebook.encode("c") == 3
+    assert codebook.decode(3) == "c"
+    assert codebook.intents == [ None, "a", "b", "c" ]
+
+def test_RoundTrip():
+    rng = random.Random(0)
+
+    for _ in range(20):
+        confusion_matrix = randomConfusionMatrix(rng, 10, 100)
+
+        dense = DenseConfusionMatrix.fromConfusionMatrix(confusion_matrix)
+
+        assert dense.toConfusionMatrix() == confusion_matrix
+
+def test_F1Scores():
+    rng = random.Random(0)
+
+    for num_intents in [ 1, 5, 50 ]:
+        for _ in range(20):
+            confusion_matrix = randomConfusionMatrix(rng, num_intents, 200)
+
+            expected_scores = referenceF1Scores(confusion_matrix)
+            scores = NLUBenchmarker.confusionMatrixToF1Scores(confusion_matrix)
+
+            assert scores.keys() == expected_scores.keys()
+            for intent, score in scores.items():
+                assert abs(score - expected_scores[intent]) < 1e-9
+
+def test_FromCodes():
+    codebook = IntentCodebook([ "a", "b" ])
+
+    dense = DenseConfusionMatrix.fromCodes(codebook, [ 1, 1, 2, 0 ], [ 1, 2, 2, 0 ])
+    dense.add("c", "a")
+
+    assert dense.toConfusionMatrix() == {
+        None : { None: 1 },
+        "a"  : { "a": 1, "b": 1 },
+        "b"  : { "b": 1 },
+        "c"  : { "a": 1 }
+    }
@@ -0,0 +1,89 @@
+import asyncio
+
+from nlutestframework import (
+    EventBus,
+    IterationFinished,
+    IterationStarted,
+    LifecycleStage,
+    NLUBenchmarker,
+    RunFinished,
+    RunStarted,
+    SentenceRated,
+    StageFinished,
+    StageStarted
+)
+
+def test_Subscriptions():
+    event_bus = EventBus()
+    started  = []
+    everything = []
+
+    def failingHandler(event):
+        raise RuntimeError("Simulated error.")
+
+    assert not event_bus.subscribed(RunStarted)
+
+    event_bus.subscribe(failingHandler)
+    event_bus.subscribe(started.append, RunStarted)
+    event_bus.subscribe(everything.append)
+
+    assert event_bus.subscribed(RunStarted)
+    assert event_bus.subscribed(RunFinished)
+
+    # Errors of one handler don't affect the others
+    event_bus.publish(RunStarted([ "A" ], [ "B" ], 1))
+    event_bus.publish(RunFinished(True))
+
+    assert started == [ RunStarted([ "A" ], [ "B" ], 1) ]
+    assert everything == [ RunStarted([ "A" ], [ "B" ], 1), RunFinished(True) ]
+
+    event_bus.unsubscribe(failingHandler)
+    event_bus.unsubscribe(everything.append)
+
+    assert event_bus.subscribed(RunStarted)
+    assert not event_bus.subscribed(RunFinished)
+
+def test_BenchmarkEvents(benchmark_setup):
+    event_bus = EventBus.getInstance()
+    events = []
+
+    async def run():
+        queue = event_bus.subscribeQueue(IterationFinished)
+        try:
+            await NLUBenchmarker.getInstance().runFromConfig(benchmark_setup.config({
+                "Constant": { "class": "conftest.StubFramework" }
+            }))
+        finally:
+            event_bus.unsubscribeQueue(queue)
+
+        return [ queue.get_nowait() for _ in range(queue.qsize()) ]
+
+    event_bus.subscribe(events.append)
+    try:
+        queued = asyncio.run(run())
+    finally:
+        event_bus.unsubscribe(events.append)
+
+    def ofType(event_type):
+        return [ event for event in events if isinstance(event, event_type) ]
+
+    # The frameworks are constructed before the run starts
+    assert ofType(RunStarted) == [ RunStarted([ "Constant" ], [ "ChatbotCorpus" ], 2) ]
+    assert events[-1] == RunFinished(True)
+
+    assert [ (x.data_set, x.iteration) for x in ofType(IterationStarted) ] == [
+        ("ChatbotCorpus", 0),
+        ("ChatbotCorpus", 1)
+    ]
+    assert ofType(IterationFinished) == queued
+    assert len(queued) == 2
+
+    trainings = [ x for x in ofType(StageFinished) if x.stage is LifecycleStage.TRAIN ]
+    assert [ x.data_set for x in trainings ] == [ "ChatbotCorpus", "ChatbotCorpus" ]
+    assert len(ofType(StageStarted)) == len(ofType(StageFinished))
+
+    # Each rating is published with its latency
+    num_ratings = sum(sum(row.values()) for x in queued for row in x.confusion_matrix.values())
+    ratings = ofType(SentenceRated)
+    assert len(ratings) == num_ratings
+    assert all(x.framework == "Constant" and x.latency >= 0 for x in ratings)
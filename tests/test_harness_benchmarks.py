@@ -0,0 +1,38 @@
+import importlib.util
+import json
+import os
+
+script_directory = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+harness_path     = os.path.abspath(os.path.join(script_directory, "..", "benchmarks", "harness.py"))
+
+def loadHarness():
+    spec = importlib.util.spec_from_file_location("harness", harness_path)
+    harness = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(harness)
+    return harness
+
+def test_HarnessBenchmarks(tmp_path):
+    harness = loadHarness()
+    output = str(tmp_path / "results.json")
+
+    assert harness.main([ "--sizes", "200", "--repeat", "1", "--output", output ]) == 0
+
+    with open(output) as f:
+        results = json.load(f)["results"]
+
+    # Each benchmark runs once per size and reports the items it processed
+    assert [ x["benchmark"] for x in results ] == list(harness.BENCHMARKS)
+    assert all(x["size"] == 200 and x["items"] > 0 and x["min"] > 0 for x in results)
+
+    # Comparing to a faster baseline reports a regression
+    baseline = str(tmp_path / "baseline.json")
+    with open(baseline, "w") as f:
+        json.dump({ "results": [ dict(x, min=x["min"] / 10) for x in results ] }, f)
+
+    assert harness.main([
+        "--sizes", "200",
+        "--repeat", "1",
+        "--benchmark", "reshuffle",
+        "--output", output,
+        "--baseline", baseline
+    ]) == 1
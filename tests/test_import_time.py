@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+
+# Modules that must only be imported when they are actually used
+HEAVY_MODULES = [ "matplotlib", "dialogflow_v2", "azure", "docker", "snips_nlu", "aiohttp" ]
+
+def run(code):
+    # Run the code in a fresh interpreter and print the imported modules. The import time is
+    # measured by benchmarks/harness.py.
+    result = subprocess.run(
+        [ sys.executable, "-c", "\n".join([
+            "import json, sys",
+            "try:",
+            "    " + code,
+            "except SystemExit:",
+            "    pass",
+            "print(json.dumps(list(sys.modules)))"
+        ]) ],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+
+    return json.loads(result.stdout.splitlines()[-1])
+
+def assertNoHeavyModules(modules):
+    assert [ x for x in modules if x.split(".")[0] in HEAVY_MODULES ] == []
+
+def test_LibraryImport():
+    assertNoHeavyModules(run("import nlutestframework"))
+
+def test_Help():
+    assertNoHeavyModules(run(
+        "sys.argv = [ \"nlutestframework\", \"--help\" ];"
+        " import runpy; runpy.run_module(\"nlutestframework\", run_name=\"__main__\")"
+    ))
+
+def test_RegistryImportsOnlyTheRequestedImplementation():
+    modules = run(
+        "from nlutestframework.registry import DATA_SETS, resolve_class;"
+        " resolve_class(\"SimpleJSON\", DATA_SETS)"
+    )
+
+    assert "nlutestframework.implementations.simple_json_data_set" in modules
+    assertNoHeavyModules(modules)
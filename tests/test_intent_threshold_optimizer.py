@@ -0,0 +1,73 @@
+import asyncio
+import copy
+import random
+
+from conftest import FixedDataSet, StubFramework
+from nlutestframework import GlobalConfig, NLUBenchmarker, NLUDataEntry, NLUIntentRating
+from nlutestframework.intent_threshold_optimizer import IntentThresholdOptimizer
+
+class FixedRatingsFramework(StubFramework):
+    # Returns pre-defined ratings instead of rating the sentences
+    async def construct(self, global_config, ratings):
+        self.ratings = ratings
+
+    async def rateIntents(self, sentence):
+        return copy.deepcopy(self.ratings[sentence])
+
+def randomRatings(rng, num_sentences, num_intents):
+    intents = [ "intent{}".format(i) for i in range(num_intents) ]
+
+    entries = []
+    ratings = {}
+    for i in range(num_sentences):
+        sentence = "sentence{}".format(i)
+        expected = None if rng.random() < 0.2 else rng.choice(intents)
+
+        # Mostly correct, but with a random confidence. Confidences are rounded to produce ties.
+        detected = expected if rng.random() < 0.7 and expected is not None else rng.choice(intents)
+        confidence = round(rng.random(), 2)
+
+        entries.append(NLUDataEntry(sentence, expected))
+        ratings[sentence] = NLUIntentRating(sentence, [ (detected, confidence) ])
+
+    return entries, ratings
+
+def referenceScore(entries, ratings, threshold):
+    # Applies the threshold to copies of the ratings and calculates the mean F1 score from scratch
+    confusion_matrix = {}
+    for entry in entries:
+        rating = copy.deepcopy(ratings[entry.sentence])
+        rating.noneIfBelow(threshold)
+
+        confusion_matrix[entry.intent] = confusion_matrix.get(entry.intent, {})
+        confusion_matrix[entry.intent][rating.detected_intent] = (
+            confusion_matrix[entry.intent].get(rating.detected_intent, 0) + 1
+        )
+
+    f1_scores = list(NLUBenchmarker.confusionMatrixToF1Scores(confusion_matrix).values())
+
+    return sum(f1_scores) / len(f1_scores)
+
+def test_OptimalThreshold():
+    rng = random.Random(0)
+
+    async def run(entries, ratings):
+        framework = await FixedRatingsFramework.create(
+            GlobalConfig("python", 1, False),
+            { "ratings": ratings },
+            "Fixed"
+        )
+        return await IntentThresholdOptimizer.optimize(framework, FixedDataSet(entries, entries), 2, 0.1)
+
+    for num_intents in [ 1, 3, 10 ]:
+        for _ in range(5):
+            entries, ratings = randomRatings(rng, 200, num_intents)
+
+            threshold = asyncio.run(run(entries, ratings))
+
+            # Brute-force all thresholds at which the outcome may change
+            candidates = [ 0. ] + sorted({ x.confidence for x in ratings.values() if x.confidence < 1 })
+            best_score = max(referenceScore(entries, ratings, x) for x in candidates)
+
+            assert threshold in candidates
+            assert abs(referenceScore(entries, ratings, threshold) - best_score) < 1e-9
@@ -0,0 +1,49 @@
+import io
+import json
+import os
+
+import pytest
+
+from nlutestframework.implementations import JSONLDataSet
+from nlutestframework.json_stream import stream_json_object
+
+script_directory  = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+corpora_directory = os.path.abspath(os.path.join(script_directory, "..", "data", "corpora"))
+
+def test_StreamMatchesJSONLoad():
+    with open(os.path.join(corpora_directory, "ChatbotCorpus.json"), "r") as f:
+        document = f.read()
+
+    expected = json.loads(document)
+
+    # Use tiny chunks to cross chunk boundaries everywhere, including inside of numbers
+    for chunk_size in [ 1, 7, 1 << 16 ]:
+        members = list(stream_json_object(io.StringIO(document), { "sentences" }, chunk_size))
+
+        assert [ value for key, value in members if key == "sentences" ] == expected["sentences"]
+        assert dict((key, value) for key, value in members if key != "sentences") == {
+            key: value for key, value in expected.items() if key != "sentences"
+        }
+
+def test_InvalidDocuments():
+    for document in [ "[]", "{\"a\": 1", "{\"a\": [1, 2}", "{} {}" ]:
+        with pytest.raises(ValueError):
+            list(stream_json_object(io.StringIO(document), { "a" }))
+
+def test_JSONLDataSet(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    path.write_text("\n".join([
+        json.dumps({ "text": "hello", "intent": "greet" }),
+        json.dumps({ "text": "hi", "intent": "greet" }),
+        "",
+        json.dumps({ "text": "bye", "intent": "goodbye" }),
+        json.dumps({ "text": "what?", "intent": "None" })
+    ]))
+
+    data_set = JSONLDataSet("JSONL", str(path), 50, "en", ignore_cache=True)
+
+    assert len(data_set.training_data) + len(data_set.validation_data) == 4
+    assert None in { x.intent for x in data_set.validation_data }
+
+    with pytest.raises(ValueError):
+        JSONLDataSet("JSONL", str(path), 50, ignore_cache=True)
@@ -0,0 +1,40 @@
+import random
+
+from nlutestframework import LatencyHistogram
+
+def test_QuantilesAreAccurate():
+    rng = random.Random(42)
+    latencies = [ int(rng.lognormvariate(15, 1)) for _ in range(10000) ]
+
+    histogram = LatencyHistogram()
+    for latency in latencies:
+        histogram.record(latency)
+
+    latencies.sort()
+    for q in [ 0.5, 0.95, 0.99 ]:
+        exact = latencies[int(q * len(latencies)) - 1]
+        assert abs(histogram.quantile(q) - exact) / exact < 0.03
+
+    assert histogram.quantile(0) == latencies[0]
+    assert histogram.quantile(1) == latencies[-1]
+    assert histogram.count == len(latencies)
+
+def test_MergeAndRoundTrip():
+    a = LatencyHistogram()
+    b = LatencyHistogram()
+    both = LatencyHistogram()
+
+    for latency in [ 0, 5, 63, 64, 1000, 123456 ]:
+        a.record(latency)
+        both.record(latency)
+
+    for latency in [ 10 ** 9, 7, 3 * 10 ** 6 ]:
+        b.record(latency)
+        both.record(latency)
+
+    merged = LatencyHistogram.merged([ a, b ])
+    assert merged.toDict() == both.toDict()
+    assert LatencyHistogram.fromDict(merged.toDict()).summary() == both.summary()
+
+    assert LatencyHistogram().summary() == "no latencies recorded"
+    assert LatencyHistogram().quantile(0.5) is None
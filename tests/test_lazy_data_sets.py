@@ -0,0 +1,57 @@
+import asyncio
+import os
+
+from conftest import StubFramework, corpora_directory
+from nlutestframework import GlobalConfig, NLUBenchmarker
+from nlutestframework.implementations import SimpleJSONDataSet
+
+class CountingDataSet(SimpleJSONDataSet):
+    # Counts the instances that are alive
+    alive = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        CountingDataSet.alive += 1
+
+    def __del__(self):
+        CountingDataSet.alive -= 1
+
+class CountingFramework(StubFramework):
+    # Records the number of data sets alive during each training
+    async def construct(self, global_config, alive):
+        self.alive = alive
+
+    async def train(self, training_data):
+        self.alive.append(CountingDataSet.alive)
+
+def benchmark(lazy):
+    configs = {
+        title: {
+            "class": "test_lazy_data_sets.CountingDataSet",
+            "data_path": os.path.join(corpora_directory, title + ".json"),
+            "validation_percentage": 50
+        } for title in [ "AskUbuntuCorpus", "ChatbotCorpus", "WebApplicationsCorpus" ]
+    }
+
+    alive = []
+
+    async def run():
+        framework = await CountingFramework.create(
+            GlobalConfig("python", 1, True),
+            { "alive": alive },
+            "Counting"
+        )
+
+        data_sets = NLUBenchmarker.loadDataSets(configs, True, lazy)
+
+        await NLUBenchmarker.getInstance().run([ framework ], data_sets, 1)
+
+    asyncio.run(run())
+
+    return alive
+
+def test_EagerDataSets():
+    assert benchmark(lazy=False) == [ 3, 3, 3 ]
+
+def test_LazyDataSets():
+    assert benchmark(lazy=True) == [ 1, 1, 1 ]
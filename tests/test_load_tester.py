@@ -0,0 +1,132 @@
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import StubFramework
+from nlutestframework import (
+    GlobalConfig,
+    LatencyHistogram,
+    LoadTester,
+    LoadTestMode,
+    LoadTestStep,
+    NLUIntentRating
+)
+
+class SlowFramework(StubFramework):
+    """
+    Takes 5 ms per rating and handles at most two ratings at the same time. Every tenth rating
+    fails.
+    """
+
+    async def construct(self, global_config):
+        self.num_trainings = 0
+        self.num_ratings = 0
+        self.capacity = asyncio.Semaphore(2)
+
+    async def train(self, training_data):
+        self.num_trainings += 1
+
+    async def rateIntents(self, sentence):
+        async with self.capacity:
+            await asyncio.sleep(0.005)
+
+        self.num_ratings += 1
+        if self.num_ratings % 10 == 0:
+            raise RuntimeError("Simulated error.")
+
+        return NLUIntentRating(sentence, [ (None, 1.) ])
+
+    async def destruct(self):
+        self.destroyed = True
+
+def step(level, throughput, errors=0):
+    return LoadTestStep(level, throughput + errors, errors, 1., LatencyHistogram())
+
+def test_SaturationPoint():
+    steps = [ step(1, 100), step(2, 190), step(4, 198), step(8, 150, errors=50), step(16, 199) ]
+
+    assert LoadTester.saturationPoint(steps) == 1
+    assert LoadTester.saturationPoint(steps[:1]) == 0
+    assert LoadTester.saturationPoint([ step(1, 10, errors=10) ]) is None
+
+def frameworks():
+    return { "Slow": { "class": "test_load_tester.SlowFramework" } }
+
+def test_LoadTest(benchmark_setup):
+    results = asyncio.run(LoadTester.getInstance().runFromConfig(
+        benchmark_setup.config(frameworks(), iterations=1),
+        LoadTestMode.CONCURRENCY,
+        [ 1, 4 ],
+        0.2
+    ))
+
+    steps = results["ChatbotCorpus"]["Slow"]
+    assert [ x.level for x in steps ] == [ 1, 4 ]
+    for x in steps:
+        assert x.errors > 0
+        assert x.latencies.count == x.requests - x.errors
+        assert x.latencies.quantile(0.5) >= 5e6
+
+    # Four concurrent requests are limited by the capacity of two
+    assert steps[1].throughput < 3 * steps[0].throughput
+
+    run_directory = benchmark_setup.runDirectory()
+    with open(os.path.join(run_directory, LoadTester.FILE_NAME), "r", encoding="utf-8") as f:
+        written = json.load(f)
+
+    assert written["mode"] == "concurrency"
+    assert len(written["results"][0]["steps"]) == 2
+    assert os.path.isfile(os.path.join(run_directory, "charts", "load-test-ChatbotCorpus.png"))
+
+    rate_steps = asyncio.run(LoadTester.getInstance().runFromConfig(
+        benchmark_setup.config(frameworks(), iterations=1),
+        LoadTestMode.RATE,
+        [ 50 ],
+        0.2
+    ))["ChatbotCorpus"]["Slow"]
+
+    assert 8 <= rate_steps[0].requests <= 12
+
+def test_InvalidLevels(benchmark_setup):
+    async def run(levels):
+        framework = await SlowFramework.create(GlobalConfig("python", 4, True), {}, "Slow")
+        framework.destroyed = False
+
+        with pytest.raises(ValueError):
+            await LoadTester.getInstance().run([ framework ], [], LoadTestMode.CONCURRENCY, levels)
+
+        # The frameworks are destroyed even if the levels are invalid
+        assert framework.destroyed
+
+    asyncio.run(run([ 0 ]))
+    asyncio.run(run([ 1, 2.5 ]))
+
+    # Nothing is loaded or created for invalid levels
+    with pytest.raises(ValueError):
+        asyncio.run(LoadTester.getInstance().runFromConfig(
+            benchmark_setup.config(frameworks(), iterations=1),
+            LoadTestMode.RATE,
+            [ -1 ]
+        ))
+
+    assert os.listdir(benchmark_setup.output_directory) == []
+
+def test_EmptyValidationSet():
+    # The data set implementations never split off empty validation sets, custom ones might
+    data_set = SimpleNamespace(title="Empty", training_data=[], validation_data=[])
+
+    async def run():
+        framework = await SlowFramework.create(GlobalConfig("python", 4, True), {}, "Slow")
+
+        return await LoadTester.getInstance().run(
+            [ framework ],
+            [ data_set ],
+            LoadTestMode.CONCURRENCY,
+            [ 1 ],
+            0.1
+        )
+
+    assert asyncio.run(run()) == {}
@@ -0,0 +1,53 @@
+import asyncio
+import logging
+import time
+
+from nlutestframework import GlobalConfig, LifecycleStage, LoopLagMonitor, NLUFramework
+
+class SleepingFramework(NLUFramework):
+    # Sleeps during the training, either on the event loop or offloaded to the executor
+    async def construct(self, global_config, offload):
+        self.offload = offload
+
+    async def train(self, training_data):
+        if self.offload:
+            await self._runBlocking(time.sleep, 0.5)
+        else:
+            time.sleep(0.5)
+
+def train(offload):
+    async def run():
+        framework = await SleepingFramework.create(
+            GlobalConfig("python", 1, False),
+            { "offload": offload },
+            "Sleeping"
+        )
+
+        monitor = LoopLagMonitor.getInstance()
+        monitor.start(0.2)
+        try:
+            await asyncio.sleep(0.2)
+
+            async with framework.stage(LifecycleStage.TRAIN):
+                await framework.train([])
+
+            await asyncio.sleep(0.2)
+        finally:
+            monitor.stop()
+            await framework.destroy()
+
+    asyncio.run(run())
+
+def test_BlockingFrameworkIsReported(caplog):
+    with caplog.at_level(logging.WARNING):
+        train(offload=False)
+
+    messages = [ record.getMessage() for record in caplog.records ]
+
+    assert any("\"Sleeping\" in stage train" in message for message in messages)
+
+def test_OffloadedFrameworkIsNotReported(caplog):
+    with caplog.at_level(logging.WARNING):
+        train(offload=True)
+
+    assert len(caplog.records) == 0
@@ -0,0 +1,45 @@
+import os
+
+from nlutestframework import ModelArtifactStore
+
+def putFile(store, key, size):
+    staging_path = store.stagingPath()
+    with open(staging_path, "wb") as f:
+        f.write(b"x" * size)
+
+    return store.put(key, staging_path)
+
+def test_LeastRecentlyUsedEviction(tmp_path):
+    store = ModelArtifactStore(str(tmp_path), 250)
+
+    path_a = putFile(store, "a", 100)
+    path_b = putFile(store, "b", 100)
+
+    # Make sure that "a" was used before "b"
+    os.utime(path_a, (0, 0))
+    os.utime(path_b, (1, 1))
+
+    assert store.get("a") == path_a
+    assert store.get("c") is None
+
+    # "b" is now the least recently used artifact and has to make room for "c"
+    putFile(store, "c", 100)
+
+    assert store.get("a") is not None
+    assert store.get("b") is None
+    assert store.get("c") is not None
+
+def test_DirectoryArtifacts(tmp_path):
+    store = ModelArtifactStore(str(tmp_path), 1000)
+
+    staging_path = store.stagingPath()
+    os.makedirs(os.path.join(staging_path, "nested"))
+    with open(os.path.join(staging_path, "nested", "model"), "w") as f:
+        f.write("model")
+
+    path = store.put("model", staging_path)
+
+    assert not os.path.exists(staging_path)
+    with open(os.path.join(store.get("model"), "nested", "model"), "r") as f:
+        assert f.read() == "model"
+    assert path == store.get("model")
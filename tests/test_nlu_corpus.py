@@ -0,0 +1,38 @@
+import numpy as np
+
+from nlutestframework import NLUCorpus, NLUDataEntry, NLUDataView
+from nlutestframework.nlu_data_view import group_by_intent
+
+PAIRS = [
+    ("hello", "greet"),
+    ("bye", "goodbye"),
+    ("hi", "greet"),
+    ("what?", None),
+    ("hey", "greet")
+]
+
+def test_ColumnsAndViews():
+    corpus = NLUCorpus.fromPairs(PAIRS)
+
+    assert len(corpus) == len(PAIRS)
+    assert len(corpus.codebook) == 3 # None, greet and goodbye
+
+    # Each intent is stored only once, as a code
+    assert corpus.codes.tolist() == [ 1, 2, 1, 0, 1 ]
+
+    # Entries are views that compare equal to standalone entries
+    assert list(corpus) == [ NLUDataEntry(sentence, intent) for sentence, intent in PAIRS ]
+    assert corpus[-1].sentence == "hey"
+
+def test_GroupByIntent():
+    corpus = NLUCorpus.fromPairs(PAIRS)
+    view   = NLUDataView(corpus, np.array([ 4, 3, 2, 1 ]))
+
+    groups = group_by_intent(view)
+
+    assert set(groups.keys()) == { "greet", "goodbye", None }
+    assert [ x.sentence for x in groups["greet"] ] == [ "hey", "hi" ]
+    assert view.intents == { "greet", "goodbye", None }
+
+    # The fallback for plain sequences yields the same groups
+    assert group_by_intent(list(view)) == { k: list(v) for k, v in groups.items() }
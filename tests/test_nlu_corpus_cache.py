@@ -0,0 +1,58 @@
+import json
+import os
+import stat
+
+from nlutestframework import NLUCorpus, NLUCorpusCache
+
+PAIRS = [ ("hello", "greet"), ("tschüss", "goodbye"), ("what?", None) ]
+
+def writeSource(tmp_path, pairs):
+    source = tmp_path / "corpus.json"
+    source.write_text(json.dumps(pairs))
+
+    return str(source)
+
+def test_RoundTrip(tmp_path):
+    source = writeSource(tmp_path, PAIRS)
+    cache  = NLUCorpusCache(source + ".nlucache", source)
+
+    assert cache.load() is None
+    assert cache.storeSync("en", NLUCorpus.fromPairs(PAIRS))
+
+    language, corpus = NLUCorpusCache(source + ".nlucache", source).load()
+
+    assert language == "en"
+    assert [ (x.sentence, x.intent) for x in corpus ] == PAIRS
+
+def test_StaleCacheIsIgnored(tmp_path):
+    source = writeSource(tmp_path, PAIRS)
+    NLUCorpusCache(source + ".nlucache", source).storeSync("en", NLUCorpus.fromPairs(PAIRS))
+
+    # Change the source after the cache was written
+    writeSource(tmp_path, PAIRS[:1])
+
+    assert NLUCorpusCache(source + ".nlucache", source).load() is None
+
+def test_TouchedSourceRefreshesTheCache(tmp_path):
+    source = writeSource(tmp_path, PAIRS)
+    NLUCorpusCache(source + ".nlucache", source).storeSync("en", NLUCorpus.fromPairs(PAIRS))
+
+    # Touch the source without changing its contents
+    source_stat = os.stat(source)
+    os.utime(source, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns + 10 ** 9))
+
+    _, corpus = NLUCorpusCache(source + ".nlucache", source).load()
+    assert [ (x.sentence, x.intent) for x in corpus ] == PAIRS
+
+    # The fingerprint in the cache was refreshed, so the source doesn't have to be hashed again
+    with open(source + ".nlucache", "rb") as f:
+        assert str(source_stat.st_mtime_ns + 10 ** 9).encode("utf-8") in f.read()
+
+def test_CacheFileRespectsTheUmask(tmp_path):
+    source = writeSource(tmp_path, PAIRS)
+    NLUCorpusCache(source + ".nlucache", source).storeSync("en", NLUCorpus.fromPairs(PAIRS))
+
+    umask = os.umask(0)
+    os.umask(umask)
+
+    assert stat.S_IMODE(os.stat(source + ".nlucache").st_mode) == 0o666 & ~umask
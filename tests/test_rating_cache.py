@@ -0,0 +1,70 @@
+import os
+import stat
+
+from conftest import StubFramework, benchmark
+from nlutestframework import GlobalConfig, NLUDataEntry, NLUIntentRating, RatingCache
+
+class CountingFramework(StubFramework):
+    # Detects the first word of each sentence as the intent and counts the calls
+    async def construct(self, global_config):
+        self.trainings = 0
+        self.ratings = 0
+
+    async def train(self, training_data):
+        self.trainings += 1
+
+    async def rateIntents(self, sentence):
+        self.ratings += 1
+        return NLUIntentRating(sentence, [ (sentence.split()[0], 0.5) ])
+
+def test_RoundTrip(tmp_path):
+    cache = RatingCache(str(tmp_path))
+
+    cache.store("framework", "training", { "a": NLUIntentRating("a", [ ("x", 0.25), ("y", 0.75) ]) })
+    cache.store("framework", "training", { "b": NLUIntentRating("b", [ (None, 1.0) ]) })
+
+    ratings = cache.load("framework", "training")
+
+    assert set(ratings.keys()) == { "a", "b" }
+    assert ratings["a"].sorted_intents == [ ("y", 0.75), ("x", 0.25) ]
+    assert ratings["b"].detected_intent is None
+    assert cache.load("framework", "other") == {}
+
+def test_CacheFileRespectsTheUmask(tmp_path):
+    RatingCache(str(tmp_path)).store("framework", "training", { "a": NLUIntentRating("a", []) })
+
+    umask = os.umask(0)
+    os.umask(umask)
+
+    path = os.path.join(str(tmp_path), "framework", "training.json")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+    assert os.listdir(os.path.join(str(tmp_path), "framework")) == [ "training.json" ]
+
+def test_BenchmarkSkipsCachedWork(tmp_path):
+    training_data = [ NLUDataEntry("a sentence", "a"), NLUDataEntry("b sentence", "b") ]
+    validation_data = [ NLUDataEntry("a other", "a"), NLUDataEntry("b other", "a") ]
+
+    def benchmarkCounting(ignore_cache, validation_data):
+        result, framework = benchmark(
+            CountingFramework,
+            {},
+            training_data,
+            validation_data,
+            GlobalConfig("python", 1, ignore_cache, str(tmp_path))
+        )
+
+        return result, framework.trainings, framework.ratings
+
+    expected = { "a": { "a": 1, "b": 1 } }
+
+    # The first run fills the cache, the second run is served from the cache completely
+    assert benchmarkCounting(False, validation_data) == (expected, 1, 2)
+    assert benchmarkCounting(False, validation_data) == (expected, 0, 0)
+
+    # Ignoring the cache bypasses it
+    assert benchmarkCounting(True, validation_data) == (expected, 1, 2)
+
+    # Only the sentences that are not cached yet are rated
+    validation_data.append(NLUDataEntry("c other", "c"))
+    expected["c"] = { "c": 1 }
+    assert benchmarkCounting(False, validation_data) == (expected, 1, 1)
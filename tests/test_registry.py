@@ -0,0 +1,47 @@
+import importlib
+import logging
+import sys
+import types
+
+import pytest
+
+from nlutestframework.registry import Registry, resolve_class
+
+REGISTRY = Registry("nlutestframework.test_registry", {})
+
+class Plugin:
+    pass
+
+class EntryPoint:
+    # Implements the parts of the entry point interface used by the registry
+    def __init__(self, name):
+        self.name = name
+
+    def load(self):
+        return Plugin
+
+def removeImportlibMetadata(monkeypatch):
+    # Simulate Python 3.7, where importlib.metadata doesn't exist
+    monkeypatch.delattr(importlib, "metadata", raising=False)
+    monkeypatch.setitem(sys.modules, "importlib.metadata", None)
+
+def test_FallsBackToPkgResources(monkeypatch):
+    removeImportlibMetadata(monkeypatch)
+
+    pkg_resources = types.ModuleType("pkg_resources")
+    pkg_resources.iter_entry_points = lambda group: iter(
+        [ EntryPoint("Plugin") ] if group == REGISTRY.group else []
+    )
+    monkeypatch.setitem(sys.modules, "pkg_resources", pkg_resources)
+
+    assert resolve_class("Plugin", REGISTRY) is Plugin
+
+def test_WarnsWithoutEntryPointSupport(monkeypatch, caplog):
+    removeImportlibMetadata(monkeypatch)
+    monkeypatch.setitem(sys.modules, "pkg_resources", None)
+
+    with caplog.at_level(logging.WARNING):
+        with pytest.raises(ValueError):
+            resolve_class("Plugin", REGISTRY)
+
+    assert REGISTRY.group in caplog.text
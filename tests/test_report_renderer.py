@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from nlutestframework import ReportRenderer
+
+def test_RendersChartsInBackground(tmp_path):
+    renderer = ReportRenderer.getInstance()
+    renderer.start(str(tmp_path), [ "png", "svg", "html" ])
+    try:
+        intents = [ "intent_{}".format(i) for i in range(300) ] + [ "None" ]
+        performances = renderer.renderPerformances("f1-scores-Large Corpus", "Large", intents, {
+            "A": [ float(i % 100) for i in range(len(intents)) ],
+            "B": [ None ] + [ 50. ] * (len(intents) - 1)
+        })
+        threshold = renderer.renderThresholdSweep(
+            "threshold",
+            "Threshold",
+            [ 0., 0.5 ],
+            [ 10., 20. ],
+            [ 1., 2. ]
+        )
+
+        performance_files = performances.result(timeout=120)
+        threshold_files    = threshold.result(timeout=120)
+    finally:
+        renderer.stop()
+
+    assert sorted(map(os.path.basename, performance_files)) == [
+        "f1-scores-Large_Corpus.html",
+        "f1-scores-Large_Corpus.png",
+        "f1-scores-Large_Corpus.svg"
+    ]
+
+    for path in performance_files + threshold_files:
+        assert os.path.getsize(path) > 0
+
+    with open(str(tmp_path / "f1-scores-Large_Corpus.html"), encoding="utf-8") as f:
+        assert "<svg" in f.read()
+
+def test_SkipsChartsWhenNotRunning():
+    renderer = ReportRenderer.getInstance()
+
+    assert not renderer.running
+    assert renderer.renderThresholdSweep("threshold", "Threshold", [ 0. ], [ 0. ], [ 0. ]) is None
+
+def test_RejectsUnknownFormats(tmp_path):
+    with pytest.raises(ValueError):
+        ReportRenderer.getInstance().start(str(tmp_path), [ "pdf" ])
+
+    assert not ReportRenderer.getInstance().running
@@ -0,0 +1,128 @@
+import asyncio
+
+from conftest import StubFramework
+from nlutestframework import (
+    GlobalConfig,
+    LifecycleStage,
+    NLUBenchmarker,
+    ResourceUsage,
+    ResultsWriter
+)
+
+class HungryFramework(StubFramework):
+    """
+    Allocates and touches 64 MB of memory while training.
+    """
+
+    async def train(self, training_data):
+        memory = bytearray(64 * 1024 ** 2)
+        for i in range(0, len(memory), 4096):
+            memory[i] = 1
+
+        await asyncio.sleep(0.05)
+
+def busyWork():
+    return sum(i * i for i in range(1000000))
+
+class BusyFramework(StubFramework):
+    """
+    Trains by doing some CPU-bound work in the executor selected using the executor option.
+    """
+
+    async def train(self, training_data):
+        await self._runCPUBound(busyWork)
+
+class IdleFramework(StubFramework):
+    """
+    Trains by waiting, without using any CPU.
+    """
+
+    async def train(self, training_data):
+        await asyncio.sleep(0.1)
+
+def trainAtTheSameTime(executor):
+    async def run():
+        global_config = GlobalConfig("python", 4, True)
+        busy = await BusyFramework.create(global_config, { "executor": executor }, "Busy")
+        idle = await IdleFramework.create(global_config, {}, "Idle")
+
+        async def train(framework):
+            async with framework.stage(LifecycleStage.TRAIN):
+                await framework.train([])
+
+        try:
+            await asyncio.gather(train(busy), train(idle))
+        finally:
+            await busy.destroy()
+            await idle.destroy()
+
+        return busy.resource_usage[LifecycleStage.TRAIN], idle.resource_usage[LifecycleStage.TRAIN]
+
+    return asyncio.run(run())
+
+def test_Merge():
+    a = ResourceUsage(wall_time=1., cpu_time=.5, peak_rss=100)
+    b = ResourceUsage(
+        wall_time=2.,
+        cpu_time=.25,
+        peak_rss=50,
+        container_cpu_time=3.,
+        overlapped=True
+    )
+
+    merged = a.merge(b)
+    assert merged.wall_time == 3.
+    assert merged.cpu_time == .75
+    assert merged.peak_rss == 100
+    assert merged.container_cpu_time == 3.
+    assert merged.container_peak_memory is None
+    assert merged.overlapped
+
+    assert ResourceUsage(**merged.toDict()) == merged
+
+def test_ResourcesAreRecordedPerStage(benchmark_setup, caplog):
+    caplog.set_level("INFO")
+    asyncio.run(NLUBenchmarker.getInstance().runFromConfig(benchmark_setup.config({
+        "Hungry": { "class": "test_resource_monitor.HungryFramework" }
+    })))
+
+    resources = ResultsWriter.read(benchmark_setup.runDirectory()).resources["ChatbotCorpus"]["Hungry"]
+
+    assert set(resources.keys()) == {
+        LifecycleStage.PREPARE_DATA_SET,
+        LifecycleStage.TRAIN,
+        LifecycleStage.VALIDATION,
+        LifecycleStage.CLEANUP_TRAINING,
+        LifecycleStage.UNPREPARE_DATA_SET
+    }
+
+    # Both trainings are summed up
+    train = resources[LifecycleStage.TRAIN]
+    assert train.wall_time >= 0.1
+    assert train.cpu_time > 0
+    assert train.container_cpu_time is None
+    assert train.worker_peak_rss is None
+    assert not train.overlapped
+
+    if train.peak_rss is not None:
+        assert train.peak_rss >= 64 * 1024 ** 2
+
+    # The resources are reported next to the F1 scores
+    assert "train            : wall" in caplog.text
+
+def test_CPUTimeIsChargedToTheBusyFramework():
+    busy, idle = trainAtTheSameTime("thread")
+
+    assert busy.overlapped and idle.overlapped
+    assert busy.cpu_time > 0.01
+    assert idle.cpu_time == 0.
+    assert busy.worker_peak_rss is None
+
+def test_WorkerProcessesAreMeasured():
+    busy, idle = trainAtTheSameTime("process")
+
+    assert busy.cpu_time > 0.01
+    assert idle.cpu_time == 0.
+
+    if busy.peak_rss is not None:
+        assert busy.worker_peak_rss > 0
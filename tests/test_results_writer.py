@@ -0,0 +1,73 @@
+import asyncio
+import os
+
+import pytest
+
+from nlutestframework import NLUBenchmarker, NLUDataSetSummary, ResultsWriter
+
+SUMMARY = NLUDataSetSummary(
+    title           = "Corpus",
+    language        = "en",
+    intents         = frozenset([ "a", "b", None ]),
+    training_size   = 10,
+    validation_size = 5
+)
+
+def writeResults(run_directory):
+    writer = ResultsWriter(str(run_directory))
+    try:
+        writer.writeDataSet(SUMMARY)
+        writer.writeResult("Corpus", "X", 0, { "a": { "a": 2 }, "b": { "a": 1, None: 1 } })
+        writer.writeResult("Corpus", "Y", 0, { "a": { "a": 2 }, "b": { "b": 2 } })
+        writer.writeResult("Corpus", "X", 1, { None: { None: 3 } })
+    finally:
+        writer.close()
+
+def test_ResultsRoundTrip(tmp_path):
+    writeResults(tmp_path)
+
+    # Simulate a run that was killed while writing a record
+    with open(str(tmp_path / ResultsWriter.FILE_NAME), "a", encoding="utf-8") as f:
+        f.write("{\"type\": \"result\", \"data_")
+
+    results = ResultsWriter.read(str(tmp_path))
+
+    assert results.data_sets == [ SUMMARY ]
+    assert results.iterations == [
+        {
+            "Corpus": {
+                "X": { "a": { "a": 2 }, "b": { "a": 1, None: 1 } },
+                "Y": { "a": { "a": 2 }, "b": { "b": 2 } }
+            }
+        },
+        { "Corpus": { "X": { None: { None: 3 } } } }
+    ]
+
+def test_ReportFromRunDirectory(tmp_path, caplog):
+    writeResults(tmp_path)
+
+    caplog.set_level("INFO")
+    NLUBenchmarker.getInstance().reportFromRunDirectory(str(tmp_path))
+
+    assert "Corpus : Y; Average performance: 100.00" in caplog.text
+    assert os.path.isfile(str(tmp_path / "charts" / "f1-scores-Corpus.png"))
+
+def test_RunDirectoriesAreUnique(tmp_path):
+    output_directory = str(tmp_path / "results")
+
+    # Runs that start in the same second don't share a directory
+    first  = ResultsWriter.createRunDirectory(output_directory, "2020-01-01_00-00-00")
+    second = ResultsWriter.createRunDirectory(output_directory, "2020-01-01_00-00-00")
+
+    assert os.path.basename(first) == "2020-01-01_00-00-00"
+    assert os.path.basename(second) == "2020-01-01_00-00-00_2"
+    assert sorted(os.listdir(output_directory)) == [ "2020-01-01_00-00-00", "2020-01-01_00-00-00_2" ]
+
+def test_NoRunDirectoryIfLoadingFails(benchmark_setup):
+    config = benchmark_setup.config({ "Stub": { "class": "conftest.StubFramework" } })
+    config["data_sets"]["ChatbotCorpus"]["data_path"] = "missing.json"
+
+    with pytest.raises(ValueError):
+        asyncio.run(NLUBenchmarker.getInstance().runFromConfig(config))
+
+    assert os.listdir(benchmark_setup.output_directory) == []
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from conftest import StubFramework
+from nlutestframework import NLUBenchmarker, ResultsWriter
+
+class RecordingFramework(StubFramework):
+    # The training data of each training, across all instances
+    trainings = []
+
+    async def construct(self, global_config, fail_at=None):
+        self.fail_at = fail_at
+        self.num_trainings = 0
+
+    async def train(self, training_data):
+        self.num_trainings += 1
+        if self.num_trainings == self.fail_at:
+            raise RuntimeError("Simulated crash.")
+
+        RecordingFramework.trainings.append(frozenset(x.sentence for x in training_data))
+
+def frameworks(fail_at=None):
+    return {
+        "A": { "class": "test_resume.RecordingFramework" },
+        "B": { "class": "test_resume.RecordingFramework", "fail_at": fail_at }
+    }
+
+def test_ResumeRunsOnlyMissingIterations(benchmark_setup):
+    benchmarker = NLUBenchmarker.getInstance()
+
+    with pytest.raises(Exception):
+        asyncio.run(benchmarker.runFromConfig(
+            benchmark_setup.config(frameworks(fail_at=2), iterations=3)
+        ))
+
+    run_directory = benchmark_setup.runDirectory()
+
+    num_completed = sum(
+        len(iteration.get("ChatbotCorpus", {}))
+        for iteration in ResultsWriter.read(run_directory).iterations
+    )
+    assert 1 <= num_completed < 6
+
+    num_trainings = len(RecordingFramework.trainings)
+
+    asyncio.run(benchmarker.runFromConfig(
+        benchmark_setup.config(frameworks(), iterations=3),
+        run_directory
+    ))
+
+    # Only the missing iterations ran, on the same splits as in the first run
+    assert len(RecordingFramework.trainings) - num_trainings == 6 - num_completed
+    assert len(set(RecordingFramework.trainings)) == 3
+
+    results = ResultsWriter.read(run_directory)
+    assert len(results.iterations) == 3
+    for iteration in results.iterations:
+        assert set(iteration["ChatbotCorpus"].keys()) == { "A", "B" }
+
+    # The latencies of the ratings are recorded along with the results
+    for iteration_latencies in results.latencies:
+        assert all(x.count > 0 for x in iteration_latencies["ChatbotCorpus"].values())
+        assert set(iteration_latencies["ChatbotCorpus"].keys()) == { "A", "B" }
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import pstats
+
+import pytest
+
+from conftest import StubFramework
+from nlutestframework import (
+    LifecycleStage,
+    NLUBenchmarker,
+    StageProfiler
+)
+
+def busyWork():
+    return sum(i * i for i in range(300000))
+
+class BusyFramework(StubFramework):
+    """
+    Trains by doing some CPU-bound work in the blocking executor.
+    """
+
+    async def train(self, training_data):
+        await self._runBlocking(busyWork)
+
+def run(benchmark_setup, profiler):
+    asyncio.run(NLUBenchmarker.getInstance().runFromConfig(
+        benchmark_setup.config({ "Busy": { "class": "test_stage_profiler.BusyFramework" } }),
+        profile=[ "Busy:train" ],
+        profiler=profiler
+    ))
+
+    return os.path.join(benchmark_setup.runDirectory(), "profiles")
+
+def test_ParseTarget():
+    assert StageProfiler.parseTarget("Rasa:v1:train") == ("Rasa:v1", LifecycleStage.TRAIN)
+
+    with pytest.raises(ValueError):
+        StageProfiler.parseTarget("train")
+
+    with pytest.raises(ValueError):
+        StageProfiler.parseTarget("Snips:training")
+
+def test_SamplingProfiler(benchmark_setup):
+    profiles_directory = run(benchmark_setup, "sampling")
+
+    # Only the selected stage is profiled, the profiles of both iterations are merged
+    assert os.listdir(profiles_directory) == [ "Busy_ChatbotCorpus_train.folded" ]
+
+    with open(os.path.join(profiles_directory, "Busy_ChatbotCorpus_train.folded")) as f:
+        lines = f.read().splitlines()
+
+    # Each line is a stack, outermost frame first, followed by the number of samples
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert len(stack.split(";")) > 1
+
+    # The work done in the executor thread shows up
+    assert any(";busyWork (" in line for line in lines)
+
+def test_DeterministicProfiler(benchmark_setup):
+    profiles_directory = run(benchmark_setup, "deterministic")
+
+    assert os.listdir(profiles_directory) == [ "Busy_ChatbotCorpus_train.prof" ]
+
+    stats = pstats.Stats(os.path.join(profiles_directory, "Busy_ChatbotCorpus_train.prof"))
+
+    busy_work_calls = [
+        call_stats[0]
+        for (_, _, function_name), call_stats in stats.stats.items()
+        if function_name == "busyWork"
+    ]
+    assert busy_work_calls == [ 2 ]